@@ -9,6 +9,11 @@ from dotenv import load_dotenv
 import os
 
 from app.services.jwt_global_error_handler import register_jwt_error_handlers
+from app.services.compression import compression
+from app.services.logging_setup import configure_logging
+from app.services.password_service import password_hasher
+from app.services.rate_limit import rate_limiter
+from app.services.response_cache import response_cache
 
 load_dotenv()
 db = SQLAlchemy()
@@ -30,12 +35,99 @@ def create_app():
     app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(
         days=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS", 30))
     )
+    app.config["RESPONSE_CACHE_BACKEND"] = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    app.config["RESPONSE_CACHE_MAX_ENTRIES"] = int(
+        os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+    )
+    app.config["RESPONSE_CACHE_DEFAULT_TTL"] = int(
+        os.getenv("RESPONSE_CACHE_DEFAULT_TTL", 60)
+    )
+    app.config["RESPONSE_CACHE_MAX_TAGS"] = int(
+        os.getenv("RESPONSE_CACHE_MAX_TAGS", 10_000)
+    )
+    app.config["RESPONSE_CACHE_PATH"] = os.getenv("RESPONSE_CACHE_PATH")
+    app.config["GAMES_BATCH_MAX_IDS"] = int(os.getenv("GAMES_BATCH_MAX_IDS", 100))
+    app.config["WISHLIST_BATCH_MAX_IDS"] = int(os.getenv("WISHLIST_BATCH_MAX_IDS", 500))
+    app.config["RECOMMENDATIONS_PATH"] = os.getenv("RECOMMENDATIONS_PATH")
+    app.config["RECOMMENDATIONS_TOP_K"] = int(os.getenv("RECOMMENDATIONS_TOP_K", 20))
+    app.config["RECOMMENDATIONS_RELOAD_INTERVAL"] = float(
+        os.getenv("RECOMMENDATIONS_RELOAD_INTERVAL", 30)
+    )
+    app.config["RECOMMENDATIONS_CONTENT_MAX_FEATURES"] = int(
+        os.getenv("RECOMMENDATIONS_CONTENT_MAX_FEATURES", 1024)
+    )
+    app.config["CATALOG_SNAPSHOT_DIR"] = os.getenv("CATALOG_SNAPSHOT_DIR")
+    app.config["CATALOG_SNAPSHOT_DEBOUNCE"] = float(
+        os.getenv("CATALOG_SNAPSHOT_DEBOUNCE", 2)
+    )
+    app.config["IMAGE_VARIANT_CACHE_DIR"] = os.getenv("IMAGE_VARIANT_CACHE_DIR")
+    app.config["IMAGE_VARIANT_CACHE_MAX_BYTES"] = int(
+        os.getenv("IMAGE_VARIANT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+    )
+    app.config["IMAGE_MAX_UPLOAD_BYTES"] = int(
+        os.getenv("IMAGE_MAX_UPLOAD_BYTES", 5 * 1024 * 1024)
+    )
+    app.config["IMAGE_SWEEP_INTERVAL"] = float(os.getenv("IMAGE_SWEEP_INTERVAL", 0))
+    app.config["IMAGE_SWEEP_GRACE"] = float(os.getenv("IMAGE_SWEEP_GRACE", 3600))
+    # "" – pliki wysyła Flask, "x-sendfile" / "x-accel" – serwer WWW
+    app.config["IMAGE_SENDFILE_MODE"] = os.getenv("IMAGE_SENDFILE_MODE", "")
+    app.config["IMAGE_ACCEL_PREFIX"] = os.getenv("IMAGE_ACCEL_PREFIX", "/protected/")
+    app.config["USE_X_SENDFILE"] = app.config["IMAGE_SENDFILE_MODE"] == "x-sendfile"
+    app.config["COMPRESSION_ENABLED"] = os.getenv("COMPRESSION_ENABLED", "1") == "1"
+    app.config["COMPRESSION_MIN_SIZE"] = int(os.getenv("COMPRESSION_MIN_SIZE", 500))
+    app.config["COMPRESSION_LEVEL"] = int(os.getenv("COMPRESSION_LEVEL", 6))
+    app.config["COMPRESSION_CACHE_MAX_ENTRIES"] = int(
+        os.getenv("COMPRESSION_CACHE_MAX_ENTRIES", 256)
+    )
+    if os.getenv("COMPRESSION_MIMETYPES"):
+        app.config["COMPRESSION_MIMETYPES"] = [
+            m.strip() for m in os.getenv("COMPRESSION_MIMETYPES").split(",")
+        ]
+    app.config["AUTH_CLAIMS_CACHE_SIZE"] = int(
+        os.getenv("AUTH_CLAIMS_CACHE_SIZE", 4096)
+    )
+    app.config["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
+    app.config["REVOCATION_SYNC_INTERVAL"] = float(
+        os.getenv("REVOCATION_SYNC_INTERVAL", 10)
+    )
+    app.config["RATE_LIMIT_BACKEND"] = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    app.config["RATE_LIMIT_PATH"] = os.getenv("RATE_LIMIT_PATH")
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD")
+    app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    app.config["PASSWORD_HASH_MAX_PENDING"] = os.getenv("PASSWORD_HASH_MAX_PENDING")
+    app.config["PASSWORD_HASH_QUEUE_TIMEOUT"] = float(
+        os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 0.5)
+    )
     CORS(app, origins=["http://localhost:5173"])
     CORS(app, origins=["http://localhost:8080"])
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     register_jwt_error_handlers(app)
+    configure_logging(app)
+    password_hasher.init_app(app)
+    rate_limiter.init_app(app)
+    response_cache.init_app(app)
+    compression.init_app(app)
+
+    from app.commands import register_commands
+    from app.services.db_dialect import enable_sqlite_foreign_keys
+    from app.services.auth_cache import claims_cache
+    from app.services.token_service import revoked_tokens
+    from app.services.catalog_snapshot_service import catalog_snapshot
+    from app.services.image_service import image_sweeper, image_variants
+    from app.services.recommendation_service import similar_games
+    from app.services.content_similarity_service import content_similarity
+
+    register_commands(app)
+    enable_sqlite_foreign_keys()
+    claims_cache.init_app(app)
+    revoked_tokens.init_app(app)
+    catalog_snapshot.init_app(app)
+    image_variants.init_app(app)
+    image_sweeper.init_app(app)
+    similar_games.init_app(app)
+    content_similarity.init_app(app)
 
     from .routes import api
     from .routes import game_bp
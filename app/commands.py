@@ -0,0 +1,51 @@
+import click
+
+from app.services.image_service import backfill_image_hashes, image_sweeper
+from app.services.rating_service import rebuild_rating_aggregates
+from app.services.recommendation_service import similar_games
+from app.services.token_service import purge_expired_revocations
+
+
+def register_commands(app):
+    """
+    Rejestruje komendy CLI aplikacji (`flask <komenda>`).
+
+    Args:
+        app (Flask): instancja aplikacji Flask.
+    """
+
+    @app.cli.command("rebuild-ratings")
+    def rebuild_ratings_command():
+        """Przelicza agregaty ocen (rating_count/sum/histogram) wszystkich gier."""
+        games = rebuild_rating_aggregates()
+        click.echo(f"Przeliczono oceny dla {games} gier.")
+
+    @app.cli.command("backfill-image-hashes")
+    def backfill_image_hashes_command():
+        """Liczy `image_hash` dla gier z obrazkiem, które go jeszcze nie mają."""
+        updated, missing = backfill_image_hashes()
+        click.echo(f"Uzupełniono hash dla {updated} obrazków, brak pliku: {missing}.")
+
+    @app.cli.command("sweep-images")
+    def sweep_images_command():
+        """Usuwa pliki okładek, do których nie odwołuje się żadna gra."""
+        removed = image_sweeper.sweep()
+        click.echo(f"Usunięto {removed} nieużywanych obrazków.")
+
+    @app.cli.command("purge-revoked-tokens")
+    def purge_revoked_tokens_command():
+        """Usuwa z listy blokad wpisy tokenów, które już wygasły."""
+        removed = purge_expired_revocations()
+        click.echo(f"Usunięto {removed} wygasłych wpisów.")
+
+    @app.cli.command("build-recommendations")
+    @click.option("--full", is_flag=True, help="Przelicz wszystko od zera.")
+    def build_recommendations_command(full):
+        """Buduje (przyrostowo) indeks podobnych gier dla `/games/<id>/similar`."""
+        stats = similar_games.build(full=full)
+        mode = "przyrostowo" if stats["incremental"] else "w całości"
+        click.echo(
+            f"Indeks zbudowany {mode} w {stats['seconds']} s: "
+            f"{stats['games']} gier, {stats['users']} użytkowników, "
+            f"przeliczono {stats['recomputed']} gier."
+        )
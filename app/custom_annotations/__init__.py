@@ -1,3 +1,6 @@
+from .cached_response import cached_response
+from .conditional_get import catalog_etag
+from .rate_limit import rate_limit
 from .requires_permissions import requires_role
 
-__all__ = ["requires_role"]
+__all__ = ["cached_response", "catalog_etag", "rate_limit", "requires_role"]
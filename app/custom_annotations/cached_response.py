@@ -0,0 +1,94 @@
+from functools import wraps
+
+from flask import Response, g, make_response, request
+
+from app.services.response_cache import CachedResponse, response_cache
+
+#: Nagłówki odpowiedzi, które nie są zapisywane w cache.
+_SKIPPED_HEADERS = {"content-length", "set-cookie"}
+
+
+def cached_response(ttl=None, tags=()):
+    """
+    Dekorator cache'ujący odpowiedzi 200 endpointu GET w `response_cache`.
+
+    Args:
+        ttl (int|None): Czas życia wpisu w sekundach (domyślnie
+            `RESPONSE_CACHE_DEFAULT_TTL`).
+        tags (Iterable[str] | Callable[..., Iterable[str]]): Tagi do
+            unieważniania. Może to być funkcja przyjmująca argumenty widoku,
+            np. `lambda game_id: [f"game:{game_id}"]`.
+
+    Returns:
+        function: Ozdobiona funkcja widoku Flask, która:
+            - dla trafienia zwraca zapisaną odpowiedź bez wywoływania widoku,
+            - dla chybienia wywołuje widok i zapisuje odpowiedź 200,
+            - dokleja nagłówek `X-Cache: HIT` / `MISS`.
+
+    Example:
+        ```python
+        @api.route("games/<int:game_id>", methods=["GET"])
+        @cached_response(ttl=60, tags=lambda game_id: [f"game:{game_id}"])
+        def get_game(game_id): ...
+
+        # w ścieżce zapisu, po commit():
+        response_cache.invalidate_tags(f"game:{game_id}")
+        ```
+
+    Note:
+        - Kluczem jest endpoint + pełny URL z query stringiem, a pod
+          `catalog_etag` także wersja katalogu (`g.catalog_version`) – po
+          zmianie katalogu w innym workerze lub przed `invalidate_tags`
+          stary wpis nie zostanie podany z nowym ETagiem.
+        - Odpowiedź nie jest zapisywana, jeśli któryś z jej tagów unieważniono
+          w trakcie wykonywania widoku (patrz `ResponseCache.snapshot`).
+        - Żądania z nagłówkiem `Authorization` omijają cache (odpowiedź
+          może zależeć od użytkownika, np. adnotacje `annotate=true`).
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if (
+                not response_cache.enabled
+                or request.method != "GET"
+                or "Authorization" in request.headers
+            ):
+                return fn(*args, **kwargs)
+
+            key = f"{request.endpoint}:{request.full_path}"
+            version = g.get("catalog_version")
+            if version is not None:
+                key = f"{key}@{version}"
+            cached = response_cache.get(key)
+            if cached is not None:
+                response = Response(
+                    cached.body, status=cached.status, headers=cached.headers
+                )
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            # stan unieważnień sprzed renderowania – zapis po `invalidate_tags`
+            # wykonanym w trakcie widoku nie trafi do cache
+            since = response_cache.snapshot()
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                entry_tags = tags(**kwargs) if callable(tags) else tags
+                headers = [
+                    (k, v)
+                    for k, v in response.headers.items()
+                    if k.lower() not in _SKIPPED_HEADERS
+                ]
+                response_cache.set(
+                    key,
+                    CachedResponse(response.get_data(), response.status_code, headers),
+                    ttl=ttl,
+                    tags=entry_tags,
+                    since=since,
+                )
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
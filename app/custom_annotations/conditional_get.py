@@ -0,0 +1,96 @@
+from functools import wraps
+
+from flask import g, make_response, request
+
+from app.services.catalog_version_service import get_catalog_version
+from app.services.user_game_state_service import is_annotated_request
+
+
+def catalog_etag(fn=None, *, exists=None):
+    """
+    Dekorator obsługujący warunkowe GET (ETag / Last-Modified / 304) dla
+    endpointów katalogowych.
+
+    ETag jest wyliczany z wersji katalogu (`CatalogState.version`), którą
+    podbija każda ścieżka zapisu. Dzięki temu sprawdzenie `If-None-Match`
+    kosztuje jedno lekkie zapytanie i nie wywołuje widoku ani ORM.
+
+    Args:
+        exists (Callable[..., bool] | None): Dla endpointów pojedynczego
+            zasobu – funkcja przyjmująca argumenty widoku i sprawdzająca,
+            czy zasób istnieje. ETag jest wspólny dla całego katalogu, więc
+            bez tego sprawdzenia `If-None-Match` dawałby 304 także dla
+            nieistniejącego ID. Gdy zwróci `False`, widok jest wywoływany
+            (i zwraca 404).
+
+    Returns:
+        function: Ozdobiona funkcja widoku Flask, która:
+            - zwraca `304 Not Modified`, gdy `If-None-Match` zawiera bieżący
+              ETag (lub – przy braku `If-None-Match` – gdy `If-Modified-Since`
+              nie jest starszy niż ostatnia zmiana katalogu),
+            - w przeciwnym razie wywołuje widok i do odpowiedzi 200 dokleja
+              `ETag`, `Last-Modified` oraz `Cache-Control: no-cache`.
+
+    Example:
+        ```python
+        @api.route("genre", methods=["GET"])
+        @catalog_etag
+        def get_genres():
+            ...
+
+        @api.route("games/<int:game_id>", methods=["GET"])
+        @catalog_etag(exists=game_exists)
+        def get_game(game_id):
+            ...
+        ```
+
+    Note:
+        - ETag jest silny: ta sama wersja katalogu i ten sam URL dają
+          bajtowo identyczną odpowiedź. Po kompresji (`app.services.compression`)
+          staje się słaby, dlatego `If-None-Match` jest porównywany słabo.
+        - `Cache-Control: no-cache` pozwala przeglądarce trzymać odpowiedź,
+          ale wymusza rewalidację przy każdym użyciu.
+        - Żądania z adnotacjami użytkownika (`annotate=true` + JWT) omijają
+          ETag – odpowiedź zależy też od wishlisty i recenzji użytkownika.
+        - Odczytana wersja trafia do `g.catalog_version`; `cached_response`
+          umieszczony pod tym dekoratorem dodaje ją do klucza cache, więc
+          treść wyrenderowana przy starszej wersji nie wyjdzie z nowszym ETagiem.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if is_annotated_request():
+                response = make_response(fn(*args, **kwargs))
+                response.headers["Cache-Control"] = "private, no-cache"
+                response.vary.add("Authorization")
+                return response
+
+            version, updated_at = get_catalog_version()
+            etag = f"catalog-{version}"
+            g.catalog_version = version
+            last_modified = updated_at.replace(microsecond=0) if updated_at else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since)
+            if not_modified and exists is not None:
+                not_modified = exists(**kwargs)
+            if not_modified:
+                response = make_response("", 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+
+        return wrapper
+
+    return decorator if fn is None else decorator(fn)
@@ -0,0 +1,84 @@
+import math
+from functools import wraps
+
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.services.rate_limit import parse_limit, rate_limiter
+
+KEY_TYPES = ("ip", "user", "route")
+
+
+def _client_key(key):
+    if key == "user":
+        try:
+            identity = get_jwt_identity()
+        except RuntimeError:  # brak zweryfikowanego JWT w tym żądaniu
+            identity = None
+        if identity is not None:
+            return f"user:{identity}"
+    if key == "route":
+        return "route"
+    return f"ip:{request.remote_addr}"
+
+
+def rate_limit(limit, key="ip", scope=None):
+    """
+    Dekorator ograniczający liczbę żądań do endpointu (kubełek tokenów).
+
+    Args:
+        limit (str): Limit w postaci `"<liczba>/<second|minute|hour|day>"`,
+            np. `"10/minute"`.
+        key (str): Czym rozróżniane są kubełki:
+            - `"ip"` – adres klienta,
+            - `"user"` – identyfikator użytkownika z JWT (bez JWT – adres IP),
+            - `"route"` – jeden wspólny kubełek dla endpointu (ochrona
+              kosztownych ścieżek przed zagłodzeniem reszty aplikacji).
+        scope (str|None): Nazwa kubełka; domyślnie nazwa endpointu. Ta sama
+            nazwa na kilku endpointach daje im wspólny limit.
+
+    Returns:
+        function: Ozdobiona funkcja widoku Flask, która:
+            - przy wolnym tokenie wywołuje widok,
+            - w przeciwnym razie zwraca `429 Too Many Requests` z nagłówkiem
+              `Retry-After` (w sekundach).
+
+    Example:
+        ```python
+        @api.route("/reviews/<int:game_id>", methods=["POST"])
+        @jwt_required()
+        @rate_limit("30/minute", key="user")
+        def upsert_review(game_id): ...
+        ```
+
+    Note:
+        - Przy `key="user"` dekorator musi być pod `@jwt_required()`, żeby
+          tożsamość była już zweryfikowana.
+        - Dekoratory można łączyć, np. limit per IP i wspólny limit trasy.
+        - Za reverse proxy `request.remote_addr` to adres proxy – należy
+          skonfigurować `ProxyFix`.
+    """
+    if key not in KEY_TYPES:
+        raise ValueError(f"Nieznany klucz limitu: {key!r}")
+    capacity, rate = parse_limit(limit)
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if rate_limiter.enabled:
+                bucket = f"{scope or request.endpoint}:{_client_key(key)}"
+                allowed, retry_after = rate_limiter.hit(bucket, capacity, rate)
+                if not allowed:
+                    return (
+                        jsonify(
+                            error="Too Many Requests",
+                            message="Przekroczono limit żądań, spróbuj ponownie później.",
+                        ),
+                        429,
+                        {"Retry-After": str(max(1, math.ceil(retry_after)))},
+                    )
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
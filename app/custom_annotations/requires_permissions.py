@@ -1,7 +1,8 @@
 from functools import wraps
 
 from flask import jsonify
-from flask_jwt_extended import jwt_required, get_jwt
+
+from app.services.auth_cache import verify_request_token
 
 
 def requires_role(required_role):
@@ -14,7 +15,8 @@ def requires_role(required_role):
 
     Returns:
         function: Ozdobiona funkcja widoku Flask, która:
-            - sprawdza obecność i poprawność tokenu JWT (`@jwt_required()`),
+            - sprawdza obecność i poprawność tokenu JWT (jak `@jwt_required()`,
+              ale z cache zweryfikowanych tokenów, patrz `ClaimsCache`),
             - weryfikuje, czy w polu `roles` JWT znajduje się `required_role`,
             - jeśli rola jest obecna → wywołuje oryginalny endpoint,
             - jeśli rola jest nieobecna → zwraca odpowiedź JSON z kodem HTTP 403.
@@ -34,16 +36,16 @@ def requires_role(required_role):
     Note:
         Wymaga, aby podczas generowania tokenu JWT dołączyć pole `"roles"`,
         np. w `create_access_token(identity=user.id, additional_claims={"roles": ["admin"]})`.
+        Claimy są logowane na poziomie DEBUG (logger `app.services.auth_cache`).
     """
 
     def decorator(fn):
         @wraps(fn)
-        @jwt_required()
         def wrapper(*args, **kwargs):
-            claims = get_jwt()
-            print("JWT claims:", claims)  # Debug
-            roles = claims.get("roles", [])
-            if required_role not in roles:
+            verified = verify_request_token()
+            if verified is None:
+                return fn(*args, **kwargs)
+            if required_role not in verified.roles:
                 return (
                     jsonify({"msg": f"Forbidden – role '{required_role}' required"}),
                     403,
@@ -5,3 +5,5 @@ from .wish_list import WishList
 from .game_genre_model import Genre
 from .game_tag_model import Tag
 from .role_model import Role
+from .catalog_state_model import CatalogState
+from .revoked_token_model import RevokedToken
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from app import db
+
+
+class CatalogState(db.Model):
+    """
+    Model przechowujący wersję katalogu gier (jeden wiersz, `id = 1`).
+
+    Atrybuty:
+        id (int): Klucz główny (zawsze `1`).
+        version (int): Monotoniczny licznik zmian katalogu. Zwiększany przy
+            każdym zapisie wpływającym na odpowiedzi katalogowe (gry, gatunki,
+            tagi, recenzje).
+        features_version (int): Licznik zmian cech gier (gry, ich gatunki
+            i tagi) – bez recenzji. Zwiększany przez
+            `bump_catalog_version(features=True)`; na jego podstawie indeksy
+            cech (np. `ContentSimilarity`) decydują o przebudowie.
+        updated_at (datetime): Moment ostatniej zmiany katalogu (UTC).
+
+    Example:
+        ```python
+        from app.services.catalog_version_service import bump_catalog_version
+
+        db.session.add(Genre(name="RPG"))
+        bump_catalog_version()     # w tej samej transakcji co zmiana
+        db.session.commit()
+        ```
+
+    Note:
+        - Wersja służy do wyliczania ETag/Last-Modified endpointów katalogowych,
+          więc każda ścieżka zapisu katalogu musi ją podbić.
+    """
+
+    __tablename__ = "catalog_state"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    features_version = db.Column(
+        db.BigInteger, nullable=False, default=0, server_default="0"
+    )
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self):
+        return f"<CatalogState(version={self.version})>"
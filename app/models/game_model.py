@@ -1,6 +1,9 @@
+from sqlalchemy import event
+
 from app import db
 from app.models.game_genre_model import game_genre
 from app.models.game_tag_model import game_tag
+from app.services.text_utils import fold_text
 
 
 class Game(db.Model):
@@ -15,6 +18,18 @@ class Game(db.Model):
         discount (float): Zniżka (%) przypisana do gry. Może być `NULL` lub 0,
             np. `20.0` oznacza 20% rabatu.
         image_path (str): Ścieżka względna do obrazka gry (np. `"static/images/games/example.png"`).
+        image_hash (str): SHA-256 (hex) zawartości obrazka. Używany jako ETag
+            i wersja w niezmiennym URL-u obrazka (`?v=...`).
+        effective_price (float): Cena po rabacie, wyliczana przez bazę danych
+            (kolumna generowana, tylko do odczytu). `NULL`, gdy brak ceny.
+        rating_count (int): Liczba recenzji gry (zdenormalizowana).
+        rating_sum (int): Suma ocen ze wszystkich recenzji (zdenormalizowana).
+        rating_1 … rating_5 (int): Histogram ocen – liczba recenzji z daną
+            liczbą gwiazdek. Utrzymywane przez `app.services.rating_service`.
+        search_title (str): Tytuł znormalizowany do wyszukiwania (bez akcentów,
+            małe litery). Ustawiany automatycznie przy zapisie.
+        search_body (str): Opis znormalizowany do wyszukiwania. Ustawiany
+            automatycznie przy zapisie.
 
     Relacje:
         genres (list[Genre]): Lista gatunków przypisanych do gry.
@@ -48,9 +63,11 @@ class Game(db.Model):
         ```
 
     Note:
-        - Cena końcowa do wyświetlenia na froncie może być obliczana jako:
-          `price * (1 - discount / 100)`, jeśli `discount` jest różne od 0.
+        - Cena końcowa `price * (1 - discount / 100)` jest dostępna jako
+          `effective_price` (kolumna generowana, z indeksem pod sortowanie).
         - Pole `image_path` przechowuje ścieżkę względną (np. w katalogu `static`).
+        - W PostgreSQL z `search_title`/`search_body` liczona jest kolumna
+          `search_vector` (tsvector z indeksem GIN, tworzona migracją).
     """
 
     id = db.Column(db.Integer, primary_key=True)
@@ -59,6 +76,22 @@ class Game(db.Model):
     price = db.Column(db.Float)
     discount = db.Column(db.Float)
     image_path = db.Column(db.String(255))
+    image_hash = db.Column(db.String(64))
+    effective_price = db.Column(
+        db.Float,
+        db.Computed("price * (1 - COALESCE(discount, 0) / 100.0)", persisted=True),
+    )
+    search_title = db.Column(db.Text)
+    search_body = db.Column(db.Text)
+
+    # zdenormalizowane agregaty ocen (patrz app.services.rating_service)
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_1 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_2 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_3 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_4 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_5 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # wiele gatunków
     genres = db.relationship(
@@ -76,5 +109,19 @@ class Game(db.Model):
         "WishList", backref="game", lazy=True, cascade="all, delete-orphan"
     )
 
+    # indeksy pod stronicowanie kursorowe (sortowanie po kolumnie + id)
+    __table_args__ = (
+        db.Index("ix_game_price_id", "price", "id"),
+        db.Index("ix_game_effective_price_id", "effective_price", "id"),
+    )
+
     def __repr__(self):
         return f"<Game(title='{self.title}', price={self.price})>"
+
+
+@event.listens_for(Game, "before_insert")
+@event.listens_for(Game, "before_update")
+def sync_search_fields(mapper, connection, game):
+    """Utrzymuje znormalizowane kolumny wyszukiwania w zgodzie z tytułem i opisem."""
+    game.search_title = fold_text(game.title)
+    game.search_body = fold_text(game.description)
@@ -34,8 +34,10 @@ class Review(db.Model):
 
     Note:
         - Każdy użytkownik może dodać **tylko jedną recenzję** do danej gry
-          (logika powinna być kontrolowana w endpointzie).
+          (unikalne `(user_id, game_id)`; zapis przez `upsert_review`).
         - Relacja `Review` → `User` i `Review` → `Game` jest wiele-do-jednego.
+        - Indeksy `(game_id, id)` i `(user_id, id)` obsługują stronicowanie
+          recenzji gry i użytkownika (od najnowszych) jednym skanem zakresu.
     """
 
     id = db.Column(db.Integer, primary_key=True)
@@ -44,3 +46,9 @@ class Review(db.Model):
 
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     game_id = db.Column(db.Integer, db.ForeignKey("game.id"), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "game_id", name="uq_review_user_id_game_id"),
+        db.Index("ix_review_game_id_id", "game_id", "id"),
+        db.Index("ix_review_user_id_id", "user_id", "id"),
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from app import db
+
+
+class RevokedToken(db.Model):
+    """
+    Model przechowujący unieważnione tokeny JWT (lista blokad).
+
+    Atrybuty:
+        id (int): Klucz główny.
+        jti (str): Unikalny identyfikator tokenu (claim `jti`).
+        token_type (str): `"access"` lub `"refresh"`.
+        user_id (int): Właściciel tokenu (z `identity`).
+        expires_at (datetime): Wygaśnięcie tokenu (claim `exp`, UTC). Po tym
+            czasie wpis jest zbędny i może zostać usunięty.
+        revoked_at (datetime): Moment unieważnienia (UTC).
+
+    Example:
+        ```python
+        from app.services.token_service import revoke_token
+
+        revoke_token(get_jwt())   # np. przy wylogowaniu
+        db.session.commit()
+        ```
+
+    Note:
+        - Żądania nie czytają tej tabeli bezpośrednio – sprawdzają zbiór JTI
+          w pamięci (`RevocationList`), synchronizowany z bazą co kilka sekund.
+    """
+
+    __tablename__ = "revoked_token"
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+    )
+
+    def __repr__(self):
+        return f"<RevokedToken(jti='{self.jti}', type='{self.token_type}')>"
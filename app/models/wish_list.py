@@ -29,7 +29,8 @@ class WishList(db.Model):
         ```
 
     Note:
-        - Każdy użytkownik może mieć wiele gier na wishliście.
+        - Każdy użytkownik może mieć wiele gier na wishliście, ale każdą grę
+          tylko raz (unikalne `(user_id, game_id)`).
         - Jeśli użytkownik lub gra zostaną usunięci, powiązane wpisy
           z wishlisty są również usuwane dzięki kaskadzie w relacjach.
     """
@@ -37,3 +38,7 @@ class WishList(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     game_id = db.Column(db.Integer, db.ForeignKey("game.id"), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "game_id", name="uq_wish_list_user_id_game_id"),
+    )
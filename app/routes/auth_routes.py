@@ -1,9 +1,26 @@
 from flask import request, jsonify
+from flask_jwt_extended import decode_token, get_jwt, get_jwt_identity, jwt_required
+
 from . import api
+from app import db
+from app.custom_annotations import rate_limit
+from app.models import User
+from app.services.password_service import PasswordHasherBusy
+from app.services.token_service import issue_tokens, revoke_token
 from app.services.user_service import register_user, login_user
 
 
+def hasher_busy_response(error):
+    """Odpowiedź 503 z `Retry-After`, gdy kolejka hashowania haseł jest pełna."""
+    return (
+        jsonify({"error": str(error)}),
+        503,
+        {"Retry-After": str(error.retry_after)},
+    )
+
+
 @api.route("/auth/register", methods=["POST"])
+@rate_limit("5/minute", key="ip")
 def register():
     """
     Endpoint rejestracji nowego użytkownika.
@@ -33,15 +50,32 @@ def register():
             "error": "User already exists"
         }
 
+    Response (429 Too Many Requests):
+        {
+            "error": "Too Many Requests",
+            "message": "Przekroczono limit żądań, spróbuj ponownie później."
+        }
+        (z nagłówkiem `Retry-After`; limit: 5 na minutę z jednego adresu IP)
+
+    Response (503 Service Unavailable):
+        {
+            "error": "Serwer jest przeciążony, spróbuj ponownie za chwilę."
+        }
+        (z nagłówkiem `Retry-After`)
+
     Returns:
         tuple: JSON response oraz kod HTTP.
     """
     data = request.json
-    response, status = register_user(data)
+    try:
+        response, status = register_user(data)
+    except PasswordHasherBusy as e:
+        return hasher_busy_response(e)
     return jsonify(response), status
 
 
 @api.route("/auth/login", methods=["POST"])
+@rate_limit("10/minute", key="ip")
 def login():
     """
     Endpoint logowania użytkownika.
@@ -55,7 +89,7 @@ def login():
     Response (200 OK):
         {
             "access_token": "jwt-token-string",
-            "roles": ["user", "admin"]
+            "refresh_token": "jwt-token-string"
         }
 
     Response (401 Unauthorized):
@@ -63,10 +97,112 @@ def login():
             "error": "Invalid username or password"
         }
 
+    Response (429 Too Many Requests):
+        {
+            "error": "Too Many Requests",
+            "message": "Przekroczono limit żądań, spróbuj ponownie później."
+        }
+        (z nagłówkiem `Retry-After`; limit: 10 na minutę z jednego adresu IP)
+
+    Response (503 Service Unavailable):
+        {
+            "error": "Serwer jest przeciążony, spróbuj ponownie za chwilę."
+        }
+        (z nagłówkiem `Retry-After`)
+
     Returns:
         tuple: JSON response zawierający token JWT (przy poprawnym logowaniu)
         lub błąd z odpowiednim kodem HTTP.
     """
     data = request.json
-    response, status = login_user(data)
+    try:
+        response, status = login_user(data)
+    except PasswordHasherBusy as e:
+        return hasher_busy_response(e)
     return jsonify(response), status
+
+
+@api.route("/auth/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+@rate_limit("30/minute", key="user")
+def refresh():
+    """
+    Odnawia parę tokenów na podstawie tokenu odświeżania (rotacja).
+
+    Request:
+        Nagłówek `Authorization: Bearer <refresh_token>`.
+
+    Response (200 OK):
+        {
+            "access_token": "jwt-token-string",
+            "refresh_token": "jwt-token-string"
+        }
+
+    Response (401 Unauthorized):
+        {
+            "error": "Revoked Token",
+            "message": "Token został cofnięty."
+        }
+
+    Uwagi:
+        - Użyty token odświeżania jest unieważniany – każdy może posłużyć
+          tylko raz. Ponowne użycie (np. skradzionej kopii) kończy się 401,
+          także gdy trafi do innego workera lub przyjdzie równolegle: JTI jest
+          zajmowany atomowo (`revoke_token`), a tokeny wydawane dopiero potem.
+        - Role w nowym tokenie dostępu są czytane z bazy, więc zmiana ról
+          działa najpóźniej po odświeżeniu.
+    """
+    user = db.session.get(User, int(get_jwt_identity()))
+    if user is None:
+        return (
+            jsonify({"error": "Unauthorized", "message": "Użytkownik nie istnieje."}),
+            401,
+        )
+    if not revoke_token(get_jwt()):
+        # token już wykorzystany (np. równoległe odświeżenie lub inny worker
+        # przed synchronizacją listy blokad)
+        db.session.rollback()
+        return (
+            jsonify(error="Revoked Token", message="Token został cofnięty."),
+            401,
+        )
+    tokens = issue_tokens(user)
+    db.session.commit()
+    return jsonify(tokens), 200
+
+
+@api.route("/auth/logout", methods=["POST"])
+@jwt_required(verify_type=False)
+def logout():
+    """
+    Wylogowuje użytkownika, unieważniając jego tokeny.
+
+    Request:
+        Nagłówek `Authorization: Bearer <token>` (dostępu lub odświeżania).
+        Opcjonalny JSON – drugi token do unieważnienia:
+            {
+                "refresh_token": "jwt-token-string"
+            }
+
+    Response (200 OK):
+        {
+            "msg": "Wylogowano."
+        }
+
+    Uwagi:
+        - `refresh_token` z body jest unieważniany tylko, jeśli należy do
+          tego samego użytkownika; niepoprawny token jest pomijany.
+    """
+    claims = get_jwt()
+    revoke_token(claims)
+    data = request.get_json(silent=True) or {}
+    other = data.get("refresh_token") if isinstance(data, dict) else None
+    if other:
+        try:
+            other_claims = decode_token(other)
+        except Exception:
+            other_claims = None
+        if other_claims and other_claims["sub"] == claims["sub"]:
+            revoke_token(other_claims)
+    db.session.commit()
+    return jsonify({"msg": "Wylogowano."}), 200
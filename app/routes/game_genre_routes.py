@@ -2,7 +2,10 @@ from flask import request, jsonify
 
 from app import db
 from app.models.game_genre_model import Genre
+from app.custom_annotations import cached_response, catalog_etag
 from app.routes import genre_bp, api
+from app.services.catalog_version_service import bump_catalog_version
+from app.services.response_cache import response_cache
 
 
 # Dodaj nowy gatunek
@@ -47,12 +50,16 @@ def create_genre():
 
     genre = Genre(name=name)
     db.session.add(genre)
+    bump_catalog_version(features=True)
     db.session.commit()
+    response_cache.invalidate_tags("genres")
     return jsonify({"id": genre.id, "name": genre.name}), 201
 
 
 # Pobierz wszystkie gatunki
 @api.route("genre", methods=["GET"])
+@catalog_etag
+@cached_response(ttl=300, tags=["genres"])
 def get_genres():
     """
     Endpoint pobierania wszystkich gatunków gier.
@@ -1,49 +1,66 @@
+import gzip
 import json
 import os
 
-from flask import request, jsonify, send_file
-from werkzeug.utils import secure_filename
+from flask import (
+    abort,
+    current_app,
+    request,
+    jsonify,
+    send_file,
+    Response,
+    stream_with_context,
+)
 
 from app import db
 from app.models.game_genre_model import Genre
 from app.models.game_model import Game
 from app.models.game_tag_model import Tag
+from app.custom_annotations import cached_response, catalog_etag, requires_role
 from app.routes import api
+from app.services.catalog_service import (
+    SORT_COLUMNS,
+    CatalogQueryError,
+    apply_catalog_filters,
+    compute_facets,
+    game_exists,
+    paginate_games,
+    parse_bool,
+    parse_catalog_filters,
+    parse_facets,
+    parse_ids,
+    parse_limit,
+    parse_sort,
+)
+from app.services.catalog_snapshot_service import catalog_snapshot
+from app.services.catalog_version_service import bump_catalog_version
+from app.services.content_similarity_service import content_similarity
+from app.services.response_cache import response_cache
+from app.services.game_serializer import game_card_options, game_to_dict, parse_fields
+from app.services.image_service import (
+    IMAGE_VERSION_LENGTH,
+    ImageParamsError,
+    ImageTooLargeError,
+    file_digest,
+    get_image_meta,
+    image_variants,
+    parse_variant_params,
+    resolve_image_path,
+    send_image,
+    store_upload,
+)
+from app.services.import_service import import_games, iter_csv_rows, iter_ndjson_rows
+from app.services.recommendation_service import similar_games
+from app.services.search_service import search_games
+from app.services.user_game_state_service import annotate_games, annotation_user_id
 
+ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
 
-# 🔹 Pomocnicze: konwersja do JSON
-def game_to_dict(game):
-    """
-    Konwertuje obiekt `Game` do słownika JSON-owalnego.
-
-    Args:
-        game (Game): Instancja gry.
+#: Zapas na pola tekstowe formularza ponad limit rozmiaru obrazka.
+FORM_OVERHEAD_BYTES = 64 * 1024
 
-    Returns:
-        dict: Słownik zawierający kluczowe informacje o grze:
-            - id (int)
-            - title (str)
-            - description (str|None)
-            - price (float|None)
-            - image_path (str|None)
-            - genres (list[str])
-            - tags (list[str])
-            - discount (float|None)
-    """
-    return {
-        "id": game.id,
-        "title": game.title,
-        "description": game.description,
-        "price": game.price,
-        "image_path": game.image_path,
-        "genres": [genre.name for genre in game.genres],
-        "tags": [tag.name for tag in game.tags],
-        "discount": game.discount,
-    }
-
-
-UPLOAD_FOLDER = "static/images/games"  # lub inna ścieżka
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+#: Dozwolone wartości parametru `source` endpointu podobnych gier.
+SIMILAR_SOURCES = ("auto", "interactions", "content")
 
 
 def allowed_file(filename):
@@ -131,11 +148,22 @@ def create_game():
     Response (400 Bad Request):
         {"error": "Title is required"}
 
+    Response (413 Payload Too Large):
+        {"error": "Obrazek jest za duży (maks. 5242880 bajtów)."}
+
     Uwagi:
         - Gatunki i tagi są dopinane tylko, jeśli istnieją w bazie (case-insensitive).
         - `discount` poza zakresem [0, 100] zostanie ustawiony na 0.0.
         - `image_path` przechowuje ścieżkę względną do statycznego pliku.
+        - Obrazek jest zapisywany jako `<sha256>.<ext>` (patrz `store_upload`),
+          więc identyczne okładki są przechowywane raz.
+        - Gra od razu trafia do indeksu podobieństwa gatunków i tagów
+          (patrz `ContentSimilarity.add_game`).
     """
+    # limit całego żądania – Werkzeug odrzuci większe body już przy parsowaniu
+    request.max_content_length = (
+        current_app.config["IMAGE_MAX_UPLOAD_BYTES"] + FORM_OVERHEAD_BYTES
+    )
     title = request.form.get("title")
     description = request.form.get("description")
     price_raw = request.form.get("price")
@@ -153,13 +181,13 @@ def create_game():
     # plik
     image = request.files.get("image")
     image_path = None
+    image_hash = None
     if image and allowed_file(image.filename):
-        filename = secure_filename(image.filename)
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        image.save(filepath)
-        # lepiej zapisać ścieżkę webową z forward slashem:
-        image_path = f"static/images/games/{filename}"
+        ext = image.filename.rsplit(".", 1)[1].lower()
+        try:
+            image_path, image_hash = store_upload(image.stream, ext)
+        except ImageTooLargeError as e:
+            return jsonify({"error": str(e)}), 413
 
     # cena -> float
     price = float(price_raw) if price_raw not in (None, "") else None
@@ -169,6 +197,7 @@ def create_game():
         description=description,
         price=price,
         image_path=image_path,
+        image_hash=image_hash,
         discount=discount,
     )
     db.session.add(game)
@@ -185,31 +214,395 @@ def create_game():
         if t:
             game.tags.append(t)
 
+    bump_catalog_version(features=True)
     db.session.commit()
+    content_similarity.add_game(
+        game.id, [g.id for g in game.genres], [t.id for t in game.tags]
+    )
+    # nowa gra może trafić do list `/similar` (gatunki i tagi) innych gier
+    response_cache.invalidate_tags("similar")
     return jsonify(game_to_dict(game)), 201
 
 
-# 🔸 Pobierz wszystkie gry
+# 🔸 Import wielu gier naraz (tylko admin)
+@api.route("admin/games/import", methods=["POST"])
+@requires_role("admin")
+def import_games_endpoint():
+    """
+    Hurtowy import gier ze strumienia NDJSON lub CSV.
+
+    Wymaga roli `"admin"` w JWT. Plik jest czytany strumieniowo i zapisywany
+    w paczkach (domyślnie po 500 wierszy, każda paczka to osobna transakcja).
+
+    Request:
+        Content-Type: application/x-ndjson
+            {"title": "Wiedźmin 3", "price": 99.99, "genres": ["RPG"], "tags": []}
+            {"title": "Cyberpunk 2077", "discount": 25, "description": "..."}
+
+        Content-Type: text/csv
+            title,description,price,discount,genres,tags
+            Wiedźmin 3,Gra RPG,99.99,20,RPG|Adventure,Open World
+
+        Query params:
+            format (str, optional): `ndjson` lub `csv` – nadpisuje Content-Type.
+
+    Response (200 OK):
+        {
+          "inserted": 49998,
+          "failed": 2,
+          "errors": [{"line": 17, "error": "Title is required"}, ...],
+          "errors_truncated": false,
+          "aborted": false
+        }
+
+    Response (415 Unsupported Media Type):
+        {"error": "Obsługiwane formaty: NDJSON (application/x-ndjson) i CSV (text/csv)."}
+
+    Uwagi:
+        - Zasady walidacji jak w `create_game`; gatunki i tagi są dopinane
+          tylko, jeśli istnieją w bazie (case-insensitive).
+        - Błędny wiersz nie przerywa importu – trafia do listy `errors`.
+        - Uszkodzony plik (kodowanie inne niż UTF-8, błędna składnia CSV)
+          kończy czytanie: odpowiedź to raport częściowy z `"aborted": true`
+          i błędem w linii, w której przerwano import.
+    """
+    fmt = request.args.get("format")
+    if not fmt:
+        mimetype = request.mimetype
+        if mimetype in ("text/csv", "application/csv"):
+            fmt = "csv"
+        elif mimetype in ("application/x-ndjson", "application/jsonl"):
+            fmt = "ndjson"
+    if fmt == "csv":
+        rows = iter_csv_rows(request.stream)
+    elif fmt == "ndjson":
+        rows = iter_ndjson_rows(request.stream)
+    else:
+        return (
+            jsonify(
+                {
+                    "error": "Obsługiwane formaty: NDJSON (application/x-ndjson) "
+                    "i CSV (text/csv)."
+                }
+            ),
+            415,
+        )
+    report = import_games(rows)
+    if report["inserted"]:
+        response_cache.invalidate_tags("similar")
+    return jsonify(report)
+
+
+# 🔸 Pobierz listę gier (stronicowanie kursorowe)
 @api.route("games", methods=["GET"])
+@catalog_etag
 def get_games():
     """
-    Zwraca listę wszystkich gier.
+    Zwraca stronę listy gier z filtrowaniem i sortowaniem.
+
+    Query params:
+        limit (int, optional): Rozmiar strony (domyślnie 24, maks. 100).
+        after (str, optional): Kursor `next_cursor` z poprzedniej strony.
+        sort (str, optional): `id` (domyślnie), `title`, `price`,
+            `effective_price`; prefiks `-` oznacza sortowanie malejące.
+        genre (str, optional): Nazwa gatunku; można powtarzać (gra musi mieć wszystkie).
+        tag (str, optional): Nazwa taga; można powtarzać (gra musi mieć wszystkie).
+        min_price, max_price (float, optional): Zakres ceny po rabacie.
+        has_discount (bool, optional): Tylko gry z rabatem (`true`) lub bez (`false`).
+        with_total (bool, optional): Dołącz łączną liczbę wyników (dodatkowy `COUNT`).
+        facets (str, optional): Dołącz liczniki faset, np. `genres,tags`
+            (patrz `get_game_facets`).
+        fields (str, optional): Pola gier w odpowiedzi, np. `id,title,price,image_url`
+            (pozostałe kolumny nie są czytane z bazy).
+        include (str, optional): Relacje do dołączenia, np. `genres,tags`
+            (patrz `parse_fields`).
+        ids (str, optional): Lista ID, np. `1,2,3` – zamiast strony katalogu
+            zwraca te gry (patrz `get_games_batch`; pozostałe parametry poza
+            `fields`/`include`/`annotate` są ignorowane).
+        annotate (bool, optional): Z poprawnym JWT dołącza do każdej gry
+            `in_wishlist` i `my_rating` zalogowanego użytkownika (jedno
+            dodatkowe zapytanie na stronę; odpowiedź omija ETag i cache).
 
-    Request:
-        Brak parametrów.
+    Response (200 OK):
+        {
+          "items": [ { ...game_to_dict... }, ... ],   # + in_wishlist, my_rating przy annotate
+          "next_cursor": "WyJpZCIsbnVsbCwyNF0",   # null na ostatniej stronie
+          "total": 124,                            # tylko gdy with_total=true
+          "facets": { ... }                        # tylko gdy podano facets
+        }
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'limit' musi być liczbą całkowitą."}
+    """
+    if "ids" in request.args:
+        return games_batch_response(request.args.get("ids"))
+    try:
+        filters = parse_catalog_filters(request.args)
+        sort_key, descending = parse_sort(request.args.get("sort"))
+        limit = parse_limit(request.args.get("limit"))
+        with_total = parse_bool(request.args.get("with_total"), "with_total")
+        facets = parse_facets(request.args.get("facets"))
+        fields = parse_fields(request.args)
+        user_id = annotation_user_id(request.args)
+        query = apply_catalog_filters(Game.query, filters)
+        games, next_cursor = paginate_games(
+            query.options(*game_card_options(fields, [SORT_COLUMNS[sort_key]])),
+            sort_key,
+            descending,
+            limit,
+            request.args.get("after"),
+        )
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items = [game_to_dict(game, fields) for game in games]
+    if user_id is not None:
+        annotate_games(user_id, [(game.id, item) for game, item in zip(games, items)])
+    body = {"items": items, "next_cursor": next_cursor}
+    if with_total:
+        body["total"] = query.order_by(None).count()
+    if facets:
+        body["facets"] = compute_facets(filters, facets)
+    return jsonify(body)
+
+
+def games_batch_response(raw_ids):
+    """
+    Buduje odpowiedź z grami o podanych ID (wspólne dla `?ids=` i `games/batch`).
+
+    Gry są czytane jednym zapytaniem (`WHERE id IN (...)`) plus po jednym
+    zapytaniu `selectin` na relację, a potem układane w kolejności żądania.
+    """
+    try:
+        ids = parse_ids(raw_ids, current_app.config["GAMES_BATCH_MAX_IDS"])
+        fields = parse_fields(request.args)
+        user_id = annotation_user_id(request.args)
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+
+    games = Game.query.options(*game_card_options(fields)).filter(Game.id.in_(ids))
+    by_id = {game.id: game for game in games}
+    items = [
+        (
+            game_to_dict(by_id[id_], fields)
+            if id_ in by_id
+            else {"id": id_, "error": "Not Found"}
+        )
+        for id_ in ids
+    ]
+    if user_id is not None:
+        annotate_games(
+            user_id, [(id_, item) for id_, item in zip(ids, items) if id_ in by_id]
+        )
+    return jsonify(
+        {"items": items, "missing": [id_ for id_ in ids if id_ not in by_id]}
+    )
+
+
+# 🔸 Hurtowe pobranie gier po ID
+@api.route("games/batch", methods=["POST"])
+def get_games_batch():
+    """
+    Zwraca wiele gier naraz – zamiast osobnego `GET games/<id>` dla każdej.
+
+    Request (JSON):
+        {"ids": [12, 3, 7]}
+
+    Query params:
+        fields (str, optional): Pola gier w odpowiedzi, np. `id,title,image_url`.
+        include (str, optional): Relacje do dołączenia, np. `genres,tags`.
+
+    Response (200 OK):
+        {
+          "items": [
+            { ...game_to_dict... },            # id 12
+            {"id": 3, "error": "Not Found"},   # brak gry o id 3
+            { ...game_to_dict... }             # id 7
+          ],
+          "missing": [3]
+        }
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'ids' może zawierać maksymalnie 100 ID."}
+
+    Uwagi:
+        - Kolejność `items` odpowiada kolejności `ids` (duplikaty są pomijane).
+        - Limit liczby ID ustawia `GAMES_BATCH_MAX_IDS` (domyślnie 100).
+        - Ten sam wynik daje `GET games?ids=12,3,7`.
+    """
+    data = request.get_json(silent=True)
+    return games_batch_response(data.get("ids") if isinstance(data, dict) else None)
+
+
+# 🔸 Liczniki faset (gatunki / tagi) dla filtra
+@api.route("games/facets", methods=["GET"])
+@catalog_etag
+def get_game_facets():
+    """
+    Zwraca liczby gier per gatunek i tag dla bieżącego filtra.
+
+    Query params:
+        facets (str, optional): Fasety do policzenia (domyślnie `genres,tags`).
+        genre, tag, min_price, max_price, has_discount: Filtry jak w `get_games`.
 
     Response (200 OK):
-        [
-          { ...game_to_dict... },
-          ...
-        ]
+        {
+          "genres": [{"name": "RPG", "count": 124}, {"name": "Action", "count": 87}],
+          "tags": [{"name": "Open World", "count": 87}]
+        }
+
+    Response (400 Bad Request):
+        {"error": "Nieznane fasety: ..."}
+
+    Uwagi:
+        - Wynik jest cache'owany przez kilkadziesiąt sekund (per filtr),
+          więc tuż po zmianie katalogu liczniki mogą być chwilowo nieaktualne.
     """
-    games = Game.query.all()
-    return jsonify([game_to_dict(game) for game in games])
+    try:
+        filters = parse_catalog_filters(request.args)
+        facets = parse_facets(request.args.get("facets") or "genres,tags")
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(compute_facets(filters, facets))
+
+
+def send_catalog_snapshot(info, cache_control):
+    """
+    Wysyła plik snapshotu katalogu (gzip) z nagłówkami cache.
+
+    Klient bez obsługi gzip dostaje treść dekompresowaną strumieniowo – to
+    inna reprezentacja, więc ma własny ETag (`<hash>-id`).
+    """
+    path = catalog_snapshot.path_for(info["etag"])
+    if "gzip" not in request.accept_encodings:
+        etag = f"{info['etag']}-id"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+
+            def generate():
+                with gzip.open(path, "rb") as f:
+                    while chunk := f.read(64 * 1024):
+                        yield chunk
+
+            response = Response(
+                stream_with_context(generate()), mimetype="application/json"
+            )
+        response.set_etag(etag)
+    else:
+        response = send_file(
+            path,
+            mimetype="application/json",
+            etag=info["etag"],
+            conditional=True,
+        )
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Content-Location"] = f"/api/games/snapshot/{info['etag']}"
+    return response
+
+
+# 🔸 Snapshot całego katalogu (plik statyczny)
+@api.route("games/snapshot", methods=["GET"])
+def get_catalog_snapshot():
+    """
+    Zwraca cały katalog gier jako prekompilowany plik JSON (gzip).
+
+    Response (200 OK):
+        Content-Encoding: gzip
+        ETag: "<hash treści>"
+        Content-Location: /api/games/snapshot/<hash>   # adres niezmiennej wersji
+        {
+          "version": 42,                       # wersja katalogu
+          "items": [ { ...game_to_dict... }, ... ]
+        }
+
+    Response (304 Not Modified):
+        Gdy `If-None-Match` zawiera ETag bieżącego snapshotu.
+
+    Uwagi:
+        - Snapshot jest przebudowywany w tle kilka sekund po zmianie
+          katalogu, więc może chwilowo nie zawierać najnowszych zmian.
+        - Adres z `Content-Location` można cache'ować bezterminowo.
+    """
+    info = catalog_snapshot.ensure_current()
+    return send_catalog_snapshot(info, "no-cache")
+
+
+@api.route("games/snapshot/<string:etag>", methods=["GET"])
+def get_catalog_snapshot_version(etag):
+    """
+    Zwraca konkretną (niezmienną) wersję snapshotu katalogu.
+
+    Args:
+        etag (str): Hash snapshotu z nagłówka `ETag`/`Content-Location`.
+
+    Response (200 OK):
+        Jak w `get_catalog_snapshot`, z `Cache-Control: public, max-age=31536000, immutable`.
+
+    Response (404 Not Found):
+        {"error": "Snapshot not found"}   # wersja już usunięta – pobierz bieżącą
+    """
+    if not etag.isalnum() or not os.path.isfile(catalog_snapshot.path_for(etag)):
+        return jsonify({"error": "Snapshot not found"}), 404
+    return send_catalog_snapshot({"etag": etag}, "public, max-age=31536000, immutable")
+
+
+# 🔸 Wyszukiwanie gier
+@api.route("games/search", methods=["GET"])
+@catalog_etag
+def search_games_endpoint():
+    """
+    Wyszukiwanie pełnotekstowe gier po tytule i opisie.
+
+    Query params:
+        q (str, required): Zapytanie, np. `wiedzmin` (bez rozróżniania
+            wielkości liter i akcentów, słowa dopasowywane prefiksowo).
+        limit (int, optional): Rozmiar strony (domyślnie 24, maks. 100).
+        offset (int, optional): Liczba pominiętych wyników (domyślnie 0).
+        annotate (bool, optional): Z JWT dołącza `in_wishlist` i `my_rating`
+            (patrz `get_games`).
+
+    Response (200 OK):
+        {
+          "items": [ { ...game_to_dict... }, ... ],   # od najtrafniejszych
+          "next_offset": 24                          # null na ostatniej stronie
+        }
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'q' jest wymagany."}
+    """
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Parametr 'q' jest wymagany."}), 400
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        offset = int(request.args.get("offset") or 0)
+        user_id = annotation_user_id(request.args)
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    except ValueError:
+        return jsonify({"error": "Parametr 'offset' musi być liczbą całkowitą."}), 400
+    if offset < 0:
+        return jsonify({"error": "Parametr 'offset' nie może być ujemny."}), 400
+
+    games, has_more = search_games(q, limit, offset, options=game_card_options())
+    items = [game_to_dict(game) for game in games]
+    if user_id is not None:
+        annotate_games(user_id, [(game.id, item) for game, item in zip(games, items)])
+    return jsonify(
+        {
+            "items": items,
+            "next_offset": offset + limit if has_more else None,
+        }
+    )
 
 
 # 🔸 Pobierz grę po ID
 @api.route("games/<int:game_id>", methods=["GET"])
+@catalog_etag(exists=game_exists)
+@cached_response(ttl=60, tags=lambda game_id: [f"game:{game_id}"])
 def get_game(game_id):
     """
     Zwraca szczegóły gry o podanym `game_id`.
@@ -217,14 +610,103 @@ def get_game(game_id):
     Args:
         game_id (int): ID gry.
 
+    Query params:
+        fields (str, optional): Pola w odpowiedzi, np. `id,title,price`.
+        include (str, optional): Relacje do dołączenia, np. `genres,tags`.
+        annotate (bool, optional): Z JWT dołącza `in_wishlist` i `my_rating`
+            (patrz `get_games`).
+
     Response (200 OK):
         { ...game_to_dict... }
 
+    Response (400 Bad Request):
+        {"error": "Nieznane pola w 'fields': foo. Dozwolone: ..."}
+
     Response (404 Not Found):
         {"message": "404 Not Found"}  # domyślna odpowiedź Flask `get_or_404`
     """
-    game = Game.query.get_or_404(game_id)
-    return jsonify(game_to_dict(game))
+    try:
+        fields = parse_fields(request.args)
+        user_id = annotation_user_id(request.args)
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    game = Game.query.options(*game_card_options(fields)).get_or_404(game_id)
+    data = game_to_dict(game, fields)
+    if user_id is not None:
+        annotate_games(user_id, [(game.id, data)])
+    return jsonify(data)
+
+
+# 🔸 Podobne gry (rekomendacje)
+@api.route("games/<int:game_id>/similar", methods=["GET"])
+@cached_response(ttl=300, tags=lambda game_id: [f"game:{game_id}", "similar"])
+def get_similar_games(game_id):
+    """
+    Zwraca gry podobne do wskazanej – najczęściej wybierane przez tych samych
+    użytkowników (wishlisty, dobre recenzje) lub o podobnych gatunkach i tagach.
+
+    Args:
+        game_id (int): ID gry.
+
+    Query params:
+        limit (int, optional): Liczba gier (domyślnie 10, maks. `RECOMMENDATIONS_TOP_K`).
+        fields (str, optional): Pola gier w odpowiedzi, np. `id,title,image_url`.
+        include (str, optional): Relacje do dołączenia, np. `genres,tags`.
+        source (str, optional): Źródło podobieństwa:
+            - `auto` (domyślnie) – współwystępowanie, a gdy gra nie ma jeszcze
+              sygnałów – gatunki i tagi,
+            - `interactions` – tylko współwystępowanie,
+            - `content` – tylko gatunki i tagi (Jaccard, patrz `ContentSimilarity`).
+
+    Response (200 OK):
+        {
+          "items": [ { ...game_to_dict..., "score": 0.83 }, ... ],  # od najbardziej podobnych
+          "source": "interactions"   # lub "content"
+        }
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'limit' musi być liczbą całkowitą."}
+        {"error": "Nieznane źródło 'foo'. Dozwolone: auto, interactions, content."}
+
+    Response (404 Not Found):
+        {"message": "404 Not Found"}
+
+    Note:
+        - Współwystępowanie pochodzi z indeksu budowanego przez
+          `flask build-recommendations` (patrz `SimilarGames`), a gatunki
+          i tagi – z indeksu bitowego w pamięci workera (`ContentSimilarity`).
+    """
+    try:
+        limit = parse_limit(request.args.get("limit"), 10, similar_games.top_k)
+        fields = parse_fields(request.args)
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    requested = request.args.get("source", "auto")
+    if requested not in SIMILAR_SOURCES:
+        allowed = ", ".join(SIMILAR_SOURCES)
+        return (
+            jsonify({"error": f"Nieznane źródło '{requested}'. Dozwolone: {allowed}."}),
+            400,
+        )
+    if db.session.get(Game, game_id) is None:
+        abort(404)
+
+    similar, source = [], requested
+    if requested in ("auto", "interactions"):
+        similar, source = similar_games.similar(game_id, limit), "interactions"
+    if not similar and requested in ("auto", "content"):
+        # nowe gry nie mają sygnałów – zostają gatunki i tagi
+        similar, source = content_similarity.similar(game_id, limit), "content"
+    games = Game.query.options(*game_card_options(fields)).filter(
+        Game.id.in_([id_ for id_, _ in similar])
+    )
+    by_id = {game.id: game for game in games}
+    items = [
+        {**game_to_dict(by_id[id_], fields), "score": round(score, 4)}
+        for id_, score in similar
+        if id_ in by_id
+    ]
+    return jsonify({"items": items, "source": source})
 
 
 # Dodatkowy endpoint
@@ -236,8 +718,27 @@ def get_game_image(game_id):
     Args:
         game_id (int): ID gry.
 
+    Query params:
+        v (str, optional): Wersja obrazka (prefiks hasha treści) – tak jak
+            w `image_url` zwracanym przez `game_to_dict`.
+        w (int, optional): Maksymalna szerokość wariantu (px).
+        h (int, optional): Maksymalna wysokość wariantu (px).
+        format (str, optional): `webp`, `jpeg` lub `png`.
+
     Response (200 OK):
         Zwraca binarną zawartość pliku z poprawnym `Content-Type`.
+        Z parametrami `w`/`h`/`format` – przeskalowany wariant (proporcje
+        zachowane, wymiary zaokrąglone w górę do stałych progów), generowany
+        raz i serwowany z dyskowego cache.
+
+    Response (206 Partial Content):
+        Fragment pliku dla nagłówka `Range`.
+
+    Response (304 Not Modified):
+        Gdy `If-None-Match` pasuje do ETagu (hasha treści).
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'w' musi być liczbą całkowitą."}
 
     Response (404 Not Found):
         {"error": "Image not found"}           # gdy `image_path` puste
@@ -246,28 +747,34 @@ def get_game_image(game_id):
     Uwagi:
         - Ścieżka jest liczona względem katalogu backendu.
         - Dla bezpieczeństwa pliki są serwowane tylko z przewidzianej lokalizacji.
+        - Gdy `v` zgadza się z aktualnym hashem, odpowiedź ma
+          `Cache-Control: public, max-age=31536000, immutable` (zmiana obrazka
+          zmienia URL); bez `v` klient rewaliduje przez ETag.
+        - Przy `IMAGE_SENDFILE_MODE` = `x-accel`/`x-sendfile` bajty wysyła
+          serwer WWW (patrz `send_image`).
     """
-    import os
-    import mimetypes
-
-    game = Game.query.get_or_404(game_id)
-
-    if not game.image_path:
+    try:
+        variant = parse_variant_params(request.args)
+    except ImageParamsError as e:
+        return jsonify({"error": str(e)}), 400
+
+    meta = get_image_meta(game_id)
+    if meta is None:
+        abort(404)
+    image_path, image_hash = meta
+    if not image_path:
         return {"error": "Image not found"}, 404
 
-    backend_root = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "..", "..")
-    )  # folder backend/
-
-    full_path = os.path.join(backend_root, game.image_path)
+    full_path = resolve_image_path(image_path)
+    if full_path is None:
+        return {"error": "File not found on disk"}, 404
 
-    normalized_full_path = full_path.replace("\\", "/")
+    image_hash = image_hash or file_digest(full_path)
+    immutable = request.args.get("v") == image_hash[:IMAGE_VERSION_LENGTH]
 
-    print("Full path:", normalized_full_path)
-    if not os.path.isfile(normalized_full_path):
-        return {"error": "File not found on disk"}, 404
+    if variant and image_variants.available:
+        path, mimetype = image_variants.get(full_path, variant)
+        etag = os.path.splitext(os.path.basename(path))[0]
+        return send_image(path, etag, immutable, mimetype=mimetype)
 
-    mimetype = (
-        mimetypes.guess_type(normalized_full_path)[0] or "application/octet-stream"
-    )
-    return send_file(normalized_full_path, mimetype=mimetype)
+    return send_image(full_path, image_hash, immutable)
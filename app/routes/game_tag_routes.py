@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.game_tag_model import Tag
+from app.custom_annotations import cached_response, catalog_etag
 from app.routes import tag_bp
+from app.services.catalog_version_service import bump_catalog_version
+from app.services.response_cache import response_cache
 
 
 # Dodaj nowy tag
@@ -46,12 +49,16 @@ def create_tag():
 
     tag = Tag(name=name)
     db.session.add(tag)
+    bump_catalog_version(features=True)
     db.session.commit()
+    response_cache.invalidate_tags("tags")
     return jsonify({"id": tag.id, "name": tag.name}), 201
 
 
 # Pobierz wszystkie tagi
 @tag_bp.route("", methods=["GET"])
+@catalog_etag
+@cached_response(ttl=300, tags=["tags"])
 def get_tags():
     """
     Endpoint pobierania wszystkich tagów.
@@ -1,11 +1,24 @@
 from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+
+from app.custom_annotations import cached_response, rate_limit
 
 from app import db
 from app.models import User
 from app.models.game_model import Game
 from app.models.review_model import Review
 from app.routes import api
+from app.services.catalog_service import CatalogQueryError, parse_limit
+from app.services.catalog_version_service import bump_catalog_version
+from app.services.rating_service import apply_rating_delta
+from app.services.response_cache import response_cache
+from app.services.review_service import (
+    DEFAULT_REVIEWS_PAGE_SIZE,
+    MAX_REVIEWS_PAGE_SIZE,
+    paginate_reviews,
+    upsert_review as save_review,
+)
 
 
 def validate_rating(value):
@@ -25,8 +38,14 @@ def validate_rating(value):
     return value if 1 <= value <= 5 else None
 
 
+def invalidate_game_review_cache(game_id):
+    """Unieważnia cache szczegółów gry (agregaty ocen) i listy jej recenzji."""
+    response_cache.invalidate_tags(f"game:{game_id}", f"game:{game_id}:reviews")
+
+
 @api.route("/games/<int:game_id>/review", methods=["POST"])
 @jwt_required()
+@rate_limit("30/minute", key="user")
 def upsert_review(game_id):
     """
     Dodaje lub aktualizuje recenzję gry dla zalogowanego użytkownika.
@@ -61,8 +80,16 @@ def upsert_review(game_id):
     Response (404 Not Found):
         {"message": "Gra nie istnieje."}
 
+    Response (429 Too Many Requests):
+        {"error": "Too Many Requests", "message": "..."}  # limit 30/min na użytkownika
+
     Response (500 Internal Server Error):
         {"message": "Nie udało się zapisać recenzji."}
+
+    Note:
+        - Zapis to `INSERT ... ON CONFLICT DO NOTHING`, a dla istniejącej
+          recenzji – `UPDATE` pod blokadą wiersza (patrz `upsert_review`);
+          równoległe żądania nie utworzą duplikatu ani nie zafałszują agregatów.
     """
     data = request.get_json(silent=True) or {}
     rating = validate_rating(data.get("rating"))
@@ -74,139 +101,159 @@ def upsert_review(game_id):
             400,
         )
 
-    # Sprawdź czy gra istnieje
-    game = Game.query.get(game_id)
-    if not game:
-        return jsonify({"message": "Gra nie istnieje."}), 404
-
-    user_id = get_jwt_identity()  # zakładam, że tu trzymasz user_id
+    user_id = int(get_jwt_identity())
 
     try:
-        # Spróbuj znaleźć istniejącą recenzję
-        review = Review.query.filter_by(user_id=user_id, game_id=game_id).first()
-
-        if review:
-            # UPDATE
-            review.rating = rating
-            review.comment = comment
-            db.session.commit()
-            return (
-                jsonify(
-                    {
-                        "message": "Recenzja zaktualizowana.",
-                        "review": {
-                            "id": review.id,
-                            "user_id": review.user_id,
-                            "game_id": review.game_id,
-                            "rating": review.rating,
-                            "comment": review.comment,
-                        },
-                    }
-                ),
-                200,
-            )
-        else:
-            # INSERT
-            review = Review(
-                user_id=user_id, game_id=game_id, rating=rating, comment=comment
-            )
-            db.session.add(review)
-            db.session.commit()
-            return (
-                jsonify(
-                    {
-                        "message": "Recenzja dodana.",
-                        "review": {
-                            "id": review.id,
-                            "user_id": review.user_id,
-                            "game_id": review.game_id,
-                            "rating": review.rating,
-                            "comment": review.comment,
-                        },
-                    }
-                ),
-                201,
-            )
+        review, old_rating = save_review(user_id, game_id, rating, comment)
+    except IntegrityError:
+        # klucz obcy – gra nie istnieje
+        db.session.rollback()
+        return jsonify({"message": "Gra nie istnieje."}), 404
 
-    except Exception as e:
+    try:
+        apply_rating_delta(game_id, old_rating, rating)
+        bump_catalog_version()
+        db.session.commit()
+    except Exception:
         db.session.rollback()
-        # Jeżeli constraint zadziałał i złapiesz IntegrityError, możesz zwrócić 409.
-        # Żeby nie wyciekać szczegółów DB, zwróć ogólny komunikat:
         return jsonify({"message": "Nie udało się zapisać recenzji."}), 500
+    invalidate_game_review_cache(game_id)
+
+    created = old_rating is None
+    return (
+        jsonify(
+            {
+                "message": (
+                    "Recenzja dodana." if created else "Recenzja zaktualizowana."
+                ),
+                "review": {
+                    "id": review.id,
+                    "user_id": review.user_id,
+                    "game_id": review.game_id,
+                    "rating": review.rating,
+                    "comment": review.comment,
+                },
+            }
+        ),
+        201 if created else 200,
+    )
 
 
 @api.route("/users/me/reviews", methods=["GET"])
 @jwt_required()
 def get_my_reviews():
     """
-    Pobiera wszystkie recenzje zalogowanego użytkownika.
+    Zwraca stronę recenzji zalogowanego użytkownika (od najnowszych).
 
     Request:
         Wymaga JWT.
 
+    Query params:
+        limit (int, optional): Rozmiar strony (domyślnie 20, maks. 100).
+        after (str, optional): Kursor `next_cursor` z poprzedniej strony.
+
     Response (200 OK):
-        [
-          {
-            "id": 1,
-            "game_id": 10,
-            "game_title": "Wiedźmin 3",
-            "rating": 5,
-            "comment": "Świetna!"
-          },
-          ...
-        ]
+        {
+          "items": [
+            {
+              "id": 1,
+              "game_id": 10,
+              "game_title": "Wiedźmin 3",
+              "rating": 5,
+              "comment": "Świetna!"
+            },
+            ...
+          ],
+          "next_cursor": "WyJyZXZpZXciLG51bGwsMV0"   # null na ostatniej stronie
+        }
+
+    Response (400 Bad Request):
+        {"error": "Niepoprawny kursor 'after'."}
     """
     user_id = get_jwt_identity()
 
-    reviews = (
-        db.session.query(Review)
-        .join(Game, Review.game_id == Game.id)
-        .filter(Review.user_id == user_id)
-        .all()
-    )
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            DEFAULT_REVIEWS_PAGE_SIZE,
+            MAX_REVIEWS_PAGE_SIZE,
+        )
+        rows, next_cursor = paginate_reviews(
+            db.session.query(Review, Game.title)
+            .join(Game, Review.game_id == Game.id)
+            .filter(Review.user_id == user_id),
+            limit,
+            request.args.get("after"),
+        )
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
 
-    result = [
+    items = [
         {
             "id": r.id,
             "game_id": r.game_id,
-            "game_title": r.game.title if r.game else None,
+            "game_title": title,
             "rating": r.rating,
             "comment": r.comment,
         }
-        for r in reviews
+        for r, title in rows
     ]
 
-    return jsonify(result), 200
+    return jsonify({"items": items, "next_cursor": next_cursor}), 200
 
 
 @api.route("games/<int:game_id>/reviews", methods=["GET"])
+@cached_response(ttl=30, tags=lambda game_id: [f"game:{game_id}:reviews"])
 def get_game_reviews(game_id):
     """
-    Pobiera wszystkie recenzje dla wybranej gry.
+    Zwraca stronę recenzji wybranej gry (od najnowszych).
 
     Args:
         game_id (int): ID gry.
 
+    Query params:
+        limit (int, optional): Rozmiar strony (domyślnie 20, maks. 100).
+        after (str, optional): Kursor `next_cursor` z poprzedniej strony.
+
     Response (200 OK):
-        [
-          {
-            "id": 1,
-            "user_id": 3,
-            "username": "janek",
-            "rating": 5,
-            "comment": "Świetna!"
-          },
-          ...
-        ]
+        {
+          "items": [
+            {
+              "id": 1,
+              "user_id": 3,
+              "username": "janek",
+              "rating": 5,
+              "comment": "Świetna!"
+            },
+            ...
+          ],
+          "next_cursor": "WyJyZXZpZXciLG51bGwsMV0"   # null na ostatniej stronie
+        }
+
+    Response (400 Bad Request):
+        {"error": "Niepoprawny kursor 'after'."}
+
+    Note:
+        - Strona to jeden skan zakresu indeksu `(game_id, id)`, niezależnie od
+          liczby recenzji gry i numeru strony.
     """
-    rows = (
-        db.session.query(Review, User.username)
-        .join(User, Review.user_id == User.id)
-        .filter(Review.game_id == game_id)
-        .order_by(Review.id.desc())
-        .all()
-    )
-    data = [
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            DEFAULT_REVIEWS_PAGE_SIZE,
+            MAX_REVIEWS_PAGE_SIZE,
+        )
+        rows, next_cursor = paginate_reviews(
+            db.session.query(Review, User.username)
+            .join(User, Review.user_id == User.id)
+            .filter(Review.game_id == game_id),
+            limit,
+            request.args.get("after"),
+        )
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items = [
         {
             "id": r.id,
             "user_id": r.user_id,
@@ -216,4 +263,4 @@ def get_game_reviews(game_id):
         }
         for r, username in rows
     ]
-    return jsonify(data), 200
+    return jsonify({"items": items, "next_cursor": next_cursor}), 200
@@ -1,5 +1,9 @@
 from flask import jsonify
 from . import api
+from app.services.auth_cache import claims_cache
+from app.services.catalog_service import facet_cache
+from app.services.compression import compression
+from app.services.response_cache import response_cache
 from app.services.util_service import get_user_count, get_debug_token_info
 from ..custom_annotations import requires_role
 
@@ -79,6 +83,36 @@ def admin_only_endpoint():
     return jsonify({"msg": "Witaj adminie!"})
 
 
+@api.route("/admin/cache-stats", methods=["GET"])
+@requires_role("admin")
+def cache_stats():
+    """
+    Statystyki cache (trafienia, chybienia, usunięcia) do strojenia TTL i rozmiarów.
+
+    Wymaga roli `"admin"` w JWT. Liczniki dotyczą bieżącego procesu (workera).
+
+    Response (200 OK):
+        {
+            "responses": {"backend": "memory", "size": 120, "max_entries": 1024,
+                          "evictions": 0, "hits": 950, "misses": 130},
+            "facets": {"size": 12, "maxsize": 256, "hits": 40, "misses": 12,
+                       "evictions": 0},
+            "compression": {"size": 30, "maxsize": 256, "hits": 300, "misses": 30,
+                            "evictions": 0},  # null, gdy cache kompresji wyłączony
+            "auth_claims": {"size": 8, "maxsize": 4096, "hits": 120, "misses": 8,
+                            "evictions": 0}   # null, gdy cache tokenów wyłączony
+        }
+    """
+    return jsonify(
+        {
+            "responses": response_cache.stats(),
+            "facets": facet_cache.stats(),
+            "compression": compression.stats(),
+            "auth_claims": claims_cache.stats(),
+        }
+    )
+
+
 @api.route("/debug-token", methods=["GET"])
 def debug_token():
     """
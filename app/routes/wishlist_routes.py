@@ -1,13 +1,29 @@
-from flask import jsonify
+from flask import current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from app import db
+from app.custom_annotations import rate_limit
 from app.models.game_model import Game
 from app.models.wish_list import WishList  # dostosuj import do swojej struktury
+from app.services.catalog_service import CatalogQueryError, parse_ids
+from app.services.game_serializer import (
+    game_card_options,
+    parse_fields,
+    wishlist_item_to_dict,
+)
+from app.services.wishlist_service import (
+    add_wishlist_item,
+    add_wishlist_items,
+    missing_game_ids,
+    remove_wishlist_items,
+    replace_wishlist,
+)
 from . import api
 
 
 @api.route("/wishlist/<int:game_id>", methods=["POST"])
 @jwt_required()
+@rate_limit("60/minute", key="user")
 def add_to_wishlist(game_id):
     """
     Dodaje grę do wishlisty zalogowanego użytkownika.
@@ -38,32 +54,38 @@ def add_to_wishlist(game_id):
           "message": "Gra nie istnieje."
         }
 
+    Response (429 Too Many Requests):
+        {
+          "error": "Too Many Requests",
+          "message": "Przekroczono limit żądań, spróbuj ponownie później."
+        }
+        (limit 60/min na użytkownika, nagłówek `Retry-After`)
+
     Response (500 Internal Server Error):
         {
           "message": "Nie udało się dodać do wishlisty."
         }
-    """
-    user_id = get_jwt_identity()
 
-    # Sprawdź czy gra istnieje
-    game = Game.query.get(game_id)
-    if not game:
-        return jsonify({"message": "Gra nie istnieje."}), 404
-
-    # Czy już jest na wishliście?
-    existing = WishList.query.filter_by(user_id=user_id, game_id=game_id).first()
-    if existing:
-        return jsonify({"message": "Gra już jest na Twojej wishliście."}), 200
+    Note:
+        - Zapis to jedno `INSERT ... ON CONFLICT DO NOTHING` – równoległe
+          żądania nie utworzą duplikatu.
+    """
+    user_id = int(get_jwt_identity())
 
-    # Dodaj
-    wl = WishList(user_id=user_id, game_id=game_id)
-    db.session.add(wl)
     try:
+        wl = add_wishlist_item(user_id, game_id)
         db.session.commit()
+    except IntegrityError:
+        # klucz obcy – gra nie istnieje
+        db.session.rollback()
+        return jsonify({"message": "Gra nie istnieje."}), 404
     except Exception:
         db.session.rollback()
         return jsonify({"message": "Nie udało się dodać do wishlisty."}), 500
 
+    if wl is None:
+        return jsonify({"message": "Gra już jest na Twojej wishliście."}), 200
+
     return (
         jsonify(
             {
@@ -84,6 +106,10 @@ def get_my_wishlist():
     Request:
         Wymaga JWT w nagłówku `Authorization: Bearer <token>`.
 
+    Query params:
+        fields (str, optional): Pola gier w odpowiedzi, np. `id,title,price,image_url`.
+        include (str, optional): Relacje do dołączenia, np. `genres,tags`.
+
     Response (200 OK):
         [
           {
@@ -100,29 +126,163 @@ def get_my_wishlist():
           ...
         ]
 
+    Response (400 Bad Request):
+        {"error": "Nieznane pola w 'fields': foo. Dozwolone: ..."}
+
     Note:
-        - Wynik zawiera wszystkie szczegóły gier z wishlisty.
+        - Bez `fields`/`include` wynik zawiera wszystkie szczegóły gier z wishlisty.
         - `discount` jest zwracany jako `0` jeśli brak wartości w bazie.
     """
+    try:
+        fields = parse_fields(request.args)
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     user_id = get_jwt_identity()
     items = (
         db.session.query(WishList, Game)
         .join(Game, WishList.game_id == Game.id)
         .filter(WishList.user_id == user_id)
+        .options(*game_card_options(fields))
         .all()
     )
-    data = [
+    data = [wishlist_item_to_dict(wl, g, fields) for wl, g in items]
+    return jsonify(data), 200
+
+
+def wishlist_batch_response(action):
+    """
+    Wspólna obsługa hurtowych zmian wishlisty (`POST`/`DELETE`/`PUT`).
+
+    Lista ID jest walidowana, istnienie gier sprawdzane jednym zapytaniem,
+    a zmiana zapisywana wielowierszowym `INSERT`/`DELETE` w jednej transakcji.
+
+    Args:
+        action (str): `"add"`, `"remove"` lub `"replace"`.
+    """
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get("ids") if isinstance(data, dict) else None
+    try:
+        if action == "replace" and raw_ids == []:
+            game_ids = []  # pusta lista czyści wishlistę
+        else:
+            game_ids = parse_ids(raw_ids, current_app.config["WISHLIST_BATCH_MAX_IDS"])
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if action != "remove":
+        missing = missing_game_ids(game_ids)
+        if missing:
+            return jsonify({"message": "Gra nie istnieje.", "missing": missing}), 404
+
+    user_id = int(get_jwt_identity())
+    added, removed = [], []
+    try:
+        if action == "add":
+            added = add_wishlist_items(user_id, game_ids)
+        elif action == "remove":
+            removed = remove_wishlist_items(user_id, game_ids)
+        else:
+            added, removed = replace_wishlist(user_id, game_ids)
+        db.session.commit()
+    except IntegrityError:
+        # gra usunięta między sprawdzeniem a zapisem
+        db.session.rollback()
+        return jsonify({"message": "Gra nie istnieje."}), 404
+    except Exception:
+        db.session.rollback()
+        return jsonify({"message": "Nie udało się zapisać wishlisty."}), 500
+
+    return (
+        jsonify(
+            {
+                "added": added,
+                "removed": removed,
+                "unchanged": len(game_ids)
+                - len(removed if action == "remove" else added),
+            }
+        ),
+        200,
+    )
+
+
+@api.route("/users/me/wishlist", methods=["POST"])
+@jwt_required()
+@rate_limit("10/minute", key="user")
+def add_many_to_wishlist():
+    """
+    Dodaje wiele gier do wishlisty zalogowanego użytkownika naraz.
+
+    Request JSON:
+        {"ids": [10, 12, 15]}   # maks. `WISHLIST_BATCH_MAX_IDS` (domyślnie 500)
+
+    Response (200 OK):
         {
-            "wishlist_item_id": wl.id,
-            "game_id": g.id,
-            "title": g.title,
-            "description": g.description,
-            "price": g.price,
-            "discount": getattr(g, "discount", 0) or 0,
-            "image_path": g.image_path,
-            "genres": [x.name for x in g.genres],
-            "tags": [x.name for x in g.tags],
+          "added": [10, 15],    # gry dodane tym żądaniem
+          "removed": [],
+          "unchanged": 1        # gry, które już były na wishliście
         }
-        for wl, g in items
-    ]
-    return jsonify(data), 200
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'ids' musi być niepustą listą ID."}
+
+    Response (404 Not Found):
+        {"message": "Gra nie istnieje.", "missing": [999]}
+        (nic nie jest zapisywane)
+
+    Response (429 Too Many Requests):
+        {"error": "Too Many Requests", "message": "..."}  # limit 10/min na użytkownika
+    """
+    return wishlist_batch_response("add")
+
+
+@api.route("/users/me/wishlist", methods=["DELETE"])
+@jwt_required()
+@rate_limit("10/minute", key="user")
+def remove_many_from_wishlist():
+    """
+    Usuwa wiele gier z wishlisty zalogowanego użytkownika naraz.
+
+    Request JSON:
+        {"ids": [10, 12]}
+
+    Response (200 OK):
+        {
+          "added": [],
+          "removed": [10],      # gry usunięte tym żądaniem
+          "unchanged": 1        # gry, których nie było na wishliście
+        }
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'ids' musi być niepustą listą ID."}
+
+    Note:
+        - Nieistniejące gry nie są błędem – trafiają do `unchanged`.
+    """
+    return wishlist_batch_response("remove")
+
+
+@api.route("/users/me/wishlist", methods=["PUT"])
+@jwt_required()
+@rate_limit("10/minute", key="user")
+def replace_my_wishlist():
+    """
+    Zastępuje całą wishlistę zalogowanego użytkownika podaną listą gier.
+
+    Request JSON:
+        {"ids": [10, 12, 15]}   # `[]` czyści wishlistę
+
+    Response (200 OK):
+        {
+          "added": [12],        # gry dodane względem poprzedniej wishlisty
+          "removed": [7, 8],    # gry usunięte z poprzedniej wishlisty
+          "unchanged": 2        # gry z listy, które już były na wishliście
+        }
+
+    Response (400 Bad Request):
+        {"error": "Parametr 'ids' musi być niepustą listą ID."}
+
+    Response (404 Not Found):
+        {"message": "Gra nie istnieje.", "missing": [999]}
+        (nic nie jest zapisywane)
+    """
+    return wishlist_batch_response("replace")
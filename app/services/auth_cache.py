@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import time
+
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request
+from flask_jwt_extended.exceptions import RevokedTokenError
+
+from app.services.token_service import revoked_tokens
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class VerifiedToken:
+    """
+    Zweryfikowany token JWT.
+
+    Atrybuty:
+        header (dict): Nagłówek JWT.
+        claims (dict): Claimy JWT.
+        roles (frozenset[str]): Role z claimu `roles` (sprawdzanie w O(1)).
+    """
+
+    __slots__ = ("header", "claims", "roles")
+
+    def __init__(self, header, claims):
+        self.header = header
+        self.claims = claims
+        self.roles = frozenset(claims.get("roles") or ())
+
+
+class ClaimsCache:
+    """
+    Cache zweryfikowanych tokenów JWT (LRU), kluczowany skrótem tokenu.
+
+    Wpis żyje do `exp` tokenu, więc kolejne żądania z tym samym tokenem
+    pomijają dekodowanie i sprawdzanie podpisu. W cache trafiają tylko
+    tokeny, które przeszły pełną weryfikację.
+
+    Konfiguracja:
+        - `AUTH_CLAIMS_CACHE_SIZE`: maksymalna liczba tokenów (domyślnie 4096,
+          0 wyłącza cache).
+    """
+
+    def __init__(self):
+        self._cache = None
+
+    def init_app(self, app):
+        size = int(app.config.get("AUTH_CLAIMS_CACHE_SIZE", 4096))
+        self._cache = TTLCache(maxsize=size, ttl=60) if size else None
+
+    @staticmethod
+    def _key(token):
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token):
+        """Zwraca `VerifiedToken` dla tokenu lub `None`."""
+        if self._cache is None:
+            return None
+        return self._cache.get(self._key(token))
+
+    def put(self, token, header, claims):
+        """Zapisuje zweryfikowany token (do jego `exp`) i zwraca `VerifiedToken`."""
+        verified = VerifiedToken(header, claims)
+        ttl = claims.get("exp", 0) - time.time()
+        if self._cache is not None and ttl > 0:
+            self._cache.set(self._key(token), verified, ttl=ttl)
+        return verified
+
+    def clear(self):
+        if self._cache is not None:
+            self._cache.clear()
+
+    def stats(self):
+        """Statystyki cache (lub `None`, gdy wyłączony)."""
+        return self._cache.stats() if self._cache is not None else None
+
+
+claims_cache = ClaimsCache()
+
+
+def _request_token():
+    """Wyciąga surowy token z nagłówka `Authorization: Bearer <token>`."""
+    header = request.headers.get(current_app.config["JWT_HEADER_NAME"], "")
+    token_type = current_app.config["JWT_HEADER_TYPE"]
+    parts = header.split()
+    if token_type:
+        if len(parts) != 2 or parts[0] != token_type:
+            return None
+        return parts[1]
+    return parts[0] if len(parts) == 1 else None
+
+
+def verify_request_token():
+    """
+    Weryfikuje token JWT bieżącego żądania, korzystając z `claims_cache`.
+
+    Przy trafieniu w cache odtwarzany jest kontekst `flask_jwt_extended`,
+    więc w widoku działają `get_jwt()` i `get_jwt_identity()`. Unieważnienie
+    tokenu jest sprawdzane zawsze (`revoked_tokens`), także przy trafieniu.
+
+    Returns:
+        VerifiedToken|None: Zweryfikowany token lub `None` dla metod
+        zwolnionych z weryfikacji (`JWT_EXEMPT_METHODS`, np. OPTIONS).
+
+    Raises:
+        Wyjątki `flask_jwt_extended` (brak/niepoprawny/wygasły token) –
+        obsługiwane przez `register_jwt_error_handlers`.
+    """
+    token = _request_token()
+    verified = claims_cache.get(token) if token else None
+    if verified is None:
+        decoded = verify_jwt_in_request()
+        if decoded is None:
+            return None
+        header, claims = decoded
+        if token:
+            verified = claims_cache.put(token, header, claims)
+        else:
+            verified = VerifiedToken(header, claims)
+    else:
+        if revoked_tokens.is_revoked(verified.claims["jti"]):
+            raise RevokedTokenError(verified.header, verified.claims)
+        # te same atrybuty ustawia `verify_jwt_in_request`
+        g._jwt_extended_jwt_header = verified.header
+        g._jwt_extended_jwt = verified.claims
+        g._jwt_extended_jwt_user = {"loaded_user": None}
+        g._jwt_extended_jwt_location = "headers"
+    logger.debug("JWT claims: %s", verified.claims)
+    return verified
@@ -0,0 +1,436 @@
+import base64
+import json
+
+from sqlalchemy import exists, func, literal, or_, select, tuple_, union_all
+
+from app import db
+from app.models.game_genre_model import Genre, game_genre
+from app.models.game_model import Game
+from app.models.game_tag_model import Tag, game_tag
+from app.services.ttl_cache import TTLCache
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+MAX_BATCH_IDS = 100
+
+#: Dozwolone klucze sortowania → kolumna modelu `Game`.
+#: Każdy klucz ma indeks `(kolumna, id)`, więc stronicowanie to skan zakresu indeksu.
+SORT_COLUMNS = {
+    "id": Game.id,
+    "title": Game.title,
+    "price": Game.price,
+    "effective_price": Game.effective_price,
+}
+
+#: Dostępne fasety (liczniki) → (tabela asocjacyjna, kolumna FK, model słownika).
+FACETS = {
+    "genres": (game_genre, game_genre.c.genre_id, Genre),
+    "tags": (game_tag, game_tag.c.tag_id, Tag),
+}
+FACETS_CACHE_TTL = 30
+
+#: Cache liczników faset, kluczowany znormalizowanym filtrem.
+facet_cache = TTLCache(maxsize=256, ttl=FACETS_CACHE_TTL)
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+class CatalogQueryError(ValueError):
+    """Błąd walidacji parametrów zapytania o katalog (mapowany na 400)."""
+
+
+def parse_bool(val, field):
+    """
+    Parsuje wartość logiczną z query stringa.
+
+    Args:
+        val (str|None): Wartość parametru.
+        field (str): Nazwa parametru (do komunikatu błędu).
+
+    Returns:
+        bool|None: `True`/`False` lub `None`, gdy parametr nie został podany.
+
+    Raises:
+        CatalogQueryError: Gdy wartość nie jest rozpoznawalna.
+    """
+    if val in (None, ""):
+        return None
+    val = val.strip().lower()
+    if val in TRUE_VALUES:
+        return True
+    if val in FALSE_VALUES:
+        return False
+    raise CatalogQueryError(f"Parametr '{field}' musi być wartością logiczną.")
+
+
+def parse_float(val, field):
+    """Parsuje liczbę zmiennoprzecinkową z query stringa (akceptuje przecinek)."""
+    if val in (None, ""):
+        return None
+    try:
+        return float(str(val).replace(",", "."))
+    except ValueError:
+        raise CatalogQueryError(f"Parametr '{field}' musi być liczbą.")
+
+
+def parse_limit(val, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    Parsuje rozmiar strony.
+
+    Returns:
+        int: Liczba z zakresu 1..`maximum`.
+
+    Raises:
+        CatalogQueryError: Gdy wartość nie jest dodatnią liczbą całkowitą.
+    """
+    if val in (None, ""):
+        return default
+    try:
+        limit = int(val)
+    except ValueError:
+        raise CatalogQueryError("Parametr 'limit' musi być liczbą całkowitą.")
+    if limit < 1:
+        raise CatalogQueryError("Parametr 'limit' musi być większy od zera.")
+    return min(limit, maximum)
+
+
+def parse_ids(val, maximum=MAX_BATCH_IDS):
+    """
+    Parsuje listę ID gier do pobrania hurtem.
+
+    Args:
+        val (str|list): `"1,2,3"` z query stringa lub lista z JSON-a.
+        maximum (int): Maksymalna liczba ID.
+
+    Returns:
+        list[int]: ID w kolejności żądania, bez duplikatów.
+
+    Raises:
+        CatalogQueryError: Gdy lista jest pusta, za długa lub zawiera coś
+            innego niż liczby całkowite (`int` z JSON-a lub ciąg cyfr) –
+            np. `1.9` nie jest obcinane do `1`, tylko odrzucane.
+    """
+    if isinstance(val, str):
+        val = [v for v in val.split(",") if v.strip()]
+    if not isinstance(val, list) or not val:
+        raise CatalogQueryError("Parametr 'ids' musi być niepustą listą ID.")
+    ids = []
+    for v in val:
+        if isinstance(v, str) and v.strip().isascii() and v.strip().isdigit():
+            v = int(v)
+        if not isinstance(v, int) or isinstance(v, bool):
+            raise CatalogQueryError(
+                "Parametr 'ids' może zawierać tylko liczby całkowite."
+            )
+        ids.append(v)
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > maximum:
+        raise CatalogQueryError(
+            f"Parametr 'ids' może zawierać maksymalnie {maximum} ID."
+        )
+    return ids
+
+
+def game_exists(game_id):
+    """
+    Sprawdza istnienie gry jednym zapytaniem `EXISTS` (bez ładowania encji).
+
+    Returns:
+        bool: `True`, gdy gra o podanym ID istnieje.
+    """
+    return db.session.scalar(select(exists().where(Game.id == game_id)))
+
+
+def parse_names(args, field):
+    """
+    Pobiera listę nazw z query stringa.
+
+    Obsługuje powtarzane klucze (`genre=RPG&genre=Action`) oraz listę
+    rozdzieloną przecinkami (`genre=RPG,Action`).
+    """
+    names = []
+    for raw in args.getlist(field):
+        names.extend(n.strip() for n in raw.split(",") if n.strip())
+    return names
+
+
+def parse_catalog_filters(args):
+    """
+    Buduje słownik filtrów katalogu z parametrów żądania.
+
+    Args:
+        args (MultiDict): `request.args`.
+
+    Returns:
+        dict: Klucze `genres`, `tags`, `min_price`, `max_price`, `has_discount`.
+
+    Raises:
+        CatalogQueryError: Gdy któryś z parametrów jest niepoprawny.
+    """
+    filters = {
+        "genres": parse_names(args, "genre"),
+        "tags": parse_names(args, "tag"),
+        "min_price": parse_float(args.get("min_price"), "min_price"),
+        "max_price": parse_float(args.get("max_price"), "max_price"),
+        "has_discount": parse_bool(args.get("has_discount"), "has_discount"),
+    }
+    if (
+        filters["min_price"] is not None
+        and filters["max_price"] is not None
+        and filters["min_price"] > filters["max_price"]
+    ):
+        raise CatalogQueryError("'min_price' nie może być większe niż 'max_price'.")
+    return filters
+
+
+def apply_catalog_filters(query, filters):
+    """
+    Nakłada filtry katalogu na zapytanie o gry.
+
+    Gatunki i tagi są sprawdzane przez `EXISTS` na tabelach asocjacyjnych
+    (gra musi mieć **wszystkie** podane gatunki/tagi, porównanie bez
+    rozróżniania wielkości liter). Zakres cen dotyczy ceny po rabacie
+    (`Game.effective_price`).
+
+    Args:
+        query (Query|Select): Zapytanie zawierające encję `Game`.
+        filters (dict): Wynik `parse_catalog_filters`.
+
+    Returns:
+        Query|Select: Zapytanie z dołożonymi warunkami `WHERE`.
+    """
+    for name in filters.get("genres") or []:
+        query = query.filter(
+            exists().where(
+                game_genre.c.game_id == Game.id,
+                game_genre.c.genre_id == Genre.id,
+                func.lower(Genre.name) == name.lower(),
+            )
+        )
+    for name in filters.get("tags") or []:
+        query = query.filter(
+            exists().where(
+                game_tag.c.game_id == Game.id,
+                game_tag.c.tag_id == Tag.id,
+                func.lower(Tag.name) == name.lower(),
+            )
+        )
+    if filters.get("min_price") is not None:
+        query = query.filter(Game.effective_price >= filters["min_price"])
+    if filters.get("max_price") is not None:
+        query = query.filter(Game.effective_price <= filters["max_price"])
+    if filters.get("has_discount") is True:
+        query = query.filter(Game.discount > 0)
+    elif filters.get("has_discount") is False:
+        query = query.filter(or_(Game.discount.is_(None), Game.discount <= 0))
+    return query
+
+
+def parse_sort(val):
+    """
+    Parsuje parametr `sort` (np. `"price"`, `"-effective_price"`).
+
+    Returns:
+        tuple[str, bool]: (klucz sortowania, czy malejąco).
+
+    Raises:
+        CatalogQueryError: Gdy klucz nie jest obsługiwany.
+    """
+    val = (val or "id").strip()
+    descending = val.startswith("-")
+    key = val.lstrip("-")
+    if key not in SORT_COLUMNS:
+        allowed = ", ".join(sorted(SORT_COLUMNS))
+        raise CatalogQueryError(
+            f"Nieobsługiwane sortowanie '{key}'. Dozwolone: {allowed}."
+        )
+    return key, descending
+
+
+def encode_cursor(sort_key, value, last_id):
+    """Koduje pozycję ostatniego elementu strony do nieprzezroczystego kursora."""
+    raw = json.dumps([sort_key, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort_key):
+    """
+    Dekoduje kursor zwrócony przez `encode_cursor`.
+
+    Returns:
+        tuple: (wartość kolumny sortowania, id ostatniego elementu).
+
+    Raises:
+        CatalogQueryError: Gdy kursor jest uszkodzony lub dotyczy innego sortowania.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = int(last_id)
+    except (ValueError, TypeError):
+        raise CatalogQueryError("Niepoprawny kursor 'after'.")
+    if key != sort_key:
+        raise CatalogQueryError("Kursor 'after' dotyczy innego sortowania.")
+    return value, last_id
+
+
+def keyset_condition(column, descending, value, last_id):
+    """
+    Warunek „za ostatnim elementem” dla sortowania `(kolumna, id)`.
+
+    To zwykłe porównanie wierszy `(kolumna, id) < (wartość, id)`, więc baza
+    realizuje je skanem zakresu indeksu `(kolumna, id)` w obu kierunkach.
+    Wartości `NULL` nie są tu obsługiwane – `paginate_games` stronicuje je
+    osobno.
+    """
+    if column is Game.id:
+        return Game.id < last_id if descending else Game.id > last_id
+    if descending:
+        return tuple_(column, Game.id) < tuple_(value, last_id)
+    return tuple_(column, Game.id) > tuple_(value, last_id)
+
+
+def order_clauses(column, descending):
+    """Klauzule `ORDER BY` zgodne z `keyset_condition`."""
+    if column is Game.id:
+        return [Game.id.desc() if descending else Game.id.asc()]
+    if descending:
+        return [column.desc(), Game.id.desc()]
+    return [column.asc(), Game.id.asc()]
+
+
+def paginate_games(query, sort_key, descending, limit, after=None):
+    """
+    Pobiera jedną stronę gier metodą keyset (kursorową).
+
+    Zamiast `OFFSET` używany jest warunek na ostatnio zwróconym elemencie,
+    więc koszt strony nie zależy od tego, jak daleko w katalogu jesteśmy.
+
+    Gry z `NULL` w kolumnie sortowania (np. brak ceny) są zawsze na końcu
+    listy, niezależnie od kierunku. Stronicowane są osobno (`kolumna IS NULL`,
+    kolejność po `id`) – gdy wartości niepuste się skończą, strona jest
+    dopełniana w tym samym żądaniu, a kursor z wartością `null` wskazuje
+    pozycję wśród gier bez wartości. Oba zapytania to skany zakresu indeksu
+    `(kolumna, id)`, także przy sortowaniu malejącym.
+
+    Args:
+        query (Query): Przefiltrowane zapytanie o `Game`.
+        sort_key (str): Klucz z `SORT_COLUMNS`.
+        descending (bool): Kierunek sortowania.
+        limit (int): Rozmiar strony.
+        after (str|None): Kursor z poprzedniej strony.
+
+    Returns:
+        tuple[list[Game], str|None]: Gry na stronie oraz kursor następnej
+        strony (`None`, gdy to ostatnia strona).
+    """
+    column = SORT_COLUMNS[sort_key]
+    value, last_id = decode_cursor(after, sort_key) if after else (None, None)
+    in_nulls = after is not None and value is None and column.nullable
+
+    rows = []
+    if not in_nulls:
+        page = query.filter(column.is_not(None)) if column.nullable else query
+        if after:
+            page = page.filter(keyset_condition(column, descending, value, last_id))
+        rows = page.order_by(*order_clauses(column, descending)).limit(limit + 1).all()
+
+    if column.nullable and len(rows) <= limit:
+        nulls = query.filter(column.is_(None))
+        if in_nulls:
+            nulls = nulls.filter(keyset_condition(Game.id, descending, None, last_id))
+        rows += (
+            nulls.order_by(*order_clauses(Game.id, descending))
+            .limit(limit + 1 - len(rows))
+            .all()
+        )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, getattr(last, column.key), last.id)
+    return rows, next_cursor
+
+
+def parse_facets(val):
+    """
+    Parsuje parametr `facets` (np. `"genres,tags"`).
+
+    Returns:
+        list[str]: Nazwy faset w kolejności z `FACETS` (pusta lista, gdy brak parametru).
+
+    Raises:
+        CatalogQueryError: Gdy podano nieznaną fasetę.
+    """
+    if val in (None, ""):
+        return []
+    requested = {v.strip().lower() for v in val.split(",") if v.strip()}
+    unknown = requested - FACETS.keys()
+    if unknown:
+        allowed = ", ".join(FACETS)
+        raise CatalogQueryError(
+            f"Nieznane fasety: {', '.join(sorted(unknown))}. Dozwolone: {allowed}."
+        )
+    return [name for name in FACETS if name in requested]
+
+
+def filters_cache_key(filters):
+    """Hashowalny, niezależny od kolejności i wielkości liter klucz filtrów."""
+    return (
+        tuple(sorted({n.lower() for n in filters.get("genres") or []})),
+        tuple(sorted({n.lower() for n in filters.get("tags") or []})),
+        filters.get("min_price"),
+        filters.get("max_price"),
+        filters.get("has_discount"),
+    )
+
+
+def compute_facets(filters, names):
+    """
+    Liczy gry per gatunek/tag dla bieżącego filtra.
+
+    Wszystkie fasety są liczone jednym zapytaniem (`UNION ALL` zgrupowanych
+    zliczeń po `game_genre`/`game_tag`), bez ładowania encji `Game`.
+    Wynik jest cache'owany na `FACETS_CACHE_TTL` sekund.
+
+    Args:
+        filters (dict): Wynik `parse_catalog_filters`.
+        names (list[str]): Fasety do policzenia (z `parse_facets`).
+
+    Returns:
+        dict: Np. `{"genres": [{"name": "RPG", "count": 124}, ...], "tags": [...]}`,
+        listy posortowane malejąco po liczbie gier.
+    """
+    if not names:
+        return {}
+    key = (filters_cache_key(filters), tuple(names))
+    cached = facet_cache.get(key)
+    if cached is not None:
+        return cached
+
+    matching = apply_catalog_filters(select(Game.id), filters)
+    parts = []
+    for name in names:
+        table, fk, model = FACETS[name]
+        parts.append(
+            select(
+                literal(name).label("facet"),
+                model.name.label("name"),
+                func.count().label("count"),
+            )
+            .select_from(table.join(model, fk == model.id))
+            .where(table.c.game_id.in_(matching))
+            .group_by(model.name)
+        )
+    stmt = parts[0] if len(parts) == 1 else union_all(*parts)
+
+    result = {name: [] for name in names}
+    for facet, value, count in db.session.execute(stmt):
+        result[facet].append({"name": value, "count": count})
+    for values in result.values():
+        values.sort(key=lambda v: (-v["count"], v["name"]))
+
+    facet_cache.set(key, result)
+    return result
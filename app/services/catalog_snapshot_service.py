@@ -0,0 +1,196 @@
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+
+from app import db
+from app.models.game_model import Game
+from app.services.catalog_version_service import get_catalog_version, on_catalog_change
+from app.services.game_serializer import game_card_options, game_to_dict
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "catalog-"
+SNAPSHOT_SUFFIX = ".json.gz"
+POINTER_FILE = "current.json"
+BUILD_CHUNK_SIZE = 500
+
+
+class _HashingWriter:
+    """Zapisuje bajty do pliku, licząc jednocześnie ich SHA-256."""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self.fileobj.write(data)
+
+    def flush(self):
+        self.fileobj.flush()
+
+
+class CatalogSnapshot:
+    """
+    Prekompilowany, skompresowany (gzip) snapshot całego katalogu gier.
+
+    Snapshot to plik `catalog-<hash>.json.gz` budowany w tle po zmianach
+    katalogu (z opóźnieniem `CATALOG_SNAPSHOT_DEBOUNCE` sekund, więc seria
+    zapisów powoduje jedną przebudowę). Serwowanie sprowadza się do
+    odczytu pliku – koszt nie zależy od wielkości katalogu.
+
+    Konfiguracja:
+        - `CATALOG_SNAPSHOT_DIR`: katalog na pliki (domyślnie `instance/catalog`),
+        - `CATALOG_SNAPSHOT_DEBOUNCE`: opóźnienie przebudowy w sekundach (domyślnie 2).
+
+    Note:
+        - Plik wskaźnika `current.json` jest podmieniany atomowo (`os.replace`),
+          więc czytelnicy zawsze widzą kompletny snapshot.
+        - Przy wielu workerach każdy może przebudować snapshot; zawartość jest
+          deterministyczna, więc wynikowy plik (i ETag) jest ten sam.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.directory = None
+        self.debounce = 2.0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.directory = app.config.get("CATALOG_SNAPSHOT_DIR") or os.path.join(
+            app.instance_path, "catalog"
+        )
+        self.debounce = float(app.config.get("CATALOG_SNAPSHOT_DEBOUNCE", 2))
+        on_catalog_change(self.schedule_rebuild)
+
+    def path_for(self, etag):
+        """Ścieżka pliku snapshotu o danym ETagu."""
+        return os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{etag}{SNAPSHOT_SUFFIX}")
+
+    def current(self):
+        """
+        Zwraca opis bieżącego snapshotu.
+
+        Returns:
+            dict|None: `{"etag", "version", "built_at"}` lub `None`, gdy
+            snapshot nie został jeszcze zbudowany.
+        """
+        try:
+            with open(os.path.join(self.directory, POINTER_FILE)) as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.isfile(self.path_for(info["etag"])):
+            return None
+        return info
+
+    def ensure_current(self):
+        """
+        Zwraca bieżący snapshot; buduje go synchronicznie, jeśli nie istnieje.
+
+        Nieaktualny snapshot (starsza wersja katalogu) jest zwracany od razu,
+        a przebudowa zlecana w tle.
+        """
+        info = self.current()
+        if info is None:
+            return self.build()
+        version, _ = get_catalog_version()
+        if info["version"] < version:
+            self.schedule_rebuild()
+        return info
+
+    def schedule_rebuild(self):
+        """Zleca przebudowę po `debounce` sekundach (kolejne wywołania przesuwają termin)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._rebuild_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _rebuild_in_background(self):
+        with self._lock:
+            self._timer = None
+        with self.app.app_context():
+            try:
+                self.build()
+            except Exception:
+                logger.exception("Nie udało się przebudować snapshotu katalogu")
+            finally:
+                db.session.remove()
+
+    def build(self):
+        """
+        Buduje snapshot katalogu i ustawia go jako bieżący.
+
+        Gry są czytane paczkami po `BUILD_CHUNK_SIZE` (z dociąganiem
+        gatunków i tagów per paczka) i od razu kompresowane do pliku, więc
+        pamięć nie rośnie z rozmiarem katalogu.
+
+        Returns:
+            dict: Opis nowego snapshotu (jak w `current`).
+        """
+        with self._build_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            version, _ = get_catalog_version()
+            tmp_path = os.path.join(
+                self.directory, f".build-{os.getpid()}-{threading.get_ident()}"
+            )
+            games = (
+                Game.query.options(*game_card_options())
+                .order_by(Game.id)
+                .yield_per(BUILD_CHUNK_SIZE)
+            )
+            with open(tmp_path, "wb") as raw:
+                writer = _HashingWriter(raw)
+                # mtime=0 → identyczna treść daje identyczny plik (i ETag)
+                with gzip.GzipFile(fileobj=writer, mode="wb", mtime=0) as gz:
+                    gz.write(b'{"version":%d,"items":[' % version)
+                    for i, game in enumerate(games):
+                        if i:
+                            gz.write(b",")
+                        gz.write(
+                            json.dumps(
+                                game_to_dict(game),
+                                ensure_ascii=False,
+                                separators=(",", ":"),
+                            ).encode()
+                        )
+                    gz.write(b"]}")
+            etag = writer.sha256.hexdigest()[:32]
+            os.replace(tmp_path, self.path_for(etag))
+
+            info = {
+                "etag": etag,
+                "version": version,
+                "built_at": datetime.now(timezone.utc).isoformat(),
+            }
+            pointer_tmp = tmp_path + ".json"
+            with open(pointer_tmp, "w") as f:
+                json.dump(info, f)
+            previous = self.current()
+            os.replace(pointer_tmp, os.path.join(self.directory, POINTER_FILE))
+            self._cleanup(keep={etag, previous and previous["etag"]})
+            return info
+
+    def _cleanup(self, keep):
+        """Usuwa stare snapshoty (zostawia bieżący i poprzedni dla trwających pobrań)."""
+        pattern = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}")
+        for path in glob.glob(pattern):
+            etag = os.path.basename(path)[len(SNAPSHOT_PREFIX) : -len(SNAPSHOT_SUFFIX)]
+            if etag not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+catalog_snapshot = CatalogSnapshot()
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event, insert, select, update
+
+from app import db
+from app.models.catalog_state_model import CatalogState
+
+CATALOG_STATE_ID = 1
+
+_state = CatalogState.__table__
+
+#: Funkcje wywoływane po zatwierdzeniu transakcji, która zmieniła katalog.
+_change_listeners = []
+
+
+def get_catalog_version():
+    """
+    Odczytuje bieżącą wersję katalogu jednym lekkim zapytaniem (bez encji ORM).
+
+    Returns:
+        tuple[int, datetime|None]: (wersja, moment ostatniej zmiany w UTC).
+        `(0, None)`, gdy katalog nie był jeszcze zmieniany.
+    """
+    row = db.session.execute(
+        select(_state.c.version, _state.c.updated_at).where(
+            _state.c.id == CATALOG_STATE_ID
+        )
+    ).first()
+    if row is None:
+        return 0, None
+    version, updated_at = row
+    if updated_at is not None and updated_at.tzinfo is None:
+        # SQLite nie przechowuje strefy czasowej
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return version, updated_at
+
+
+def get_features_version():
+    """
+    Odczytuje licznik zmian cech gier (gry, gatunki, tagi – bez recenzji).
+
+    Returns:
+        int: Wersja cech; 0, gdy nie były jeszcze zmieniane.
+    """
+    version = db.session.scalar(
+        select(_state.c.features_version).where(_state.c.id == CATALOG_STATE_ID)
+    )
+    return version or 0
+
+
+def bump_catalog_version(features=False):
+    """
+    Zwiększa wersję katalogu w bieżącej transakcji.
+
+    Należy wywołać przed `db.session.commit()` w każdej ścieżce zapisu,
+    która zmienia odpowiedzi katalogowe. Inkrementacja jest atomowa
+    (`UPDATE ... SET version = version + 1`).
+
+    Args:
+        features (bool): Czy zapis zmienia gry, ich gatunki lub tagi –
+            wtedy podbijana jest też `features_version`. Recenzje zmieniają
+            tylko agregaty ocen i przekazują `False`.
+    """
+    now = datetime.now(timezone.utc)
+    values = {"version": _state.c.version + 1, "updated_at": now}
+    if features:
+        values["features_version"] = _state.c.features_version + 1
+    result = db.session.execute(
+        update(_state).where(_state.c.id == CATALOG_STATE_ID).values(**values)
+    )
+    if result.rowcount == 0:
+        db.session.execute(
+            insert(_state).values(
+                id=CATALOG_STATE_ID,
+                version=1,
+                features_version=int(features),
+                updated_at=now,
+            )
+        )
+    db.session.info["catalog_changed"] = True
+
+
+def on_catalog_change(callback):
+    """
+    Rejestruje funkcję wywoływaną po `commit()` transakcji, która podbiła
+    wersję katalogu (np. przebudowa snapshotu).
+
+    Funkcja nie przyjmuje argumentów i nie może wykonywać zapytań do bazy
+    (działa w zdarzeniu `after_commit` sesji) – powinna jedynie zlecić pracę.
+
+    Returns:
+        Callable: `callback` (można używać jako dekoratora).
+    """
+    _change_listeners.append(callback)
+    return callback
+
+
+@event.listens_for(db.session, "after_commit")
+def _notify_catalog_change(session):
+    if session.info.pop("catalog_changed", False):
+        for callback in _change_listeners:
+            callback()
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_catalog_change(session):
+    session.info.pop("catalog_changed", None)
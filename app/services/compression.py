@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import zlib
+
+from flask import request
+
+from app.services.ttl_cache import TTLCache
+
+try:  # brotli jest opcjonalny – bez niego dostępne są gzip i deflate
+    import brotli
+except ImportError:  # pragma: no cover - zależy od środowiska
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "application/javascript",
+)
+
+#: Jakość brotli – wyższe poziomy są zbyt wolne do kompresji w locie.
+BROTLI_QUALITY = 5
+
+
+def _compress(body, encoding, level):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        # mtime=0 → ta sama treść daje ten sam wynik
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return zlib.compress(body, level)
+
+
+class Compression:
+    """
+    Kompresja odpowiedzi negocjowana nagłówkiem `Accept-Encoding`.
+
+    Kolejność preferencji: `br` (gdy zainstalowany `brotli`), `gzip`,
+    `deflate`; wagi `q` klienta mają pierwszeństwo. Skompresowane treści
+    odpowiedzi cache'owalnych są trzymane w LRU (klucz: kodowanie + hash
+    treści), więc ten sam payload nie jest kompresowany przy każdym żądaniu.
+
+    Konfiguracja:
+        - `COMPRESSION_ENABLED`: włącza middleware (domyślnie `True`),
+        - `COMPRESSION_MIN_SIZE`: minimalny rozmiar treści w bajtach (domyślnie 500),
+        - `COMPRESSION_MIMETYPES`: typy treści do kompresji,
+        - `COMPRESSION_LEVEL`: poziom gzip/deflate 1..9 (domyślnie 6),
+        - `COMPRESSION_CACHE_MAX_ENTRIES`: rozmiar cache skompresowanych treści
+          (domyślnie 256, 0 wyłącza cache).
+
+    Note:
+        - Pomijane są odpowiedzi strumieniowane i plikowe (`send_file`), inne
+          niż 200 (np. 206, 304) oraz już zakodowane (np. snapshot katalogu).
+        - ETag skompresowanej odpowiedzi staje się słaby (`W/"..."`), bo
+          bajty różnią się od wersji nieskompresowanej; `If-None-Match` używa
+          porównania słabego, więc rewalidacja (304) działa dalej.
+    """
+
+    def __init__(self):
+        self.min_size = 500
+        self.mimetypes = frozenset(DEFAULT_MIMETYPES)
+        self.level = 6
+        self.cache = None
+
+    @property
+    def encodings(self):
+        return ("br", "gzip", "deflate") if brotli else ("gzip", "deflate")
+
+    def init_app(self, app):
+        if not app.config.get("COMPRESSION_ENABLED", True):
+            return
+        self.min_size = int(app.config.get("COMPRESSION_MIN_SIZE", self.min_size))
+        self.mimetypes = frozenset(
+            app.config.get("COMPRESSION_MIMETYPES") or DEFAULT_MIMETYPES
+        )
+        self.level = int(app.config.get("COMPRESSION_LEVEL", self.level))
+        max_entries = int(app.config.get("COMPRESSION_CACHE_MAX_ENTRIES", 256))
+        self.cache = TTLCache(maxsize=max_entries, ttl=3600) if max_entries else None
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        """Kompresuje odpowiedź, jeśli klient i typ treści na to pozwalają."""
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return response
+
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(self.encodings)
+        if encoding is None:
+            return response
+
+        compressed = self._compressed(body, encoding, self._cacheable(response))
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compressed(self, body, encoding, cacheable):
+        if not cacheable or self.cache is None:
+            return _compress(body, encoding, self.level)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = _compress(body, encoding, self.level)
+            self.cache.set(key, compressed)
+        return compressed
+
+    @staticmethod
+    def _cacheable(response):
+        """Odpowiedzi z ETagiem lub publicznym `Cache-Control` (bez `no-store`/`private`)."""
+        cc = response.cache_control
+        if cc.no_store or cc.private:
+            return False
+        return bool(
+            response.headers.get("ETag") or response.headers.get("X-Cache") or cc.public
+        )
+
+    def stats(self):
+        """Statystyki cache skompresowanych treści (lub `None`, gdy wyłączony)."""
+        return self.cache.stats() if self.cache is not None else None
+
+
+compression = Compression()
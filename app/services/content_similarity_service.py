@@ -0,0 +1,292 @@
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import select
+
+from app import db
+from app.models.game_genre_model import game_genre
+from app.models.game_model import Game
+from app.models.game_tag_model import game_tag
+from app.services.catalog_version_service import get_features_version
+
+#: Bitów w jednym słowie wektora cech.
+WORD_BITS = 64
+
+#: Liczba jedynek w każdym bajcie (gdy numpy nie ma `bitwise_count`, < 2.0).
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(words):
+    """
+    Liczy ustawione bity w każdym wierszu macierzy słów `uint64`.
+
+    Returns:
+        np.ndarray: Liczby bitów (`int64`), po jednej na wiersz.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(len(words), -1)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def jaccard_scores(bits, counts, query):
+    """
+    Podobieństwo Jaccarda wektora `query` do każdego wiersza `bits`.
+
+    |A ∩ B| to popcount iloczynu bitowego, |A ∪ B| = |A| + |B| - |A ∩ B|.
+
+    Args:
+        bits (np.ndarray): Macierz `(gry, słowa)` typu `uint64`.
+        counts (np.ndarray): Liczby cech każdej gry (popcount wierszy `bits`).
+        query (np.ndarray): Wektor słów gry wzorcowej.
+
+    Returns:
+        np.ndarray: Wyniki `float32` z przedziału [0, 1] (0 dla pustych sum).
+    """
+    common = popcount_rows(bits & query)
+    union = counts + int(popcount_rows(query[None, :])[0]) - common
+    return np.divide(
+        common,
+        union,
+        out=np.zeros(len(bits), dtype=np.float32),
+        where=union > 0,
+        dtype=np.float32,
+    )
+
+
+def rank_scores(ids, scores, limit, exclude=None):
+    """
+    Wybiera `limit` najlepszych wyników > 0 (remisy – rosnąco po ID).
+
+    Returns:
+        list[tuple[int, float]]: (ID, wynik) od najlepszego.
+    """
+    if exclude is not None:
+        scores[exclude] = 0.0
+    positive = np.flatnonzero(scores > 0)
+    if len(positive) > limit:
+        # kandydaci: wszystko co najmniej tak dobre jak `limit`-ty wynik
+        threshold = np.partition(scores[positive], -limit)[-limit]
+        positive = positive[scores[positive] >= threshold]
+    order = positive[np.lexsort((ids[positive], -scores[positive]))][:limit]
+    return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+def load_game_features():
+    """
+    Czyta gry i ich cechy (gatunki, tagi) jako tablice – bez obiektów ORM.
+
+    Returns:
+        tuple[np.ndarray, list[tuple[int, str, int]]]: Posortowane ID gier oraz
+        wiersze `(game_id, "genre"|"tag", id_cechy)`.
+    """
+    game_ids = np.fromiter(
+        db.session.scalars(select(Game.id).order_by(Game.id)), dtype=np.int64
+    )
+    rows = [
+        (game_id, "genre", genre_id)
+        for game_id, genre_id in db.session.execute(
+            select(game_genre.c.game_id, game_genre.c.genre_id)
+        )
+    ]
+    rows += [
+        (game_id, "tag", tag_id)
+        for game_id, tag_id in db.session.execute(
+            select(game_tag.c.game_id, game_tag.c.tag_id)
+        )
+    ]
+    return game_ids, rows
+
+
+class ContentSimilarity:
+    """
+    Podobieństwo gier na podstawie gatunków i tagów („więcej takich”) –
+    uzupełnienie `SimilarGames` dla gier bez recenzji i wishlist.
+
+    Każda gra ma wektor bitów (jeden bit na gatunek lub tag) trzymany
+    w macierzy `uint64` w pamięci workera. Zapytanie liczy Jaccarda do całego
+    katalogu naraz: iloczyn bitowy i popcount na tablicach numpy.
+
+    Indeks jest budowany przy pierwszym zapytaniu, a `create_game` dopisuje
+    nową grę bez przebudowy (`add_game`). Inne zmiany cech (import, gatunki,
+    tagi) są wykrywane po `features_version` katalogu, sprawdzanej najwyżej
+    raz na `RECOMMENDATIONS_RELOAD_INTERVAL` sekund – wtedy indeks jest
+    budowany od nowa. Recenzje nie zmieniają tej wersji, więc nie wymuszają
+    przebudowy.
+
+    Konfiguracja:
+        - `RECOMMENDATIONS_CONTENT_MAX_FEATURES`: maksymalna liczba cech
+          (bitów) w wektorze, domyślnie 1024. Przy nadmiarze zostają cechy
+          najczęstsze. Pamięć to ok. `8 * ceil(cechy / 64) + 10` bajtów na grę
+          (np. 136 B dla 1024 cech – 13 MB na 100 tys. gier).
+        - `RECOMMENDATIONS_RELOAD_INTERVAL`: odstęp sprawdzania wersji
+          katalogu w sekundach (domyślnie 30).
+    """
+
+    def __init__(self):
+        self.max_features = 1024
+        self.check_interval = 30.0
+        self._reset()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_features = int(
+            app.config.get("RECOMMENDATIONS_CONTENT_MAX_FEATURES", self.max_features)
+        )
+        self.check_interval = float(
+            app.config.get("RECOMMENDATIONS_RELOAD_INTERVAL", self.check_interval)
+        )
+        self._reset()
+
+    def _reset(self):
+        self._version = None
+        self._next_check = 0.0
+        self._features = {}  # (rodzaj, id) -> numer bitu
+        self._ids = None  # bufory o pojemności >= `_size`
+        self._bits = None
+        self._counts = None
+        self._size = 0
+
+    @property
+    def nbytes(self):
+        """Pamięć zajmowana przez tablice indeksu (w bajtach)."""
+        if self._ids is None:
+            return 0
+        return self._ids.nbytes + self._bits.nbytes + self._counts.nbytes
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self._ids is not None and now < self._next_check:
+            return
+        version = get_features_version()
+        with self._lock:
+            self._next_check = now + self.check_interval
+            if self._ids is None or version != self._version:
+                self._build(version)
+
+    def _build(self, version):
+        game_ids, rows = load_game_features()
+        frequency = {}
+        for _, kind, feature_id in rows:
+            key = (kind, feature_id)
+            frequency[key] = frequency.get(key, 0) + 1
+        kept = sorted(frequency, key=lambda key: (-frequency[key], key))
+        features = {key: bit for bit, key in enumerate(kept[: self.max_features])}
+
+        words = max(1, -(-len(features) // WORD_BITS))
+        bits = np.zeros((len(game_ids), words), dtype=np.uint64)
+        if rows:
+            positions = [
+                (game_id, features[(kind, feature_id)])
+                for game_id, kind, feature_id in rows
+                if (kind, feature_id) in features
+            ]
+            pairs = np.array(positions, dtype=np.int64).reshape(-1, 2)
+            row = np.searchsorted(game_ids, pairs[:, 0])
+            word, offset = np.divmod(pairs[:, 1], WORD_BITS)
+            np.bitwise_or.at(
+                bits, (row, word), np.left_shift(np.uint64(1), offset.astype(np.uint64))
+            )
+        self._features = features
+        self._ids = game_ids
+        self._bits = bits
+        self._counts = popcount_rows(bits).astype(np.uint16)
+        self._size = len(game_ids)
+        self._version = version
+
+    def _vector(self, genre_ids, tag_ids):
+        """Wektor słów dla listy cech; nowe cechy dostają wolne bity (do limitu)."""
+        keys = [("genre", i) for i in genre_ids] + [("tag", i) for i in tag_ids]
+        for key in keys:
+            if key not in self._features and len(self._features) < self.max_features:
+                self._features[key] = len(self._features)
+        words = max(1, -(-len(self._features) // WORD_BITS))
+        if words > self._bits.shape[1]:
+            extra = np.zeros((len(self._bits), words - self._bits.shape[1]), np.uint64)
+            self._bits = np.hstack([self._bits, extra])
+        vector = np.zeros(self._bits.shape[1], dtype=np.uint64)
+        for key in keys:
+            bit = self._features.get(key)
+            if bit is not None:
+                vector[bit // WORD_BITS] |= np.uint64(1) << np.uint64(bit % WORD_BITS)
+        return vector
+
+    def add_game(self, game_id, genre_ids, tag_ids):
+        """
+        Dopisuje (lub nadpisuje) grę w indeksie bez jego przebudowy.
+
+        Należy wywołać po `db.session.commit()` zapisu, który podbił wersję
+        cech (`bump_catalog_version(features=True)`) dokładnie raz. Jeśli
+        w międzyczasie cechy zmieniły się także gdzie indziej, indeks
+        zostanie przebudowany przy najbliższym sprawdzeniu wersji.
+
+        Args:
+            game_id (int): ID gry.
+            genre_ids, tag_ids (list[int]): ID przypisanych gatunków i tagów.
+        """
+        if self._ids is None:
+            return  # indeks zbuduje się przy pierwszym zapytaniu
+        version = get_features_version()
+        with self._lock:
+            if self._ids is None:
+                return
+            vector = self._vector(genre_ids, tag_ids)
+            count = int(popcount_rows(vector[None, :])[0])
+            ids = self._ids[: self._size]
+            pos = int(np.searchsorted(ids, game_id))
+            if pos < self._size and ids[pos] == game_id:
+                self._bits[pos] = vector
+                self._counts[pos] = count
+            elif pos == self._size and self._size < len(self._ids):
+                # typowy przypadek: nowe ID na końcu, miejsce w buforze
+                self._ids[pos], self._bits[pos], self._counts[pos] = (
+                    game_id,
+                    vector,
+                    count,
+                )
+                self._size += 1
+            else:
+                # nowe bufory (z zapasem), czytelnicy zachowują stare tablice
+                capacity = max(16, 2 * self._size) if pos == self._size else None
+                self._insert(pos, game_id, vector, count, capacity)
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+
+    def _insert(self, pos, game_id, vector, count, capacity=None):
+        size = self._size
+        capacity = capacity or len(self._ids) + 1
+        ids = np.zeros(capacity, dtype=self._ids.dtype)
+        bits = np.zeros((capacity, self._bits.shape[1]), dtype=np.uint64)
+        counts = np.zeros(capacity, dtype=self._counts.dtype)
+        for new, old, value in (
+            (ids, self._ids, game_id),
+            (bits, self._bits, vector),
+            (counts, self._counts, count),
+        ):
+            new[:pos] = old[:pos]
+            new[pos] = value
+            new[pos + 1 : size + 1] = old[pos:size]
+        self._ids, self._bits, self._counts = ids, bits, counts
+        self._size = size + 1
+
+    def similar(self, game_id, limit):
+        """
+        Zwraca gry o najbardziej podobnym zestawie gatunków i tagów.
+
+        Returns:
+            list[tuple[int, float]]: (ID gry, podobieństwo Jaccarda); pusta
+            lista, gdy gra nie ma cech lub nie ma jej w indeksie.
+        """
+        self._ensure_current()
+        with self._lock:
+            size = self._size
+            ids, bits, counts = self._ids[:size], self._bits[:size], self._counts[:size]
+        pos = int(np.searchsorted(ids, game_id))
+        if pos >= size or ids[pos] != game_id or counts[pos] == 0:
+            return []
+        scores = jaccard_scores(bits, counts.astype(np.int64), bits[pos])
+        return rank_scores(ids, scores, limit, exclude=pos)
+
+
+content_similarity = ContentSimilarity()
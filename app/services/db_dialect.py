@@ -0,0 +1,56 @@
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from app import db
+
+#: Dialekty z natywnym `INSERT ... ON CONFLICT ... RETURNING`.
+UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_name():
+    """Nazwa dialektu bazy aplikacji (np. `"postgresql"`, `"sqlite"`)."""
+    return db.engine.dialect.name
+
+
+def upsert_insert(model):
+    """
+    Zwraca `INSERT` dialektu bazy z obsługą `on_conflict_do_update/nothing`.
+
+    Args:
+        model: Model SQLAlchemy (lub tabela), do którego wstawiamy.
+
+    Raises:
+        NotImplementedError: Gdy baza nie obsługuje `ON CONFLICT`.
+    """
+    try:
+        insert = UPSERT_DIALECTS[dialect_name()]
+    except KeyError:
+        raise NotImplementedError(
+            f"Baza {dialect_name()!r} nie obsługuje INSERT ... ON CONFLICT."
+        )
+    return insert(model)
+
+
+def enable_sqlite_foreign_keys():
+    """
+    Włącza sprawdzanie kluczy obcych (`PRAGMA foreign_keys=ON`) w SQLite.
+
+    SQLite domyślnie ignoruje klucze obce – bez tego wstawienie recenzji
+    nieistniejącej gry nie zgłosiłoby `IntegrityError`. Pragma jest
+    ustawiana na każdym nowym połączeniu.
+    """
+    if not event.contains(Engine, "connect", _sqlite_foreign_keys):
+        event.listen(Engine, "connect", _sqlite_foreign_keys)
+
+
+def _sqlite_foreign_keys(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
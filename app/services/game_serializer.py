@@ -0,0 +1,166 @@
+from operator import attrgetter
+
+from sqlalchemy.orm import load_only, selectinload
+
+from app.models.game_model import Game
+from app.services.catalog_service import CatalogQueryError
+from app.services.image_service import image_url
+from app.services.rating_service import RATING_BUCKETS, rating_summary
+
+#: Pole odpowiedzi → funkcja wyliczająca jego wartość (kolejność = kolejność w JSON).
+_FIELD_GETTERS = {
+    "id": attrgetter("id"),
+    "title": attrgetter("title"),
+    "description": attrgetter("description"),
+    "price": attrgetter("price"),
+    "image_path": attrgetter("image_path"),
+    "image_url": lambda game: (
+        image_url(game.id, game.image_hash) if game.image_path else None
+    ),
+    "genres": lambda game: [genre.name for genre in game.genres],
+    "tags": lambda game: [tag.name for tag in game.tags],
+    "discount": attrgetter("discount"),
+    "rating": rating_summary,
+}
+
+GAME_FIELDS = tuple(_FIELD_GETTERS)
+
+#: Pola będące relacjami (dociągane osobnym zapytaniem `selectin`).
+GAME_RELATIONS = {"genres": Game.genres, "tags": Game.tags}
+
+#: Pole odpowiedzi → kolumny `Game` potrzebne do jego wyliczenia.
+GAME_FIELD_COLUMNS = {
+    "id": (Game.id,),
+    "title": (Game.title,),
+    "description": (Game.description,),
+    "price": (Game.price,),
+    "image_path": (Game.image_path,),
+    "image_url": (Game.image_path, Game.image_hash),
+    "discount": (Game.discount,),
+    "rating": (Game.rating_count, Game.rating_sum, *RATING_BUCKETS.values()),
+}
+
+
+def _split_names(val, param):
+    names = {v.strip().lower() for v in val.split(",") if v.strip()}
+    unknown = names - set(GAME_FIELDS)
+    if unknown:
+        raise CatalogQueryError(
+            f"Nieznane pola w '{param}': {', '.join(sorted(unknown))}. "
+            f"Dozwolone: {', '.join(GAME_FIELDS)}."
+        )
+    return names
+
+
+def parse_fields(args):
+    """
+    Parsuje wybór pól odpowiedzi (`fields`, `include`) z query stringa.
+
+    - `fields=id,title,price` – tylko wymienione pola (`id` zawsze jest dołączane),
+    - `include=genres,tags` – relacje do dołączenia; samo `include` oznacza
+      wszystkie pola skalarne i tylko wymienione relacje (`include=` – żadnej).
+
+    Returns:
+        frozenset|None: Wybrane pola lub `None`, gdy żądana jest pełna reprezentacja.
+
+    Raises:
+        CatalogQueryError: Gdy podano nieznane pole.
+    """
+    fields = args.get("fields")
+    include = args.get("include")
+    if fields is None and include is None:
+        return None
+    if fields is None:
+        selected = set(GAME_FIELDS) - GAME_RELATIONS.keys()
+    else:
+        selected = _split_names(fields, "fields") | {"id"}
+    if include is not None:
+        selected |= _split_names(include, "include")
+    return frozenset(selected)
+
+
+def game_card_options(fields=None, extra_columns=()):
+    """
+    Opcje ładowania potrzebne do serializacji gry.
+
+    `genres` i `tags` są dociągane strategią `selectin` – jednym zapytaniem
+    `... WHERE game_id IN (...)` na całą stronę wyników, zamiast osobnego
+    zapytania dla każdej gry (problem N+1).
+
+    Args:
+        fields (frozenset|None): Wynik `parse_fields`. Przy wyborze pól
+            ładowane są tylko potrzebne kolumny (`load_only`, więc m.in.
+            `description` nie jest czytany), a niewybrane relacje są pomijane.
+        extra_columns (Iterable): Dodatkowe kolumny do załadowania (np.
+            kolumna sortowania potrzebna do kursora).
+
+    Returns:
+        list: Opcje do przekazania w `query.options(*game_card_options())`.
+
+    Example:
+        ```python
+        games = Game.query.options(*game_card_options()).limit(24).all()
+        data = [game_to_dict(g) for g in games]   # 3 zapytania niezależnie od N
+        ```
+    """
+    if fields is None:
+        return [selectinload(Game.genres), selectinload(Game.tags)]
+    columns = {column for name in fields for column in GAME_FIELD_COLUMNS.get(name, ())}
+    options = [load_only(Game.id, *columns, *extra_columns)]
+    options += [
+        selectinload(relation)
+        for name, relation in GAME_RELATIONS.items()
+        if name in fields
+    ]
+    return options
+
+
+def game_to_dict(game, fields=None):
+    """
+    Konwertuje obiekt `Game` do słownika JSON-owalnego.
+
+    Args:
+        game (Game): Instancja gry (najlepiej załadowana z `game_card_options()`).
+        fields (frozenset|None): Wynik `parse_fields`; `None` – wszystkie pola.
+
+    Returns:
+        dict: Słownik zawierający kluczowe informacje o grze:
+            - id (int)
+            - title (str)
+            - description (str|None)
+            - price (float|None)
+            - image_path (str|None)
+            - image_url (str|None) – wersjonowany URL okładki (`?v=<hash>`),
+              bezpieczny do cache'owania jako `immutable`
+            - genres (list[str])
+            - tags (list[str])
+            - discount (float|None)
+            - rating (dict) – podsumowanie ocen, patrz `rating_summary`
+        Przy wyborze pól – tylko wybrane klucze.
+    """
+    return {
+        name: getter(game)
+        for name, getter in _FIELD_GETTERS.items()
+        if fields is None or name in fields
+    }
+
+
+def wishlist_item_to_dict(item, game, fields=None):
+    """
+    Serializuje wpis wishlisty razem z danymi gry.
+
+    Args:
+        item (WishList): Wpis na liście życzeń.
+        game (Game): Gra powiązana z wpisem.
+        fields (frozenset|None): Wynik `parse_fields`; `None` – wszystkie pola.
+
+    Returns:
+        dict: Dane gry (jak w `game_to_dict`, z `game_id` zamiast `id`)
+        uzupełnione o `wishlist_item_id`. `discount` jest zwracany jako `0`,
+        jeśli brak wartości w bazie.
+    """
+    data = game_to_dict(game, fields)
+    data["game_id"] = data.pop("id")
+    if "discount" in data:
+        data["discount"] = data["discount"] or 0
+    return {"wishlist_item_id": item.id, **data}
@@ -4,6 +4,7 @@ from werkzeug.exceptions import (
     NotFound,
     MethodNotAllowed,
     InternalServerError,
+    RequestEntityTooLarge,
     Unauthorized,
 )
 
@@ -67,6 +68,20 @@ def handle_405(error):
     return jsonify(error="Method Not Allowed", message=str(error)), 405
 
 
+@error_bp.app_errorhandler(RequestEntityTooLarge)
+def handle_413(error):
+    """
+    Obsługuje błąd 413 Payload Too Large (przekroczony limit rozmiaru żądania).
+
+    Response (413 Payload Too Large):
+        {
+            "error": "Payload Too Large",
+            "message": "Opis błędu"
+        }
+    """
+    return jsonify(error="Payload Too Large", message=str(error)), 413
+
+
 @error_bp.app_errorhandler(InternalServerError)
 def handle_500(error):
     """
@@ -0,0 +1,497 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+import threading
+import time
+
+from flask import Response, current_app, request, send_file
+from sqlalchemy import select, update
+
+from app import db
+from app.models.game_model import Game
+from app.services.ttl_cache import TTLCache
+
+try:  # Pillow jest opcjonalny – bez niego serwowany jest oryginał
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - zależy od środowiska
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+#: Katalog backendu (względem niego zapisane są `Game.image_path`).
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+#: Katalog przesłanych okładek (względem `BACKEND_ROOT`).
+UPLOAD_SUBDIR = "static/images/games"
+UPLOAD_DIR = os.path.join(BACKEND_ROOT, *UPLOAD_SUBDIR.split("/"))
+
+#: Dozwolone rozmiary wariantów; żądany rozmiar jest zaokrąglany w górę do
+#: najbliższego progu, więc liczba wariantów na obrazek jest ograniczona.
+VARIANT_SIZES = (64, 128, 160, 240, 320, 480, 640, 800, 1024, 1280, 1600, 2048)
+
+#: format z query stringa → (format Pillow, rozszerzenie, mimetype)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "jpg": ("JPEG", "jpg", "image/jpeg"),
+    "png": ("PNG", "png", "image/png"),
+}
+SOURCE_FORMATS = {"jpg": "jpeg", "jpeg": "jpeg", "png": "png", "gif": "png"}
+VARIANT_QUALITY = 80
+
+_HASH_CHUNK = 64 * 1024
+
+#: Długość wersji obrazka w URL-u (prefiks SHA-256).
+IMAGE_VERSION_LENGTH = 16
+
+#: Pliki, które może usunąć `ImageSweeper`: okładki zapisane przez
+#: `store_upload` (`<sha256>.<ext>`) i jego pliki tymczasowe. Pozostałe pliki
+#: w katalogu (np. przykładowe okładki z repozytorium) nie są ruszane.
+SWEEPABLE_NAME = re.compile(r"^(?:[0-9a-f]{64}\.[a-z0-9]+|tmp\w+\.tmp)$")
+
+#: Nagłówek dla URL-i z aktualną wersją – treść pod takim URL-em się nie zmienia.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+#: Nagłówek dla URL-i bez wersji – klient musi rewalidować (tanie 304).
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+#: (ścieżka, mtime, rozmiar) → SHA-256 treści pliku
+_digest_cache = TTLCache(maxsize=4096, ttl=3600)
+
+#: id gry → (image_path, image_hash); ścieżka obrazka nie zmienia się po utworzeniu gry
+_image_meta_cache = TTLCache(maxsize=4096, ttl=60)
+
+
+class ImageParamsError(ValueError):
+    """Niepoprawne parametry wariantu obrazka (mapowane na 400)."""
+
+
+class ImageTooLargeError(ValueError):
+    """Przesłany obrazek przekracza `IMAGE_MAX_UPLOAD_BYTES` (mapowane na 413)."""
+
+
+def resolve_image_path(image_path):
+    """
+    Zamienia `Game.image_path` na ścieżkę bezwzględną na dysku.
+
+    Returns:
+        str|None: Ścieżka do istniejącego pliku lub `None`, gdy plik nie
+        istnieje albo ścieżka wychodzi poza katalog backendu.
+    """
+    if not image_path:
+        return None
+    full_path = os.path.normpath(os.path.join(BACKEND_ROOT, image_path))
+    if not full_path.startswith(BACKEND_ROOT + os.sep):
+        return None
+    return full_path if os.path.isfile(full_path) else None
+
+
+def file_digest(path):
+    """
+    Zwraca SHA-256 (hex) treści pliku.
+
+    Wynik jest cache'owany per (ścieżka, mtime, rozmiar), więc plik jest
+    czytany tylko przy pierwszym użyciu lub po zmianie.
+    """
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    digest = _digest_cache.get(key)
+    if digest is None:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        _digest_cache.set(key, digest)
+    return digest
+
+
+def store_upload(stream, ext):
+    """
+    Zapisuje przesłany obrazek pod nazwą wyliczoną z hasha treści.
+
+    Plik jest kopiowany kawałkami do pliku tymczasowego (hash liczony
+    w trakcie zapisu), a potem przenoszony na `<sha256>.<ext>`. Identyczne
+    okładki trafiają więc do jednego pliku, a przesłanie pliku o tej samej
+    nazwie nie nadpisuje cudzego obrazka.
+
+    Args:
+        stream: Strumień z treścią pliku (np. `FileStorage.stream`).
+        ext (str): Rozszerzenie pliku (małe litery, bez kropki).
+
+    Returns:
+        tuple[str, str]: (`image_path` względem katalogu backendu, SHA-256).
+
+    Raises:
+        ImageTooLargeError: Gdy plik przekracza `IMAGE_MAX_UPLOAD_BYTES`.
+    """
+    max_bytes = current_app.config.get("IMAGE_MAX_UPLOAD_BYTES", 5 * 1024 * 1024)
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".tmp")
+    try:
+        sha256 = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while chunk := stream.read(_HASH_CHUNK):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageTooLargeError(
+                        f"Obrazek jest za duży (maks. {max_bytes} bajtów)."
+                    )
+                sha256.update(chunk)
+                out.write(chunk)
+        digest = sha256.hexdigest()
+        filename = f"{digest}.{ext}"
+        path = os.path.join(UPLOAD_DIR, filename)
+        if os.path.isfile(path):
+            # duplikat – odświeżenie mtime chroni plik przed sweeperem
+            os.utime(path)
+        else:
+            os.replace(tmp_path, path)
+            tmp_path = None
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return f"{UPLOAD_SUBDIR}/{filename}", digest
+
+
+def image_url(game_id, image_hash):
+    """
+    Buduje URL okładki gry z wersją wyliczoną z hasha treści.
+
+    Args:
+        game_id (int): ID gry.
+        image_hash (str|None): `Game.image_hash`.
+
+    Returns:
+        str: Np. `/api/games/7/image?v=3f1a9c2e7b41d0aa`. Bez hasha (obrazek
+        sprzed migracji) zwracany jest URL bez wersji.
+    """
+    url = f"/api/games/{game_id}/image"
+    if image_hash:
+        url += f"?v={image_hash[:IMAGE_VERSION_LENGTH]}"
+    return url
+
+
+def get_image_meta(game_id):
+    """
+    Zwraca `(image_path, image_hash)` gry bez ładowania całego obiektu `Game`.
+
+    Wynik jest krótko cache'owany w pamięci procesu, więc kolejne żądania
+    o ten sam obrazek nie trafiają do bazy.
+
+    Returns:
+        tuple|None: `(image_path, image_hash)` lub `None`, gdy gra nie istnieje.
+    """
+    meta = _image_meta_cache.get(game_id)
+    if meta is None:
+        row = db.session.execute(
+            select(Game.image_path, Game.image_hash).where(Game.id == game_id)
+        ).first()
+        if row is None:
+            return None
+        meta = tuple(row)
+        _image_meta_cache.set(game_id, meta)
+    return meta
+
+
+def backfill_image_hashes():
+    """
+    Uzupełnia `Game.image_hash` dla gier z obrazkiem i bez hasha.
+
+    Returns:
+        tuple[int, int]: (liczba uzupełnionych, liczba brakujących plików).
+    """
+    updated = missing = 0
+    rows = db.session.execute(
+        select(Game.id, Game.image_path).where(
+            Game.image_path.is_not(None), Game.image_hash.is_(None)
+        )
+    ).all()
+    for game_id, image_path in rows:
+        path = resolve_image_path(image_path)
+        if path is None:
+            missing += 1
+            continue
+        db.session.execute(
+            update(Game).where(Game.id == game_id).values(image_hash=file_digest(path))
+        )
+        updated += 1
+    db.session.commit()
+    return updated, missing
+
+
+def send_image(path, etag, immutable, mimetype=None):
+    """
+    Wysyła plik obrazka z nagłówkami cache.
+
+    Obsługuje żądania warunkowe (`If-None-Match` → 304) i zakresy bajtów
+    (`Range` → 206). W zależności od `IMAGE_SENDFILE_MODE` bajty wysyła:
+        - `""` (domyślnie): sam Flask,
+        - `"x-sendfile"`: serwer WWW na podstawie nagłówka `X-Sendfile`
+          (Apache `mod_xsendfile`, lighttpd),
+        - `"x-accel"`: nginx na podstawie `X-Accel-Redirect`
+          (`IMAGE_ACCEL_PREFIX` + ścieżka względem katalogu backendu).
+
+    Args:
+        path (str): Ścieżka bezwzględna pliku.
+        etag (str): Silny ETag (hash treści).
+        immutable (bool): Czy URL zawiera aktualną wersję obrazka.
+        mimetype (str|None): Typ treści; domyślnie zgadywany z rozszerzenia.
+
+    Returns:
+        Response: Odpowiedź 200/206/304.
+    """
+    mimetype = mimetype or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    mode = current_app.config.get("IMAGE_SENDFILE_MODE") or ""
+    accel_path = None
+    if mode == "x-accel" and path.startswith(BACKEND_ROOT + os.sep):
+        relative = os.path.relpath(path, BACKEND_ROOT).replace(os.sep, "/")
+        prefix = current_app.config.get("IMAGE_ACCEL_PREFIX", "/protected/")
+        accel_path = prefix.rstrip("/") + "/" + relative
+
+    if accel_path:
+        # nginx sam obsługuje Range; tu zostaje tylko rewalidacja (304)
+        response = Response(mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers["X-Accel-Redirect"] = accel_path
+        response = response.make_conditional(request)
+    else:
+        response = send_file(path, mimetype=mimetype, conditional=True, etag=etag)
+    response.headers["Cache-Control"] = (
+        IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    )
+    return response
+
+
+def _snap_size(value, field):
+    if value in (None, ""):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ImageParamsError(f"Parametr '{field}' musi być liczbą całkowitą.")
+    if value < 1 or value > VARIANT_SIZES[-1]:
+        raise ImageParamsError(
+            f"Parametr '{field}' musi być z zakresu 1..{VARIANT_SIZES[-1]}."
+        )
+    return next(size for size in VARIANT_SIZES if size >= value)
+
+
+def parse_variant_params(args):
+    """
+    Parsuje parametry wariantu obrazka (`w`, `h`, `format`).
+
+    Returns:
+        tuple|None: `(szerokość, wysokość, format)` lub `None`, gdy żądany
+        jest oryginał. Wymiary są zaokrąglone w górę do `VARIANT_SIZES`.
+
+    Raises:
+        ImageParamsError: Gdy parametry są niepoprawne.
+    """
+    width = _snap_size(args.get("w"), "w")
+    height = _snap_size(args.get("h"), "h")
+    fmt = (args.get("format") or "").lower() or None
+    if fmt is not None and fmt not in VARIANT_FORMATS:
+        allowed = ", ".join(sorted(VARIANT_FORMATS))
+        raise ImageParamsError(f"Nieobsługiwany format '{fmt}'. Dozwolone: {allowed}.")
+    if width is None and height is None and fmt is None:
+        return None
+    return width, height, fmt
+
+
+class ImageVariantCache:
+    """
+    Dyskowy cache przeskalowanych wariantów okładek z limitem rozmiaru (LRU).
+
+    Wariant jest generowany raz (Pillow), zapisywany pod nazwą wyliczoną
+    z hasha pliku źródłowego i parametrów, a potem serwowany z dysku.
+    Po przekroczeniu `IMAGE_VARIANT_CACHE_MAX_BYTES` usuwane są warianty
+    najdawniej używane (czas modyfikacji pliku jest odświeżany przy trafieniu).
+
+    Konfiguracja:
+        - `IMAGE_VARIANT_CACHE_DIR`: katalog cache (domyślnie `instance/image_variants`),
+        - `IMAGE_VARIANT_CACHE_MAX_BYTES`: limit rozmiaru (domyślnie 256 MiB).
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.max_bytes = 256 * 1024 * 1024
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.directory = app.config.get("IMAGE_VARIANT_CACHE_DIR") or os.path.join(
+            app.instance_path, "image_variants"
+        )
+        self.max_bytes = int(
+            app.config.get("IMAGE_VARIANT_CACHE_MAX_BYTES", self.max_bytes)
+        )
+
+    @property
+    def available(self):
+        """Czy generowanie wariantów jest możliwe (zainstalowany Pillow)."""
+        return Image is not None
+
+    def get(self, source_path, params):
+        """
+        Zwraca ścieżkę wariantu, generując go przy pierwszym żądaniu.
+
+        Args:
+            source_path (str): Ścieżka oryginału (z `resolve_image_path`).
+            params (tuple): Wynik `parse_variant_params`.
+
+        Returns:
+            tuple[str, str]: (ścieżka pliku wariantu, mimetype). Nazwa pliku
+            (bez rozszerzenia) jest hashem źródła i parametrów – nadaje się
+            na ETag wariantu.
+        """
+        width, height, fmt = params
+        if fmt is None:
+            ext = source_path.rsplit(".", 1)[-1].lower()
+            fmt = SOURCE_FORMATS.get(ext, "png")
+        pil_format, ext, mimetype = VARIANT_FORMATS[fmt]
+
+        key = hashlib.sha256(
+            f"{file_digest(source_path)}:{width}:{height}:{pil_format}".encode()
+        ).hexdigest()[:32]
+        path = os.path.join(self.directory, f"{key}.{ext}")
+        if os.path.isfile(path):
+            os.utime(path)
+            return path, mimetype
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with Image.open(source_path) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((width or VARIANT_SIZES[-1], height or VARIANT_SIZES[-1]))
+            if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(tmp_path, pil_format, quality=VARIANT_QUALITY, optimize=True)
+        os.replace(tmp_path, path)
+        self._enforce_limit(keep=path)
+        return path, mimetype
+
+    def _enforce_limit(self, keep):
+        """
+        Usuwa najdawniej używane warianty, aż rozmiar cache zmieści się w limicie.
+
+        Plik `keep` (właśnie wygenerowany wariant) nigdy nie jest usuwany.
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+
+image_variants = ImageVariantCache()
+
+
+class ImageSweeper:
+    """
+    Usuwa pliki okładek, do których nie odwołuje się żadne `Game.image_path`.
+
+    Domyślnie sprzątanie uruchamia się tylko ręcznie (`flask sweep-images`).
+    Przy `IMAGE_SWEEP_INTERVAL` > 0 działa dodatkowo w wątku w tle co podaną
+    liczbę sekund – w każdym procesie aplikacji, więc należy je włączać
+    świadomie (np. w jednym dedykowanym procesie).
+
+    Konfiguracja:
+        - `IMAGE_SWEEP_INTERVAL`: odstęp między przebiegami w sekundach
+          (domyślnie 0 – sprzątanie w tle wyłączone),
+        - `IMAGE_SWEEP_GRACE`: minimalny wiek pliku w sekundach (domyślnie 3600).
+
+    Note:
+        - Okres karencji chroni pliki zapisane przez `store_upload`, których
+          gra nie została jeszcze zatwierdzona w bazie.
+        - Usuwane są też porzucone pliki tymczasowe (`*.tmp`) starsze niż karencja.
+        - Brane pod uwagę są wyłącznie nazwy zgodne z `SWEEPABLE_NAME` –
+          pliki dodane do katalogu ręcznie (lub śledzone w repozytorium)
+          nie zostaną usunięte nawet przy pustej lub innej bazie.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.interval = 0.0
+        self.grace = 3600.0
+        self._thread = None
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = float(app.config.get("IMAGE_SWEEP_INTERVAL", 0))
+        self.grace = float(app.config.get("IMAGE_SWEEP_GRACE", self.grace))
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="image-sweeper", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.app.app_context():
+                try:
+                    removed = self.sweep()
+                    if removed:
+                        logger.info("Usunięto %d nieużywanych obrazków", removed)
+                except Exception:
+                    logger.exception("Nie udało się posprzątać obrazków")
+                finally:
+                    db.session.remove()
+
+    def sweep(self):
+        """
+        Wykonuje jeden przebieg sprzątania.
+
+        Returns:
+            int: Liczba usuniętych plików.
+        """
+        if not os.path.isdir(UPLOAD_DIR):
+            return 0
+        referenced = {
+            path.replace("\\", "/")
+            for path in db.session.scalars(
+                select(Game.image_path).where(Game.image_path.is_not(None)).distinct()
+            )
+        }
+        cutoff = time.time() - self.grace
+        removed = 0
+        with os.scandir(UPLOAD_DIR) as it:
+            for entry in it:
+                if not entry.is_file() or not SWEEPABLE_NAME.match(entry.name):
+                    continue
+                if f"{UPLOAD_SUBDIR}/{entry.name}" in referenced:
+                    continue
+                if entry.stat().st_mtime > cutoff:
+                    continue
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                removed += 1
+        return removed
+
+
+image_sweeper = ImageSweeper()
@@ -0,0 +1,367 @@
+import csv
+import json
+
+from sqlalchemy import func, insert, literal, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models.game_genre_model import Genre, game_genre
+from app.models.game_model import Game
+from app.models.game_tag_model import Tag, game_tag
+from app.services.catalog_version_service import bump_catalog_version
+from app.services.text_utils import fold_text
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+#: Separator list w plikach CSV (np. `RPG|Action`).
+CSV_LIST_SEPARATOR = "|"
+
+
+class ImportRowError(ValueError):
+    """Błąd pojedynczego wiersza importu (nie przerywa całego importu)."""
+
+
+class ImportStreamError(ImportRowError):
+    """
+    Błąd pliku, po którym nie da się czytać dalej (np. uszkodzony CSV).
+
+    Wiersze zapisane wcześniej zostają w bazie, a import kończy się raportem
+    częściowym z błędem w linii, w której przerwano czytanie.
+    """
+
+
+def iter_ndjson_rows(stream):
+    """
+    Czyta wiersze NDJSON (jeden obiekt JSON na linię) ze strumienia bajtów.
+
+    Yields:
+        tuple[int, dict|ImportRowError]: (numer linii, dane wiersza lub błąd).
+    """
+    for line_no, raw in enumerate(stream, start=1):
+        try:
+            line = raw.decode("utf-8-sig" if line_no == 1 else "utf-8").strip()
+        except UnicodeDecodeError:
+            yield line_no, ImportRowError("Niepoprawne kodowanie (wymagane UTF-8).")
+            continue
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_no, ImportRowError("Niepoprawny JSON.")
+            continue
+        if not isinstance(data, dict):
+            yield line_no, ImportRowError("Wiersz musi być obiektem JSON.")
+            continue
+        yield line_no, data
+
+
+def iter_csv_rows(stream):
+    """
+    Czyta wiersze CSV (z nagłówkiem) ze strumienia bajtów.
+
+    Kolumny `genres` i `tags` mogą zawierać wiele wartości rozdzielonych `|`.
+    Błędne kodowanie lub składnia CSV kończą czytanie: ostatnim elementem
+    jest wtedy `ImportStreamError` z numerem linii, w której wystąpił błąd.
+
+    Yields:
+        tuple[int, dict|ImportStreamError]: (numer wiersza danych, słownik
+        kolumna → wartość lub błąd pliku).
+    """
+    lines = (raw.decode("utf-8-sig") for raw in stream)
+    reader = csv.DictReader(lines)
+    # `DictReader.line_num` jest aktualizowany dopiero po udanym odczycie,
+    # więc przy błędzie numer linii bierzemy z czytnika bazowego
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            # linia z błędem nie została jeszcze policzona
+            yield reader.reader.line_num + 1, ImportStreamError(
+                "Niepoprawne kodowanie (wymagane UTF-8) – import przerwany."
+            )
+            return
+        except csv.Error as e:
+            yield reader.reader.line_num, ImportStreamError(
+                f"Niepoprawny CSV ({e}) – import przerwany."
+            )
+            return
+        for field in ("genres", "tags"):
+            value = row.get(field) or ""
+            row[field] = [v for v in value.split(CSV_LIST_SEPARATOR) if v.strip()]
+        yield reader.line_num, row
+
+
+def _to_float(val, field):
+    if val in (None, ""):
+        return None
+    try:
+        return float(str(val).replace(",", "."))
+    except ValueError:
+        raise ImportRowError(f"Pole '{field}' musi być liczbą.")
+
+
+def _to_names(val, field):
+    if val in (None, ""):
+        return []
+    if isinstance(val, str):
+        val = [val]
+    if not isinstance(val, list) or not all(isinstance(v, str) for v in val):
+        raise ImportRowError(f"Pole '{field}' musi być listą nazw.")
+    return [v.strip() for v in val if v.strip()]
+
+
+def validate_row(data):
+    """
+    Waliduje i normalizuje jeden wiersz importu.
+
+    Zasady są takie same jak w `create_game`: tytuł jest wymagany,
+    `discount` spoza zakresu [0, 100] jest ustawiany na 0.0.
+
+    Returns:
+        dict: Znormalizowane pola gry + listy `genres` i `tags`.
+
+    Raises:
+        ImportRowError: Gdy wiersz jest niepoprawny.
+    """
+    title = data.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ImportRowError("Title is required")
+    title = title.strip()
+    if len(title) > Game.title.type.length:
+        raise ImportRowError("Tytuł jest za długi.")
+    discount = _to_float(data.get("discount"), "discount") or 0.0
+    if discount < 0 or discount > 100:
+        discount = 0.0
+    description = data.get("description") or None
+    if description is not None and not isinstance(description, str):
+        raise ImportRowError("Pole 'description' musi być tekstem.")
+    return {
+        "title": title,
+        "description": description,
+        "price": _to_float(data.get("price"), "price"),
+        "discount": discount,
+        "search_title": fold_text(title),
+        "search_body": fold_text(description),
+        "genres": _to_names(data.get("genres"), "genres"),
+        "tags": _to_names(data.get("tags"), "tags"),
+    }
+
+
+def resolve_names(genre_names, tag_names):
+    """
+    Zamienia nazwy gatunków i tagów na ID jednym zapytaniem (`UNION ALL`).
+
+    Porównanie nie rozróżnia wielkości liter; nieznane nazwy są pomijane
+    (tak jak w `create_game`).
+
+    Returns:
+        tuple[dict, dict]: (nazwa gatunku małymi literami → id, nazwa taga → id).
+    """
+    parts = []
+    if genre_names:
+        parts.append(
+            select(literal("genre"), Genre.id, func.lower(Genre.name)).where(
+                func.lower(Genre.name).in_(genre_names)
+            )
+        )
+    if tag_names:
+        parts.append(
+            select(literal("tag"), Tag.id, func.lower(Tag.name)).where(
+                func.lower(Tag.name).in_(tag_names)
+            )
+        )
+    genres, tags = {}, {}
+    if not parts:
+        return genres, tags
+    stmt = parts[0] if len(parts) == 1 else union_all(*parts)
+    for kind, id_, name in db.session.execute(stmt):
+        (genres if kind == "genre" else tags)[name] = id_
+    return genres, tags
+
+
+class ImportReport:
+    """
+    Wynik importu: liczniki oraz (ograniczona) lista błędów wierszy.
+
+    Atrybuty:
+        inserted (int): Liczba dodanych gier.
+        failed (int): Liczba odrzuconych wierszy.
+        errors (list[dict]): Maks. `MAX_REPORTED_ERRORS` błędów
+            w formacie `{"line": 12, "error": "..."}`.
+        aborted (bool): Czy czytanie pliku przerwano (`ImportStreamError`).
+    """
+
+    def __init__(self):
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        self.aborted = False
+
+    def add_error(self, line_no, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": message})
+
+    def to_dict(self):
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "aborted": self.aborted,
+        }
+
+
+#: Kolumny tabeli `game` zapisywane przez import.
+GAME_FIELDS = (
+    "title",
+    "description",
+    "price",
+    "discount",
+    "search_title",
+    "search_body",
+)
+
+
+def _insert_rows(rows, genre_ids, tag_ids):
+    """
+    Wstawia gry z `rows` oraz ich powiązania – bez zatwierdzania transakcji.
+
+    Args:
+        rows (list[tuple[int, dict]]): (numer linii, znormalizowany wiersz).
+        genre_ids, tag_ids (dict): Wynik `resolve_names`.
+    """
+    inserted = db.session.execute(
+        insert(Game).returning(Game.id, Game.title, sort_by_parameter_order=True),
+        [{k: row[k] for k in GAME_FIELDS} for _, row in rows],
+    ).all()
+    ids = {title: id_ for id_, title in inserted}
+
+    genre_rows, tag_rows = [], []
+    for _, row in rows:
+        game_id = ids[row["title"]]
+        for gid in {genre_ids.get(n.lower()) for n in row["genres"]} - {None}:
+            genre_rows.append({"game_id": game_id, "genre_id": gid})
+        for tid in {tag_ids.get(n.lower()) for n in row["tags"]} - {None}:
+            tag_rows.append({"game_id": game_id, "tag_id": tid})
+    if genre_rows:
+        db.session.execute(insert(game_genre), genre_rows)
+    if tag_rows:
+        db.session.execute(insert(game_tag), tag_rows)
+
+
+def _db_error_message(error):
+    """Pierwsza linia komunikatu bazy (bez SQL i parametrów)."""
+    detail = str(getattr(error, "orig", None) or error).strip()
+    return detail.splitlines()[0] if detail else type(error).__name__
+
+
+def _import_rows_one_by_one(accepted, genre_ids, tag_ids, report):
+    """
+    Zapisuje wiersze paczki pojedynczo, każdy w osobnym `SAVEPOINT`.
+
+    Używane po błędzie zapisu całej paczki: wiersz, którego nie da się
+    zapisać, trafia do raportu z własnym numerem linii, a pozostałe są
+    zatwierdzane razem na końcu.
+    """
+    saved = []
+    try:
+        for line_no, row in accepted:
+            try:
+                with db.session.begin_nested():
+                    _insert_rows([(line_no, row)], genre_ids, tag_ids)
+            except SQLAlchemyError as e:
+                report.add_error(
+                    line_no, f"Nie udało się zapisać wiersza: {_db_error_message(e)}"
+                )
+                continue
+            saved.append(line_no)
+        if saved:
+            bump_catalog_version(features=True)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        message = f"Nie udało się zapisać paczki: {_db_error_message(e)}"
+        for line_no in saved:
+            report.add_error(line_no, message)
+        return
+    report.inserted += len(saved)
+
+
+def _import_batch(batch, report):
+    """
+    Zapisuje jedną paczkę poprawnych wierszy.
+
+    Koszt paczki jest stały: zapytanie o istniejące tytuły, jedno zapytanie
+    o gatunki/tagi, wielowierszowy `INSERT` gier i po jednym wielowierszowym
+    `INSERT` do `game_genre` i `game_tag`. Jeśli zapis paczki się nie uda
+    (np. tytuł dodany równolegle), paczka jest wycofywana i zapisywana
+    ponownie wiersz po wierszu, żeby wskazać faktycznie błędne linie.
+    """
+    titles = [row["title"] for _, row in batch]
+    existing = set(db.session.scalars(select(Game.title).where(Game.title.in_(titles))))
+
+    accepted, seen = [], set()
+    for line_no, row in batch:
+        if row["title"] in existing or row["title"] in seen:
+            report.add_error(line_no, "Gra o tym tytule już istnieje.")
+            continue
+        seen.add(row["title"])
+        accepted.append((line_no, row))
+    if not accepted:
+        return
+
+    genre_ids, tag_ids = resolve_names(
+        {n.lower() for _, row in accepted for n in row["genres"]},
+        {n.lower() for _, row in accepted for n in row["tags"]},
+    )
+    try:
+        _insert_rows(accepted, genre_ids, tag_ids)
+        bump_catalog_version(features=True)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        _import_rows_one_by_one(accepted, genre_ids, tag_ids, report)
+        return
+    report.inserted += len(accepted)
+
+
+def import_games(rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importuje gry ze strumienia wierszy w paczkach po `batch_size`.
+
+    Błędne wiersze są raportowane i pomijane, pozostałe są zapisywane.
+    Każda paczka jest osobną transakcją, więc zużycie pamięci zależy od
+    rozmiaru paczki, a nie pliku. Po `ImportStreamError` zapisywane są już
+    przeczytane poprawne wiersze, a raport ma `aborted = True`.
+
+    Args:
+        rows (Iterable[tuple[int, dict|ImportRowError]]): Wynik
+            `iter_ndjson_rows` lub `iter_csv_rows`.
+        batch_size (int): Liczba wierszy w paczce.
+
+    Returns:
+        dict: Raport, patrz `ImportReport.to_dict`.
+    """
+    report = ImportReport()
+    batch = []
+    for line_no, data in rows:
+        try:
+            if isinstance(data, ImportRowError):
+                raise data
+            batch.append((line_no, validate_row(data)))
+        except ImportRowError as e:
+            report.add_error(line_no, str(e))
+            if isinstance(e, ImportStreamError):
+                report.aborted = True
+            continue
+        if len(batch) >= batch_size:
+            _import_batch(batch, report)
+            batch = []
+    if batch:
+        _import_batch(batch, report)
+    return report.to_dict()
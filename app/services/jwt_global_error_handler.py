@@ -19,8 +19,15 @@ def register_jwt_error_handlers(app):
     Returns:
         JWTManager: obiekt JWTManager z przypiętymi handlerami błędów.
     """
+    from app.services.token_service import revoked_tokens
+
     jwt = JWTManager(app)
 
+    @jwt.token_in_blocklist_loader
+    def is_token_revoked(jwt_header, jwt_payload):
+        """Sprawdza JTI w zbiorze unieważnionych tokenów (w pamięci, patrz `RevocationList`)."""
+        return revoked_tokens.is_revoked(jwt_payload["jti"])
+
     @jwt.unauthorized_loader
     def handle_missing_token(reason):
         """
@@ -0,0 +1,40 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+
+
+def configure_logging(app):
+    """
+    Konfiguruje logowanie pakietu `app` przez kolejkę.
+
+    Wątki obsługujące żądania tylko wrzucają rekord do kolejki
+    (`QueueHandler`); zapis na stderr wykonuje osobny wątek
+    (`QueueListener`), więc wolne wyjście nie blokuje żądań.
+
+    Konfiguracja:
+        - `LOG_LEVEL`: poziom logowania loggerów `app.*` (domyślnie `INFO`).
+
+    Args:
+        app (Flask): instancja aplikacji Flask.
+    """
+    global _listener
+
+    logger = logging.getLogger("app")
+    logger.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
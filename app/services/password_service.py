@@ -0,0 +1,105 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_HASH_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Kolejka hashowania jest pełna (mapowane na 503 z `Retry-After`)."""
+
+    def __init__(self, retry_after):
+        super().__init__("Serwer jest przeciążony, spróbuj ponownie za chwilę.")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Hashowanie haseł w puli procesów z ograniczoną kolejką.
+
+    Hashowanie (scrypt/pbkdf2) jest celowo kosztowne. Wykonywane w wątku
+    obsługującym żądanie blokowałoby worker (i GIL) na czas całego hasha,
+    więc przy fali logowań tanie odczyty katalogu czekałyby w kolejce.
+    Tu hashe liczy osobna pula procesów, a liczba oczekujących operacji
+    jest ograniczona – nadmiar od razu dostaje 503 zamiast zapychać serwer.
+
+    Konfiguracja:
+        - `PASSWORD_HASH_METHOD`: metoda Werkzeug z parametrami kosztu,
+          np. `scrypt:32768:8:1` (domyślnie) lub `pbkdf2:sha256:600000`,
+        - `PASSWORD_HASH_WORKERS`: liczba procesów puli (0 – hashowanie
+          w wątku żądania),
+        - `PASSWORD_HASH_MAX_PENDING`: maks. liczba operacji w toku i w kolejce,
+        - `PASSWORD_HASH_QUEUE_TIMEOUT`: ile sekund czekać na miejsce w kolejce.
+
+    Note:
+        - Pula jest tworzona leniwie (przy pierwszym użyciu w danym procesie)
+          metodą `spawn`, więc działa też pod serwerami forkującymi workery.
+        - Każdy worker serwera ma własną pulę.
+    """
+
+    def __init__(self):
+        self.method = DEFAULT_HASH_METHOD
+        self.workers = 2
+        self.queue_timeout = 0.5
+        self.retry_after = 1
+        self._slots = threading.BoundedSemaphore(16)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._method_prefix = None
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD") or DEFAULT_HASH_METHOD
+        self.workers = int(app.config.get("PASSWORD_HASH_WORKERS", self.workers))
+        max_pending = int(
+            app.config.get("PASSWORD_HASH_MAX_PENDING") or max(self.workers, 1) * 8
+        )
+        self.queue_timeout = float(
+            app.config.get("PASSWORD_HASH_QUEUE_TIMEOUT", self.queue_timeout)
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._method_prefix = None
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy(self.retry_after)
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            return self._executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Zwraca hash hasła wyliczony skonfigurowaną metodą."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """Sprawdza hasło z hashem (dowolną metodą obsługiwaną przez Werkzeug)."""
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """
+        Czy hash powstał inną metodą lub z innym kosztem niż skonfigurowany.
+
+        Porównywany jest prefiks `metoda:parametry` hasha Werkzeug
+        (np. `pbkdf2:sha256:600000`).
+        """
+        if self._method_prefix is None:
+            # Werkzeug uzupełnia domyślne parametry (np. "scrypt" →
+            # "scrypt:32768:8:1"), więc postać kanoniczną daje próbny hash
+            self._method_prefix = generate_password_hash("", self.method).split("$")[0]
+        return pwhash.split("$", 1)[0] != self._method_prefix
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import db
+
+
+class QueryCounter:
+    """
+    Licznik zapytań SQL wysłanych do bazy w obrębie bloku `with`.
+
+    Atrybuty:
+        count (int): Liczba wykonanych zapytań.
+        statements (list[str]): Treść wykonanych zapytań (do diagnostyki).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Zlicza zapytania SQL wykonane wewnątrz bloku.
+
+    Args:
+        engine (Engine|None): Silnik do nasłuchiwania (domyślnie `db.engine`).
+            Wymaga aktywnego kontekstu aplikacji.
+
+    Yields:
+        QueryCounter: Licznik uzupełniany na bieżąco.
+
+    Example:
+        ```python
+        with count_queries() as counter:
+            client.get("/api/games?limit=50")
+        print(counter.count)
+        ```
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(expected, engine=None):
+    """
+    Sprawdza, że blok nie wykonał więcej niż `expected` zapytań SQL.
+
+    Służy do pilnowania, że liczba zapytań endpointu jest stała
+    (nie rośnie z liczbą zwracanych gier).
+
+    Raises:
+        AssertionError: Gdy przekroczono limit (komunikat zawiera wykonane zapytania).
+
+    Example:
+        ```python
+        # lista + gatunki + tagi, niezależnie od limitu strony
+        for limit in (1, 10, 100):
+            with assert_max_queries(3):
+                client.get(f"/api/games?limit={limit}")
+        ```
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > expected:
+        executed = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Oczekiwano najwyżej {expected} zapytań, wykonano {counter.count}:\n{executed}"
+        )
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import threading
+import time
+
+from app.services.ttl_cache import TTLCache
+
+#: Jednostki w zapisie limitu (`"10/minute"`) → długość okna w sekundach.
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitError(ValueError):
+    """Niepoprawny zapis limitu (błąd programisty, nie klienta)."""
+
+
+def parse_limit(value):
+    """
+    Parsuje zapis limitu, np. `"10/minute"` lub `"100/hour"`.
+
+    Returns:
+        tuple[int, float]: (pojemność kubełka, przyrost tokenów na sekundę).
+
+    Raises:
+        RateLimitError: Gdy zapis jest niepoprawny.
+    """
+    try:
+        count, period = value.split("/")
+        count = int(count)
+        seconds = PERIODS[period.strip().rstrip("s")]
+    except (ValueError, KeyError):
+        raise RateLimitError(
+            f"Niepoprawny limit: {value!r} (oczekiwano np. '10/minute')."
+        )
+    if count < 1:
+        raise RateLimitError(f"Niepoprawny limit: {value!r} (liczba musi być > 0).")
+    return count, count / seconds
+
+
+def _refill(tokens, updated_at, now, capacity, rate):
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+class MemoryRateLimitBackend:
+    """
+    Kubełki tokenów w pamięci procesu.
+
+    Kubełek znika z pamięci, gdy zdążyłby się w pełni napełnić (wtedy jego
+    stan i tak jest równy nowemu kubełkowi), a liczba kubełków jest
+    ograniczona (LRU).
+
+    Note:
+        - Każdy worker liczy limity osobno – przy N workerach efektywny limit
+          jest do N razy większy. Wtedy należy użyć `SQLiteRateLimitBackend`.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self._buckets = TTLCache(maxsize=max_keys, ttl=3600)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets.set(key, (tokens, now), ttl=(capacity - tokens) / rate + 1)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class SQLiteRateLimitBackend:
+    """
+    Kubełki tokenów współdzielone między workerami (plik SQLite na dysku lokalnym).
+
+    Odczyt i zapis kubełka odbywają się w jednej transakcji `BEGIN IMMEDIATE`,
+    więc równoległe żądania z różnych procesów nie przekroczą limitu.
+
+    Args:
+        path (str): Ścieżka do pliku bazy limitów.
+    """
+
+    #: Co ile operacji usuwać nieużywane kubełki.
+    CLEANUP_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._ops = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS bucket (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def consume(self, key, capacity, rate, cost=1):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM bucket WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else _refill(*row, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO bucket VALUES (?, ?, ?, ?)",
+                (key, tokens, now, now + (capacity - tokens) / rate),
+            )
+            self._ops += 1
+            if self._ops % self.CLEANUP_EVERY == 0:
+                conn.execute("DELETE FROM bucket WHERE expires_at < ?", (now,))
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class RateLimiter:
+    """
+    Ograniczanie liczby żądań algorytmem kubełka tokenów (token bucket).
+
+    Kubełek o pojemności `N` napełnia się ciągle w tempie `N` tokenów na okno,
+    więc dopuszcza krótkie serie do `N` żądań, a średnio – `N` na okno.
+
+    Backend jest wybierany z konfiguracji aplikacji:
+        - `RATE_LIMIT_BACKEND`: `"memory"` (domyślnie), `"sqlite"` lub `"none"`,
+        - `RATE_LIMIT_PATH`: plik dla backendu `sqlite`.
+
+    Example:
+        ```python
+        @api.route("/auth/login", methods=["POST"])
+        @rate_limit("10/minute", key="ip")
+        def login(): ...
+        ```
+    """
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        kind = app.config.get("RATE_LIMIT_BACKEND", "memory")
+        if kind == "memory":
+            self.backend = MemoryRateLimitBackend()
+        elif kind == "sqlite":
+            path = app.config.get("RATE_LIMIT_PATH") or os.path.join(
+                app.instance_path, "rate_limit.sqlite3"
+            )
+            self.backend = SQLiteRateLimitBackend(path)
+        elif kind == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Nieznany backend limitów: {kind!r}")
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def hit(self, key, capacity, rate, cost=1):
+        """
+        Pobiera `cost` tokenów z kubełka `key`.
+
+        Returns:
+            tuple[bool, float]: (czy żądanie dozwolone, za ile sekund ponowić).
+        """
+        if self.backend is None:
+            return True, 0.0
+        return self.backend.consume(key, capacity, rate, cost)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,119 @@
+from sqlalchemy import func, select, update
+
+from app import db
+from app.models.game_model import Game
+from app.models.review_model import Review
+
+#: Kolumna histogramu dla danej liczby gwiazdek.
+RATING_BUCKETS = {
+    1: Game.rating_1,
+    2: Game.rating_2,
+    3: Game.rating_3,
+    4: Game.rating_4,
+    5: Game.rating_5,
+}
+
+
+def apply_rating_delta(game_id, old_rating, new_rating):
+    """
+    Aktualizuje zdenormalizowane agregaty ocen gry o zmianę jednej recenzji.
+
+    Zmiana jest wykonywana jednym `UPDATE game SET x = x + ...`, więc jest
+    atomowa względem współbieżnych recenzji i staje się trwała razem
+    z `commit()` zapisującym samą recenzję.
+
+    Poprawność agregatów zależy od `old_rating`: musi pochodzić z tego samego
+    zapisu recenzji (wiersz zwrócony przez `INSERT ... RETURNING` albo ocena
+    odczytana pod blokadą wiersza przed `UPDATE`), a nie z wcześniejszego,
+    osobnego `SELECT` – dwa równoległe zapisy widziałyby wtedy tę samą starą
+    ocenę. Patrz `upsert_review`.
+
+    Args:
+        game_id (int): ID gry.
+        old_rating (int|None): Poprzednia ocena (`None` dla nowej recenzji),
+            ustalona atomowo z zapisem recenzji.
+        new_rating (int|None): Nowa ocena (`None` przy usunięciu recenzji).
+    """
+    if old_rating == new_rating:
+        return
+    values = {}
+    if old_rating is None:
+        values["rating_count"] = Game.rating_count + 1
+    elif new_rating is None:
+        values["rating_count"] = Game.rating_count - 1
+    values["rating_sum"] = Game.rating_sum + (new_rating or 0) - (old_rating or 0)
+    if old_rating is not None:
+        column = RATING_BUCKETS[old_rating]
+        values[column.key] = column - 1
+    if new_rating is not None:
+        column = RATING_BUCKETS[new_rating]
+        values[column.key] = column + 1
+
+    db.session.execute(
+        update(Game)
+        .where(Game.id == game_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_rating_aggregates():
+    """
+    Przelicza od zera agregaty ocen wszystkich gier na podstawie tabeli `review`.
+
+    Służy do naprawy danych (np. po ręcznych zmianach w bazie). Wykonuje
+    jedno zgrupowane zapytanie po recenzjach, zeruje agregaty i zapisuje
+    nowe wartości zbiorczym `UPDATE` (executemany).
+
+    Returns:
+        int: Liczba gier, które mają co najmniej jedną recenzję.
+    """
+    rows = db.session.execute(
+        select(Review.game_id, Review.rating, func.count())
+        .group_by(Review.game_id, Review.rating)
+        .order_by(Review.game_id)
+    )
+    zeros = {"rating_count": 0, "rating_sum": 0}
+    zeros.update({column.key: 0 for column in RATING_BUCKETS.values()})
+
+    aggregates = {}
+    for game_id, rating, count in rows:
+        agg = aggregates.setdefault(game_id, {"id": game_id, **zeros})
+        agg["rating_count"] += count
+        agg["rating_sum"] += rating * count
+        if rating in RATING_BUCKETS:
+            agg[RATING_BUCKETS[rating].key] += count
+
+    db.session.execute(
+        update(Game).values(**zeros).execution_options(synchronize_session=False)
+    )
+    if aggregates:
+        db.session.execute(update(Game), list(aggregates.values()))
+    db.session.commit()
+    return len(aggregates)
+
+
+def rating_summary(game):
+    """
+    Buduje podsumowanie ocen gry z kolumn zdenormalizowanych (bez zapytań).
+
+    Args:
+        game (Game): Instancja gry.
+
+    Returns:
+        dict: Np.
+            {
+              "count": 12,
+              "average": 4.25,            # None, gdy brak recenzji
+              "histogram": {"1": 0, "2": 1, "3": 1, "4": 4, "5": 6}
+            }
+    """
+    count = game.rating_count or 0
+    return {
+        "count": count,
+        "average": round(game.rating_sum / count, 2) if count else None,
+        "histogram": {
+            str(stars): getattr(game, column.key) or 0
+            for stars, column in RATING_BUCKETS.items()
+        },
+    }
@@ -0,0 +1,499 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+
+from app import db
+from app.models.review_model import Review
+from app.models.wish_list import WishList
+
+logger = logging.getLogger(__name__)
+
+#: Waga recenzji w macierzy interakcji wg oceny (słabe oceny nie są sygnałem).
+REVIEW_WEIGHTS = {1: 0.0, 2: 0.0, 3: 0.5, 4: 1.0, 5: 1.0}
+#: Waga gry na wishliście.
+WISHLIST_WEIGHT = 1.0
+
+#: Górny limit niezerowych elementów bloku macierzy podobieństw (pamięć).
+BLOCK_NNZ_BUDGET = 2_000_000
+
+#: Przy zmianie większej części katalogu przyrostowe odświeżenie nie ma sensu.
+INCREMENTAL_MAX_FRACTION = 0.5
+
+
+def interaction_matrix(user_ids, game_ids, weights):
+    """
+    Buduje rzadką macierz interakcji użytkownik × gra.
+
+    Args:
+        user_ids, game_ids (np.ndarray): ID użytkownika i gry dla każdej interakcji.
+        weights (np.ndarray): Waga interakcji (powtórzenia pary są sumowane,
+            wynik obcinany do 1).
+
+    Returns:
+        tuple[csr_matrix, np.ndarray, np.ndarray]: Macierz (float32) oraz
+        posortowane ID użytkowników (wiersze) i gier (kolumny).
+    """
+    users, rows = np.unique(user_ids, return_inverse=True)
+    games, cols = np.unique(game_ids, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), (rows, cols)),
+        shape=(len(users), len(games)),
+    )
+    matrix.sum_duplicates()
+    np.minimum(matrix.data, 1.0, out=matrix.data)
+    matrix.eliminate_zeros()
+    return matrix, users, games
+
+
+def _row_blocks(cost, budget):
+    """Dzieli kolejne wiersze na bloki o łącznym koszcie nie większym niż `budget`."""
+    bounds = np.searchsorted(np.cumsum(cost), np.arange(budget, cost.sum(), budget))
+    edges = np.unique(np.concatenate(([0], bounds, [len(cost)])))
+    return zip(edges[:-1], edges[1:])
+
+
+def _normalize(matrix):
+    """Normalizuje kolumny (gry) do długości 1; zwraca też postać gra × użytkownik."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    normalized = (matrix @ sparse.diags(inverse.astype(np.float32))).tocsr()
+    return normalized, normalized.T.tocsr()
+
+
+def _rank_top_k(row_of, cols, vals, n_rows, k):
+    """
+    Wybiera `k` największych wartości w każdym wierszu listy wpisów (bez pętli).
+
+    Args:
+        row_of, cols, vals (np.ndarray): Wiersz, kolumna i wartość każdego wpisu.
+        n_rows (int): Liczba wierszy wyniku.
+        k (int): Liczba wpisów na wiersz.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Kolumny (`-1` gdy brak) i wartości,
+        kształt `(n_rows, k)`, malejąco.
+    """
+    order = np.lexsort((-vals, row_of))
+    row_of, cols, vals = row_of[order], cols[order], vals[order]
+    rank = np.arange(len(row_of)) - np.searchsorted(row_of, row_of)
+    keep = rank < k
+    neighbors = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float32)
+    neighbors[row_of[keep], rank[keep]] = cols[keep]
+    scores[row_of[keep], rank[keep]] = vals[keep]
+    return neighbors, scores
+
+
+def _csr_entries(matrix):
+    """(wiersz, kolumna, wartość) każdego niezerowego elementu macierzy CSR."""
+    row_of = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    return row_of, matrix.indices, matrix.data
+
+
+def _top_k(normalized, by_game, rows, k, nnz_budget):
+    # szacunkowy rozmiar wiersza podobieństw: suma liczby gier użytkowników gry
+    user_degree = np.diff(normalized.indptr).astype(np.int64)
+    cost = np.maximum((by_game[rows] != 0).astype(np.int64) @ user_degree, 1)
+
+    neighbors = np.full((len(rows), k), -1, dtype=np.int32)
+    scores = np.zeros((len(rows), k), dtype=np.float32)
+    for start, end in _row_blocks(cost, nnz_budget):
+        block_rows = rows[start:end]
+        row_of, cols, vals = _csr_entries((by_game[block_rows] @ normalized).tocsr())
+        not_self = cols != block_rows[row_of]
+        neighbors[start:end], scores[start:end] = _rank_top_k(
+            row_of[not_self], cols[not_self], vals[not_self], end - start, k
+        )
+    return neighbors, scores
+
+
+def top_k_cosine(matrix, k, rows=None, nnz_budget=BLOCK_NNZ_BUDGET):
+    """
+    Wylicza `k` najbliższych sąsiadów (podobieństwo kosinusowe kolumn).
+
+    Kolumny są normalizowane, a iloczyn `Xᵀ·X` liczony blokami wierszy
+    (macierzowo, w scipy), więc pamięć zależy od `nnz_budget`, a nie od
+    kwadratu liczby gier.
+
+    Args:
+        matrix (csr_matrix): Macierz użytkownik × gra.
+        k (int): Liczba sąsiadów.
+        rows (np.ndarray|None): Indeksy gier do policzenia (domyślnie wszystkie).
+        nnz_budget (int): Maks. liczba niezerowych elementów bloku podobieństw.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Indeksy sąsiadów (`int32`, `-1` gdy
+        brak) i podobieństwa (`float32`), oba o kształcie `(len(rows), k)`,
+        od najbardziej podobnych.
+    """
+    rows = np.arange(matrix.shape[1]) if rows is None else np.asarray(rows)
+    normalized, by_game = _normalize(matrix)
+    return _top_k(normalized, by_game, rows, k, nnz_budget)
+
+
+def top_k_cutoffs(neighbors, scores):
+    """
+    Próg każdego wiersza: żadna gra spoza listy nie ma wyższego podobieństwa.
+
+    Dla pełnej listy to wynik `k`-tego sąsiada, dla krótszej – 0 (lista
+    zawiera wszystkie gry o dodatnim podobieństwie).
+    """
+    return np.where(neighbors[:, -1] >= 0, scores[:, -1], 0.0).astype(np.float32)
+
+
+def changed_games(old, new):
+    """
+    Indeksy kolumn (gier), które różnią się między dwiema macierzami interakcji.
+
+    Obie macierze muszą mieć wspólne osie (patrz `_reindex`).
+    """
+    diff = (new - old).tocsc()
+    diff.eliminate_zeros()
+    return np.flatnonzero(np.diff(diff.indptr))
+
+
+def refresh_top_k(
+    matrix, neighbors, scores, cutoffs, changed, nnz_budget=BLOCK_NNZ_BUDGET
+):
+    """
+    Aktualizuje listy sąsiadów po zmianie kolumn `changed` (odświeżenie przyrostowe).
+
+    Podobieństwo dwóch gier zmienia się tylko, gdy zmieniła się któraś z nich.
+    Dlatego:
+        - wiersze zmienionych gier są liczone od nowa,
+        - z pozostałych wierszy usuwane są wpisy wskazujące zmienione gry,
+          a w ich miejsce wchodzą aktualne podobieństwa do zmienionych gier
+          (tylko dla gier, które z nimi współwystępują).
+
+    Gry spoza starej listy, które się nie zmieniły, nie są znane – wiadomo
+    tylko, że ich podobieństwo nie przekracza progu wiersza (`cutoffs`).
+    Dlatego w niezmienionych wierszach odrzucane są wpisy poniżej progu
+    (np. zmieniona gra, która wróciła z niższym wynikiem, a której miejsce
+    mogłaby zająć nieznana gra tuż za listą). Wynik jest więc prefiksem
+    pełnego top-K (z dokładnością do remisów na progu) – lista może być
+    krótsza, aż do następnego pełnego przeliczenia.
+
+    Args:
+        matrix (csr_matrix): Aktualna macierz użytkownik × gra.
+        neighbors, scores (np.ndarray): Poprzednie listy na osi gier `matrix`
+            (modyfikowane w miejscu).
+        cutoffs (np.ndarray): Poprzednie progi wierszy (patrz `top_k_cutoffs`).
+        changed (np.ndarray): Indeksy zmienionych gier.
+        nnz_budget (int): Maks. liczba niezerowych elementów bloku podobieństw.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Zaktualizowane `neighbors`,
+        `scores` i `cutoffs`.
+    """
+    k = neighbors.shape[1]
+    stale = np.isin(neighbors, changed)
+    neighbors[stale] = -1
+    scores[stale] = 0.0
+    if not len(changed):
+        return neighbors, scores, cutoffs
+
+    normalized, by_game = _normalize(matrix)
+    neighbors[changed], scores[changed] = _top_k(
+        normalized, by_game, changed, k, nnz_budget
+    )
+
+    to_changed = normalized[:, changed]
+    users = np.flatnonzero(np.diff(to_changed.tocsr().indptr))
+    related = np.flatnonzero(np.diff(normalized[users].tocsc().indptr))
+    related = np.setdiff1d(related, changed)
+    chunk = max(1, nnz_budget // len(changed))
+    for start in range(0, len(related), chunk):
+        block_rows = related[start : start + chunk]
+        row_of, cols, vals = _csr_entries((by_game[block_rows] @ to_changed).tocsr())
+        current = neighbors[block_rows]
+        kept_row, kept_pos = np.nonzero(current >= 0)
+        neighbors[block_rows], scores[block_rows] = _rank_top_k(
+            np.concatenate([kept_row, row_of]),
+            np.concatenate([current[kept_row, kept_pos], changed[cols]]),
+            np.concatenate([scores[block_rows][kept_row, kept_pos], vals]),
+            len(block_rows),
+            k,
+        )
+
+    # poniżej progu mogłaby się zmieścić nieznana gra spoza starej listy
+    is_changed = np.zeros(len(neighbors), dtype=bool)
+    is_changed[changed] = True
+    below = (neighbors >= 0) & (scores < cutoffs[:, None]) & ~is_changed[:, None]
+    neighbors[below] = -1
+    scores[below] = 0.0
+
+    # usunięte wpisy zostawiły dziury – braki na koniec wiersza
+    order = np.argsort(np.where(neighbors >= 0, -scores, np.inf), axis=1, kind="stable")
+    neighbors = np.take_along_axis(neighbors, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    # skrócona lista zachowuje stary próg; pełna – wynik `k`-tego sąsiada
+    full = neighbors[:, -1] >= 0
+    cutoffs = np.where(full, scores[:, -1], np.where(is_changed, 0.0, cutoffs)).astype(
+        np.float32
+    )
+    return neighbors, scores, cutoffs
+
+
+def load_interactions():
+    """
+    Czyta sygnały z wishlist i recenzji jako tablice (bez obiektów ORM).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: ID użytkowników, ID gier, wagi.
+    """
+    min_rating = min(r for r, w in REVIEW_WEIGHTS.items() if w > 0)
+    wishlist = db.session.execute(select(WishList.user_id, WishList.game_id)).all()
+    reviews = db.session.execute(
+        select(Review.user_id, Review.game_id, Review.rating).where(
+            Review.rating >= min_rating
+        )
+    ).all()
+    pairs = np.array(
+        [(u, g) for u, g in wishlist] + [(u, g) for u, g, _ in reviews],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    review_weights = np.array(
+        [REVIEW_WEIGHTS.get(r, 0.0) for _, _, r in reviews], dtype=np.float32
+    )
+    weights = np.concatenate(
+        [np.full(len(wishlist), WISHLIST_WEIGHT, dtype=np.float32), review_weights]
+    )
+    return pairs[:, 0], pairs[:, 1], weights
+
+
+def _reindex(matrix, users, games, all_users, all_games):
+    """Przenosi macierz na wspólne (szersze) osie użytkowników i gier."""
+    coo = matrix.tocoo()
+    return sparse.csr_matrix(
+        (
+            coo.data,
+            (
+                np.searchsorted(all_users, users[coo.row]),
+                np.searchsorted(all_games, games[coo.col]),
+            ),
+        ),
+        shape=(len(all_users), len(all_games)),
+    )
+
+
+class SimilarGames:
+    """
+    Wstępnie wyliczone „podobne gry” na podstawie współwystępowania
+    w wishlistach i recenzjach (podobieństwo kosinusowe kolumn macierzy
+    użytkownik × gra).
+
+    Indeks jest budowany zadaniem (`flask build-recommendations`) i zapisywany
+    do pliku `.npz`: posortowane ID gier oraz tablice `K` sąsiadów i wyników.
+    Endpoint wykonuje tylko wyszukanie binarne w tablicy ID – bez zapytań
+    do bazy o sygnały.
+
+    Konfiguracja:
+        - `RECOMMENDATIONS_PATH`: plik indeksu (domyślnie
+          `instance/similar_games.npz`),
+        - `RECOMMENDATIONS_TOP_K`: liczba zapisywanych sąsiadów (domyślnie 20),
+        - `RECOMMENDATIONS_RELOAD_INTERVAL`: co ile sekund sprawdzać, czy
+          plik został przebudowany (domyślnie 30).
+
+    Note:
+        - Domyślnie odświeżenie jest przyrostowe: nowa macierz interakcji jest
+          porównywana z zapisaną, a listy poprawiane tylko o zmienione gry
+          (patrz `refresh_top_k`). Listy mogą się przy tym skracać, więc
+          warto okresowo uruchomić pełne przeliczenie (`--full`). Plik bez
+          progów wierszy (`cutoffs`) wymusza pełne przeliczenie.
+        - Plik jest podmieniany atomowo (`os.replace`); workery wczytują nową
+          wersję po zmianie `mtime`.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.top_k = 20
+        self.reload_interval = 30.0
+        self._data = None
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.path = app.config.get("RECOMMENDATIONS_PATH") or os.path.join(
+            app.instance_path, "similar_games.npz"
+        )
+        self.top_k = int(app.config.get("RECOMMENDATIONS_TOP_K", self.top_k))
+        self.reload_interval = float(
+            app.config.get("RECOMMENDATIONS_RELOAD_INTERVAL", self.reload_interval)
+        )
+        self._data = None
+        self._mtime = None
+        self._next_check = 0.0
+
+    def _current(self):
+        """Zwraca wczytany indeks, przeładowując go po zmianie pliku."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._data
+        with self._lock:
+            self._next_check = now + self.reload_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                self._data, self._mtime = None, None
+                return None
+            if mtime != self._mtime:
+                with np.load(self.path) as npz:
+                    self._data = {
+                        key: npz[key] for key in ("game_ids", "neighbors", "scores")
+                    }
+                self._mtime = mtime
+        return self._data
+
+    def similar(self, game_id, limit):
+        """
+        Zwraca gry podobne do `game_id` (od najbardziej podobnych).
+
+        Returns:
+            list[tuple[int, float]]: (ID gry, podobieństwo); pusta lista, gdy
+            gra nie ma sygnałów lub indeksu nie zbudowano.
+        """
+        data = self._current()
+        if data is None:
+            return []
+        game_ids = data["game_ids"]
+        pos = np.searchsorted(game_ids, game_id)
+        if pos >= len(game_ids) or game_ids[pos] != game_id:
+            return []
+        neighbors = data["neighbors"][pos, :limit]
+        scores = data["scores"][pos, :limit]
+        valid = neighbors >= 0
+        return [
+            (int(game_ids[n]), float(s))
+            for n, s in zip(neighbors[valid], scores[valid])
+        ]
+
+    def build(self, full=False):
+        """
+        Buduje (lub przyrostowo odświeża) indeks i zapisuje go do pliku.
+
+        Args:
+            full (bool): Wymusza pełne przeliczenie.
+
+        Returns:
+            dict: Statystyki: `games`, `users`, `interactions`, `recomputed`,
+            `incremental`, `seconds`.
+        """
+        started = time.perf_counter()
+        matrix, users, games = interaction_matrix(*load_interactions())
+        k = self.top_k
+
+        previous = None if full else self._load_previous()
+        incremental = False
+        if previous is not None and previous["neighbors"].shape[1] == k:
+            all_users = np.union1d(previous["user_ids"], users)
+            all_games = np.union1d(previous["game_ids"], games)
+            old = _reindex(
+                previous["matrix"],
+                previous["user_ids"],
+                previous["game_ids"],
+                all_users,
+                all_games,
+            )
+            new = _reindex(matrix, users, games, all_users, all_games)
+            changed_ids = all_games[changed_games(old, new)]
+            incremental = len(changed_ids) <= INCREMENTAL_MAX_FRACTION * len(games)
+
+        if incremental:
+            neighbors, scores, cutoffs = self._previous_on_axis(
+                previous, games, changed_ids
+            )
+            changed = np.searchsorted(games, changed_ids[np.isin(changed_ids, games)])
+            neighbors, scores, cutoffs = refresh_top_k(
+                matrix, neighbors, scores, cutoffs, changed
+            )
+            recomputed = len(changed)
+        else:
+            neighbors, scores = top_k_cosine(matrix, k)
+            cutoffs = top_k_cutoffs(neighbors, scores)
+            recomputed = len(games)
+
+        self._save(matrix, users, games, neighbors, scores, cutoffs)
+        stats = {
+            "games": len(games),
+            "users": len(users),
+            "interactions": int(matrix.nnz),
+            "recomputed": recomputed,
+            "incremental": incremental,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info("Zbudowano indeks podobnych gier: %s", stats)
+        return stats
+
+    @staticmethod
+    def _previous_on_axis(previous, games, changed_ids):
+        """Przepisuje poprzednie listy sąsiadów i progi na nową oś gier `games`."""
+        k = previous["neighbors"].shape[1]
+        neighbors = np.full((len(games), k), -1, dtype=np.int32)
+        scores = np.zeros((len(games), k), dtype=np.float32)
+        cutoffs = np.zeros(len(games), dtype=np.float32)
+        prev_ids = previous["game_ids"]
+        if not len(prev_ids):
+            return neighbors, scores, cutoffs
+        pos = np.minimum(np.searchsorted(prev_ids, games), len(prev_ids) - 1)
+        present = prev_ids[pos] == games
+        old_neighbors = previous["neighbors"][pos[present]]
+        neighbor_ids = np.where(old_neighbors >= 0, prev_ids[old_neighbors], -1)
+        # gry zniknięte z nowej macierzy są wśród zmienionych – wpisy są odrzucane
+        valid = (neighbor_ids >= 0) & ~np.isin(neighbor_ids, changed_ids)
+        neighbors[present] = np.where(valid, np.searchsorted(games, neighbor_ids), -1)
+        scores[present] = np.where(valid, previous["scores"][pos[present]], 0.0)
+        cutoffs[present] = previous["cutoffs"][pos[present]]
+        return neighbors, scores, cutoffs
+
+    def _load_previous(self):
+        try:
+            with np.load(self.path) as npz:
+                return {
+                    "game_ids": npz["game_ids"],
+                    "user_ids": npz["user_ids"],
+                    "neighbors": npz["neighbors"],
+                    "scores": npz["scores"],
+                    "cutoffs": npz["cutoffs"],
+                    "matrix": sparse.csr_matrix(
+                        (npz["data"], npz["indices"], npz["indptr"]),
+                        shape=(len(npz["user_ids"]), len(npz["game_ids"])),
+                    ),
+                }
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, matrix, users, games, neighbors, scores, cutoffs):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # macierz interakcji jest potrzebna tylko do odświeżenia
+                # przyrostowego; `np.load` czyta tablice leniwie
+                np.savez(
+                    f,
+                    game_ids=games,
+                    neighbors=neighbors,
+                    scores=scores,
+                    cutoffs=cutoffs,
+                    user_ids=users,
+                    data=matrix.data,
+                    indices=matrix.indices,
+                    indptr=matrix.indptr,
+                )
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._next_check = 0.0
+
+
+similar_games = SimilarGames()
@@ -0,0 +1,390 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.services.ttl_cache import TTLCache
+
+
+class CachedResponse:
+    """
+    Zserializowana odpowiedź HTTP przechowywana w cache.
+
+    Atrybuty:
+        body (bytes): Treść odpowiedzi.
+        status (int): Kod HTTP.
+        headers (list[tuple[str, str]]): Nagłówki odpowiedzi.
+    """
+
+    __slots__ = ("body", "status", "headers")
+
+    def __init__(self, body, status, headers):
+        self.body = body
+        self.status = status
+        self.headers = headers
+
+
+class MemoryCacheBackend:
+    """
+    Backend cache w pamięci procesu (LRU + TTL).
+
+    Unieważnianie po tagach działa przez numer sekwencyjny: każde
+    `invalidate_tags` dostaje kolejny numer, zapamiętywany przy tagu. Wpis
+    pamięta numer z chwili *przed* wywołaniem widoku (`snapshot`) i jest
+    nieaktualny, gdy któryś z jego tagów unieważniono później – także w trakcie
+    renderowania odpowiedzi (bez indeksu tag → klucze).
+
+    Liczba pamiętanych tagów jest ograniczona (`max_tags`): po przekroczeniu
+    usuwana jest najstarsza połowa, a wpisy sprzed usuniętych unieważnień
+    przestają być ważne (`_floor`) – kosztem kilku chybień, nigdy nieaktualnej
+    odpowiedzi.
+
+    Note:
+        - Każdy worker ma osobną kopię cache i osobne unieważnienia. Przy
+          wielu workerach należy użyć `SQLiteCacheBackend`.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=60, max_tags=10_000):
+        self._entries = TTLCache(maxsize=max_entries, ttl=default_ttl)
+        self.max_tags = max_tags
+        self._tag_seq = {}
+        self._seq = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        return self._seq
+
+    def _is_stale(self, seq, tags):
+        return seq < self._floor or any(self._tag_seq.get(tag, 0) > seq for tag in tags)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        response, seq, tags = entry
+        if self._is_stale(seq, tags):
+            self._entries.pop(key)
+            return None
+        return response
+
+    def set(self, key, response, ttl, tags, since):
+        if self._is_stale(since, tags):
+            return  # tag unieważniony w trakcie renderowania
+        self._entries.set(key, (response, since, tuple(tags)), ttl=ttl)
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            self._seq += 1
+            for tag in tags:
+                self._tag_seq[tag] = self._seq
+            if len(self._tag_seq) > self.max_tags:
+                by_age = sorted(self._tag_seq.items(), key=lambda item: item[1])
+                dropped = by_age[: len(by_age) // 2]
+                self._floor = max(self._floor, dropped[-1][1])
+                self._tag_seq = dict(by_age[len(by_age) // 2 :])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._floor = self._seq
+
+    def stats(self):
+        stats = self._entries.stats()
+        return {
+            "backend": "memory",
+            "size": stats["size"],
+            "max_entries": stats["maxsize"],
+            "evictions": stats["evictions"],
+        }
+
+
+class SQLiteCacheBackend:
+    """
+    Backend cache współdzielony między workerami (plik SQLite na dysku lokalnym).
+
+    Wpisy są usuwane po wygaśnięciu TTL oraz – po przekroczeniu
+    `max_entries` – w kolejności najdawniejszego użycia. Unieważnienie tagu
+    usuwa od razu wszystkie wpisy oznaczone tym tagiem (tabela `entry_tag`)
+    i zapisuje numer unieważnienia (tabela `tag_seq`), żeby odpowiedź
+    renderowana w tym czasie nie została zapisana (patrz `MemoryCacheBackend`).
+
+    Args:
+        path (str): Ścieżka do pliku bazy cache.
+        max_entries (int): Maksymalna liczba wpisów.
+        max_tags (int): Maksymalna liczba pamiętanych numerów unieważnień.
+    """
+
+    def __init__(self, path, max_entries=1024, max_tags=10_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_tags = max_tags
+        self.evictions = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entry (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_entry_accessed_at ON entry (accessed_at);
+                CREATE TABLE IF NOT EXISTS entry_tag (
+                    tag TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (tag, key)
+                );
+                CREATE TABLE IF NOT EXISTS tag_seq (
+                    tag TEXT PRIMARY KEY,
+                    seq INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_tag_seq_seq ON tag_seq (seq);
+                CREATE TABLE IF NOT EXISTS state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    seq INTEGER NOT NULL,
+                    floor INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO state VALUES (1, 0, 0);
+                """)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT body, status, headers, expires_at FROM entry WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        body, status, headers, expires_at = row
+        if expires_at <= now:
+            self._delete(conn, [key])
+            return None
+        conn.execute("UPDATE entry SET accessed_at = ? WHERE key = ?", (now, key))
+        return CachedResponse(body, status, [tuple(h) for h in json.loads(headers)])
+
+    def snapshot(self):
+        return self._connect().execute("SELECT seq FROM state").fetchone()[0]
+
+    def set(self, key, response, ttl, tags, since):
+        conn = self._connect()
+        now = time.time()
+        placeholders = ",".join("?" * len(tags))
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # unieważnienia są w tej samej blokadzie zapisu, więc po tym
+            # sprawdzeniu żadne nie może się „wcisnąć” przed zapisem wpisu
+            floor = conn.execute("SELECT floor FROM state").fetchone()[0]
+            if (
+                since < floor
+                or conn.execute(
+                    f"SELECT 1 FROM tag_seq WHERE tag IN ({placeholders}) AND seq > ?",
+                    [*tags, since],
+                ).fetchone()
+            ):
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO entry VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.body,
+                    response.status,
+                    json.dumps(response.headers),
+                    now + ttl,
+                    now,
+                ),
+            )
+            conn.execute("DELETE FROM entry_tag WHERE key = ?", (key,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO entry_tag VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+            overflow = conn.execute("SELECT count(*) FROM entry").fetchone()[0]
+            overflow -= self.max_entries
+            if overflow > 0:
+                victims = [
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT key FROM entry ORDER BY accessed_at LIMIT ?",
+                        (overflow,),
+                    )
+                ]
+                self._delete(conn, victims)
+                self.evictions += len(victims)
+
+    def invalidate_tags(self, tags):
+        conn = self._connect()
+        placeholders = ",".join("?" * len(tags))
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            keys = [
+                r[0]
+                for r in conn.execute(
+                    f"SELECT key FROM entry_tag WHERE tag IN ({placeholders})",
+                    list(tags),
+                )
+            ]
+            self._delete(conn, keys)
+            conn.execute("UPDATE state SET seq = seq + 1")
+            seq = conn.execute("SELECT seq FROM state").fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO tag_seq VALUES (?, ?)",
+                [(tag, seq) for tag in tags],
+            )
+            overflow = conn.execute("SELECT count(*) FROM tag_seq").fetchone()[0]
+            if overflow > self.max_tags:
+                floor = conn.execute(
+                    "SELECT seq FROM tag_seq ORDER BY seq LIMIT 1 OFFSET ?",
+                    (overflow // 2 - 1,),
+                ).fetchone()[0]
+                conn.execute("DELETE FROM tag_seq WHERE seq <= ?", (floor,))
+                conn.execute("UPDATE state SET floor = max(floor, ?)", (floor,))
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM entry")
+            conn.execute("DELETE FROM entry_tag")
+            conn.execute("DELETE FROM tag_seq")
+            # renderowane teraz odpowiedzi nie mogą już trafić do cache
+            conn.execute("UPDATE state SET floor = seq")
+
+    def stats(self):
+        size = self._connect().execute("SELECT count(*) FROM entry").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def _delete(conn, keys):
+        if not keys:
+            return
+        placeholders = ",".join("?" * len(keys))
+        conn.execute(f"DELETE FROM entry WHERE key IN ({placeholders})", keys)
+        conn.execute(f"DELETE FROM entry_tag WHERE key IN ({placeholders})", keys)
+
+
+class ResponseCache:
+    """
+    Cache odpowiedzi HTTP dla często czytanych endpointów.
+
+    Backend jest wybierany z konfiguracji aplikacji:
+        - `RESPONSE_CACHE_BACKEND`: `"memory"` (domyślnie), `"sqlite"` lub `"none"`,
+        - `RESPONSE_CACHE_MAX_ENTRIES`: limit wpisów (domyślnie 1024),
+        - `RESPONSE_CACHE_DEFAULT_TTL`: domyślny TTL w sekundach (domyślnie 60),
+        - `RESPONSE_CACHE_MAX_TAGS`: limit pamiętanych unieważnień tagów
+          (domyślnie 10000),
+        - `RESPONSE_CACHE_PATH`: plik dla backendu `sqlite`.
+
+    Example:
+        ```python
+        response_cache.init_app(app)
+
+        @api.route("genre", methods=["GET"])
+        @cached_response(ttl=300, tags=["genres"])
+        def get_genres(): ...
+
+        # po zapisie:
+        response_cache.invalidate_tags("genres")
+        ```
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.default_ttl = 60
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        """Tworzy backend na podstawie konfiguracji aplikacji."""
+        kind = app.config.get("RESPONSE_CACHE_BACKEND", "memory")
+        max_entries = int(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+        self.default_ttl = int(app.config.get("RESPONSE_CACHE_DEFAULT_TTL", 60))
+        max_tags = int(app.config.get("RESPONSE_CACHE_MAX_TAGS", 10_000))
+        if kind == "memory":
+            self.backend = MemoryCacheBackend(max_entries, self.default_ttl, max_tags)
+        elif kind == "sqlite":
+            path = app.config.get("RESPONSE_CACHE_PATH") or os.path.join(
+                app.instance_path, "response_cache.sqlite3"
+            )
+            self.backend = SQLiteCacheBackend(path, max_entries, max_tags)
+        elif kind == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Nieznany backend cache odpowiedzi: {kind!r}")
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def get(self, key):
+        """Zwraca `CachedResponse` lub `None` (i aktualizuje liczniki trafień)."""
+        response = self.backend.get(key) if self.backend else None
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def snapshot(self):
+        """
+        Zwraca znacznik stanu unieważnień – do pobrania *przed* wyliczeniem
+        odpowiedzi i przekazania do `set(since=...)`.
+        """
+        return self.backend.snapshot() if self.backend else None
+
+    def set(self, key, response, ttl=None, tags=(), since=None):
+        """
+        Zapisuje odpowiedź z opcjonalnymi tagami do unieważniania.
+
+        Args:
+            since: Wynik `snapshot()` sprzed wyliczenia odpowiedzi. Jeśli
+                któryś z `tags` unieważniono później, odpowiedź nie jest
+                zapisywana (mogła powstać z danych sprzed zmiany). Domyślnie
+                bieżący stan.
+        """
+        if self.backend:
+            if since is None:
+                since = self.backend.snapshot()
+            self.backend.set(key, response, ttl or self.default_ttl, list(tags), since)
+
+    def invalidate_tags(self, *tags):
+        """Unieważnia wszystkie wpisy oznaczone którymkolwiek z `tags`."""
+        if self.backend and tags:
+            self.backend.invalidate_tags(tags)
+
+    def clear(self):
+        if self.backend:
+            self.backend.clear()
+
+    def stats(self):
+        """
+        Zwraca statystyki do strojenia cache.
+
+        Returns:
+            dict: `backend`, `size`, `max_entries`, `evictions` oraz liczniki
+            `hits`/`misses` bieżącego procesu.
+        """
+        stats = self.backend.stats() if self.backend else {"backend": "none"}
+        stats.update({"hits": self.hits, "misses": self.misses})
+        return stats
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,108 @@
+from sqlalchemy import select, update
+
+from app import db
+from app.models.review_model import Review
+from app.services.catalog_service import decode_cursor, encode_cursor
+from app.services.db_dialect import upsert_insert
+
+DEFAULT_REVIEWS_PAGE_SIZE = 20
+MAX_REVIEWS_PAGE_SIZE = 100
+
+#: Klucz kursora recenzji – kursor z listy gier zostanie odrzucony (400).
+REVIEW_CURSOR_KEY = "review"
+
+
+def paginate_reviews(query, limit, after=None):
+    """
+    Pobiera jedną stronę recenzji (od najnowszych) metodą keyset.
+
+    Zapytanie powinno być zawężone do jednej gry lub jednego użytkownika –
+    wtedy sortowanie `id DESC` z warunkiem `id < ostatnie_id` to jeden skan
+    zakresu indeksu `(game_id, id)` lub `(user_id, id)`.
+
+    Args:
+        query (Query): Zapytanie zwracające `Review` (ew. z dodatkowymi kolumnami).
+        limit (int): Rozmiar strony.
+        after (str|None): Kursor z poprzedniej strony.
+
+    Returns:
+        tuple[list, str|None]: Wiersze strony oraz kursor następnej strony
+        (`None`, gdy to ostatnia strona).
+
+    Raises:
+        CatalogQueryError: Gdy kursor jest niepoprawny.
+    """
+    if after:
+        _, last_id = decode_cursor(after, REVIEW_CURSOR_KEY)
+        query = query.filter(Review.id < last_id)
+
+    rows = query.order_by(Review.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        last_id = last.id if isinstance(last, Review) else last[0].id
+        next_cursor = encode_cursor(REVIEW_CURSOR_KEY, None, last_id)
+    return rows, next_cursor
+
+
+def upsert_review(user_id, game_id, rating, comment):
+    """
+    Zapisuje (wstawia lub nadpisuje) recenzję użytkownika bez wyścigów.
+
+    Najpierw `INSERT ... ON CONFLICT DO NOTHING RETURNING` – zwrócony wiersz
+    oznacza faktyczne wstawienie (poprzedniej oceny nie było). W przeciwnym
+    razie recenzja już istnieje: poprzednia ocena jest czytana pod blokadą
+    wiersza (`SELECT ... FOR UPDATE`), a potem nadpisywana `UPDATE ... RETURNING`.
+
+    Równoległe żądania tego samego użytkownika są więc szeregowane na kluczu
+    `(user_id, game_id)`: wstawienie czeka na zatwierdzenie (lub wycofanie)
+    konkurencyjnego wstawienia, a odczyt starej oceny – na blokadę wiersza.
+    Różnica dla `apply_rating_delta` jest zawsze liczona względem oceny
+    zatwierdzonej przez poprzedni zapis.
+
+    Args:
+        user_id (int): ID autora.
+        game_id (int): ID gry.
+        rating (int): Ocena 1..5.
+        comment (str): Komentarz.
+
+    Returns:
+        tuple[Row, int|None]: Zapisany wiersz (`id`, `user_id`, `game_id`,
+        `rating`, `comment`) oraz poprzednia ocena (`None` – nowa recenzja).
+
+    Raises:
+        IntegrityError: Gdy gra (lub użytkownik) nie istnieje.
+    """
+    columns = [
+        Review.id,
+        Review.user_id,
+        Review.game_id,
+        Review.rating,
+        Review.comment,
+    ]
+    key = (Review.user_id == user_id, Review.game_id == game_id)
+    while True:
+        inserted = db.session.execute(
+            upsert_insert(Review)
+            .values(user_id=user_id, game_id=game_id, rating=rating, comment=comment)
+            .on_conflict_do_nothing(index_elements=[Review.user_id, Review.game_id])
+            .returning(*columns)
+        ).first()
+        if inserted is not None:
+            return inserted, None
+
+        old_rating = db.session.scalar(
+            select(Review.rating).where(*key).with_for_update()
+        )
+        if old_rating is None:
+            continue  # recenzję usunięto między zapytaniami – ponów wstawienie
+        row = db.session.execute(
+            update(Review)
+            .where(*key)
+            .values(rating=rating, comment=comment)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        ).one()
+        return row, old_rating
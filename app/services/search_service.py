@@ -0,0 +1,107 @@
+import re
+
+from sqlalchemy import case, func, literal, literal_column
+
+from app import db
+from app.models.game_model import Game
+from app.services.text_utils import fold_text
+
+MAX_QUERY_LENGTH = 200
+MAX_TERMS = 8
+
+_TERM = re.compile(r"\w+")
+
+#: Znaki traktowane w wyszukiwaniu bez PostgreSQL jako granica słowa.
+_FALLBACK_SEPARATORS = ":;,.-/()[]'\"!?&+"
+
+
+def search_terms(q):
+    """
+    Rozbija zapytanie użytkownika na znormalizowane słowa.
+
+    Args:
+        q (str): Surowe zapytanie (np. `"Wiedźmin 3"`).
+
+    Returns:
+        list[str]: Unikalne słowa bez akcentów, w kolejności wystąpienia
+        (maks. `MAX_TERMS`), np. `["wiedzmin", "3"]`.
+    """
+    terms = []
+    for term in _TERM.findall(fold_text(q[:MAX_QUERY_LENGTH])):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _postgres_search(query, terms):
+    """
+    Wyszukiwanie pełnotekstowe po kolumnie `game.search_vector` (indeks GIN).
+
+    Każde słowo dopasowuje się prefiksowo (`wiedz` → `wiedzmin`), trafienia
+    w tytule (waga A) ważą więcej niż w opisie (waga B).
+    """
+    vector = literal_column("game.search_vector")
+    tsquery = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in terms))
+    rank = func.ts_rank_cd(vector, tsquery)
+    return query.filter(vector.op("@@")(tsquery)), rank
+
+
+def _fallback_words(column):
+    """
+    Kolumna jako `" słowo słowo ..."` – interpunkcja zamieniona na spacje,
+    więc `LIKE '% term%'` trafia tylko w początki słów.
+    """
+    text = func.coalesce(column, "")
+    for separator in _FALLBACK_SEPARATORS:
+        text = func.replace(text, separator, " ")
+    return literal(" ") + text
+
+
+def _fallback_search(query, terms):
+    """
+    Wyszukiwanie bez PostgreSQL (np. SQLite w testach lokalnych).
+
+    Jak w PostgreSQL słowa dopasowują się prefiksowo (`wiedz` → `wiedzmin`,
+    ale nie `iedz`). Wszystkie słowa muszą wystąpić w tytule lub opisie;
+    ranking to suma trafień, gdzie trafienie w tytule liczy się podwójnie.
+    """
+    title = _fallback_words(Game.search_title)
+    body = _fallback_words(Game.search_body)
+    rank = 0
+    for term in terms:
+        in_title = title.contains(f" {term}", autoescape=True)
+        in_body = body.contains(f" {term}", autoescape=True)
+        query = query.filter(in_title | in_body)
+        rank = rank + case((in_title, 2), else_=0) + case((in_body, 1), else_=0)
+    return query, rank
+
+
+def search_games(q, limit, offset=0, options=()):
+    """
+    Wyszukuje gry po tytule i opisie, sortując wyniki po trafności.
+
+    Dopasowanie nie rozróżnia wielkości liter ani akcentów
+    (`"wiedzmin"` znajduje `"Wiedźmin"`).
+
+    Args:
+        q (str): Zapytanie użytkownika.
+        limit (int): Rozmiar strony.
+        offset (int): Liczba pominiętych wyników.
+        options (Iterable): Opcje ładowania (np. `game_card_options()`).
+
+    Returns:
+        tuple[list[Game], bool]: Gry na stronie oraz informacja, czy istnieje
+        kolejna strona. Pusta lista, gdy zapytanie nie zawiera żadnych słów.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return [], False
+
+    query = Game.query.options(*options)
+    if db.engine.dialect.name == "postgresql":
+        query, rank = _postgres_search(query, terms)
+    else:
+        query, rank = _fallback_search(query, terms)
+
+    rows = query.order_by(rank.desc(), Game.id).offset(offset).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,27 @@
+import re
+import unicodedata
+
+#: Litery, których NFKD nie rozkłada na literę bazową + znak diakrytyczny.
+_EXTRA_FOLDS = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "ß": "ss"})
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fold_text(value):
+    """
+    Normalizuje tekst do wyszukiwania: małe litery, bez akcentów i polskich znaków.
+
+    Args:
+        value (str|None): Tekst wejściowy.
+
+    Returns:
+        str: Tekst znormalizowany (np. `"Wiedźmin 3: Dziki Gon"` → `"wiedzmin 3: dziki gon"`).
+
+    Example:
+        >>> fold_text("Żółć ŁÓDŹ")
+        'zolc lodz'
+    """
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value.translate(_EXTRA_FOLDS))
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return _WHITESPACE.sub(" ", value).strip().lower()
@@ -0,0 +1,165 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import delete, select
+
+from app import db
+from app.models.revoked_token_model import RevokedToken
+from app.services.db_dialect import upsert_insert
+
+#: Zakładka przy synchronizacji przyrostowej – wiersze zatwierdzone z
+#: opóźnieniem (długie transakcje) nadal zostaną wczytane.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def issue_tokens(user):
+    """
+    Wystawia parę tokenów dla użytkownika.
+
+    Args:
+        user (User): Zalogowany użytkownik.
+
+    Returns:
+        dict: `{"access_token": "...", "refresh_token": "..."}`. Token dostępu
+        zawiera role w claimie `roles`.
+    """
+    identity = str(user.id)
+    roles = [role.name for role in user.roles]
+    return {
+        "access_token": create_access_token(
+            identity=identity, additional_claims={"roles": roles}
+        ),
+        "refresh_token": create_refresh_token(identity=identity),
+    }
+
+
+class RevocationList:
+    """
+    Zbiór unieważnionych JTI w pamięci procesu, synchronizowany z bazą.
+
+    Sprawdzenie tokenu to wyszukanie w słowniku (O(1)) – baza jest pytana
+    najwyżej raz na `REVOCATION_SYNC_INTERVAL` sekund i tylko o wpisy
+    dodane od poprzedniej synchronizacji. Wpisy wygasłych tokenów są
+    usuwane z pamięci (wygasły token i tak zostanie odrzucony).
+
+    Konfiguracja:
+        - `REVOCATION_SYNC_INTERVAL`: odstęp synchronizacji w sekundach (domyślnie 10).
+
+    Note:
+        - Unieważnienie w bieżącym workerze działa natychmiast; pozostałe
+          workery widzą je najpóźniej po `REVOCATION_SYNC_INTERVAL` sekundach.
+    """
+
+    def __init__(self):
+        self.sync_interval = 10.0
+        self._jtis = {}
+        self._synced_at = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()  # jedna synchronizacja naraz
+        self._update_lock = threading.Lock()  # zmiany słownika `_jtis`
+
+    def init_app(self, app):
+        self.sync_interval = float(
+            app.config.get("REVOCATION_SYNC_INTERVAL", self.sync_interval)
+        )
+        self._jtis = {}
+        self._synced_at = None
+        self._next_sync = 0.0
+
+    def add(self, jti, expires_at):
+        """Dodaje JTI do zbioru lokalnie (bez zapisu do bazy)."""
+        with self._update_lock:
+            self._jtis[jti] = expires_at.timestamp()
+
+    def is_revoked(self, jti):
+        """Czy token o danym JTI został unieważniony."""
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return jti in self._jtis
+
+    def sync(self):
+        """Wczytuje nowe unieważnienia z bazy i usuwa wygasłe wpisy z pamięci."""
+        if not self._lock.acquire(blocking=False):
+            return  # synchronizuje inny wątek
+        try:
+            now = datetime.now(timezone.utc)
+            stmt = select(RevokedToken.jti, RevokedToken.expires_at).where(
+                RevokedToken.expires_at > now
+            )
+            if self._synced_at is not None:
+                stmt = stmt.where(
+                    RevokedToken.revoked_at > self._synced_at - SYNC_OVERLAP
+                )
+            fresh = {}
+            for jti, expires_at in db.session.execute(stmt):
+                if expires_at.tzinfo is None:  # SQLite nie przechowuje strefy
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                fresh[jti] = expires_at.timestamp()
+            cutoff = now.timestamp()
+            # pod blokadą – równoległe `add()` nie zmienia słownika w trakcie iteracji
+            with self._update_lock:
+                fresh.update(self._jtis)
+                self._jtis = {j: exp for j, exp in fresh.items() if exp > cutoff}
+            self._synced_at = now
+            self._next_sync = time.monotonic() + self.sync_interval
+        finally:
+            self._lock.release()
+
+
+revoked_tokens = RevocationList()
+
+
+def revoke_token(claims):
+    """
+    Unieważnia token (dodaje wpis do listy blokad).
+
+    Wpis jest wstawiany `INSERT ... ON CONFLICT (jti) DO NOTHING RETURNING`,
+    więc z równoległych wywołań dla tego samego tokenu (także w różnych
+    workerach) tylko jedno „zajmuje” JTI – pozostałe czekają na jego
+    zatwierdzenie i dostają `False`. Dzięki temu token odświeżania da się
+    wykorzystać dokładnie raz.
+
+    Zmiana jest widoczna w bieżącym workerze od razu; zapis do bazy
+    następuje przy `db.session.commit()` wywołującego.
+
+    Args:
+        claims (dict): Claimy tokenu (np. wynik `get_jwt()` lub `decode_token()`).
+
+    Returns:
+        bool: `True`, jeśli to wywołanie unieważniło token; `False`, gdy był
+        już unieważniony wcześniej.
+    """
+    expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+    inserted = db.session.execute(
+        upsert_insert(RevokedToken)
+        .values(
+            jti=claims["jti"],
+            token_type=claims.get("type", "access"),
+            user_id=(
+                int(claims["sub"]) if str(claims.get("sub", "")).isdigit() else None
+            ),
+            expires_at=expires_at,
+        )
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        .returning(RevokedToken.id)
+    ).scalar()
+    revoked_tokens.add(claims["jti"], expires_at)
+    return inserted is not None
+
+
+def purge_expired_revocations():
+    """
+    Usuwa z bazy wpisy tokenów, które już wygasły.
+
+    Returns:
+        int: Liczba usuniętych wpisów.
+    """
+    result = db.session.execute(
+        delete(RevokedToken).where(
+            RevokedToken.expires_at <= datetime.now(timezone.utc)
+        )
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Prosty, wątkowo bezpieczny cache LRU z czasem życia wpisów.
+
+    Wpisy wygasają po `ttl` sekundach, a po przekroczeniu `maxsize`
+    usuwany jest najdawniej używany wpis. Cache działa w obrębie jednego
+    procesu (każdy worker ma własną kopię).
+
+    Atrybuty:
+        maxsize (int): Maksymalna liczba wpisów.
+        ttl (float): Domyślny czas życia wpisu w sekundach.
+        hits (int): Liczba trafień.
+        misses (int): Liczba chybień (w tym wpisy wygasłe).
+        evictions (int): Liczba wpisów usuniętych z powodu limitu rozmiaru.
+
+    Example:
+        ```python
+        cache = TTLCache(maxsize=256, ttl=30)
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value)
+        ```
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Zwraca wartość dla `key` lub `default`, gdy brak wpisu albo wygasł."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Zapisuje wartość; `ttl` nadpisuje domyślny czas życia wpisu."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Usuwa wpis i zwraca jego wartość (bez względu na wygaśnięcie)."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        """Usuwa wszystkie wpisy (liczniki statystyk pozostają)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Zwraca statystyki cache.
+
+        Returns:
+            dict: `size`, `maxsize`, `hits`, `misses`, `evictions`.
+        """
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,81 @@
+from flask import request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import and_, select
+
+from app import db
+from app.models.game_model import Game
+from app.models.review_model import Review
+from app.models.wish_list import WishList
+from app.services.catalog_service import TRUE_VALUES, parse_bool
+
+#: Parametr query włączający adnotacje `in_wishlist` / `my_rating`.
+ANNOTATE_PARAM = "annotate"
+
+
+def is_annotated_request():
+    """
+    Czy odpowiedź na bieżące żądanie będzie zależeć od użytkownika.
+
+    Tania wersja sprawdzenia (bez weryfikacji JWT) dla dekoratorów cache –
+    takie żądania omijają ETag katalogu i `response_cache`.
+    """
+    value = (request.args.get(ANNOTATE_PARAM) or "").strip().lower()
+    return value in TRUE_VALUES and "Authorization" in request.headers
+
+
+def annotation_user_id(args):
+    """
+    Zwraca ID użytkownika, dla którego należy dodać adnotacje, lub `None`.
+
+    Adnotacje są dodawane tylko przy `annotate=true` i poprawnym JWT
+    (token jest opcjonalny – bez niego katalog działa jak zwykle).
+
+    Raises:
+        CatalogQueryError: Gdy `annotate` nie jest wartością logiczną.
+    """
+    if not parse_bool(args.get(ANNOTATE_PARAM), ANNOTATE_PARAM):
+        return None
+    verify_jwt_in_request(optional=True)
+    identity = get_jwt_identity()
+    return int(identity) if identity is not None else None
+
+
+def fetch_user_game_state(user_id, game_ids):
+    """
+    Pobiera stan gier dla użytkownika jednym zapytaniem (`LEFT JOIN`).
+
+    Złączenia idą po unikalnych `(user_id, game_id)` recenzji i wishlisty,
+    więc koszt to jedno wyszukanie w indeksie na grę ze strony.
+
+    Returns:
+        dict[int, tuple[bool, int|None]]: `game_id` → (czy na wishliście, ocena).
+    """
+    if not game_ids:
+        return {}
+    rows = db.session.execute(
+        select(Game.id, WishList.id, Review.rating)
+        .outerjoin(
+            WishList, and_(WishList.game_id == Game.id, WishList.user_id == user_id)
+        )
+        .outerjoin(Review, and_(Review.game_id == Game.id, Review.user_id == user_id))
+        .where(Game.id.in_(game_ids))
+    )
+    return {
+        game_id: (wishlist_id is not None, rating)
+        for game_id, wishlist_id, rating in rows
+    }
+
+
+def annotate_games(user_id, pairs):
+    """
+    Dokleja `in_wishlist` i `my_rating` do zserializowanych gier.
+
+    Args:
+        user_id (int): ID zalogowanego użytkownika.
+        pairs (list[tuple[int, dict]]): (ID gry, słownik gry z odpowiedzi).
+    """
+    state = fetch_user_game_state(user_id, [game_id for game_id, _ in pairs])
+    for game_id, item in pairs:
+        in_wishlist, rating = state.get(game_id, (False, None))
+        item["in_wishlist"] = in_wishlist
+        item["my_rating"] = rating
@@ -1,7 +1,7 @@
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
 from app import db
 from app.models import User, Role
+from app.services.password_service import password_hasher
+from app.services.token_service import issue_tokens
 
 
 def register_user(data):
@@ -20,15 +20,19 @@ def register_user(data):
             - ({"msg": "User created"}, 201) – jeśli rejestracja się powiodła
             - ({"msg": "User already exists"}, 409) – jeśli użytkownik o takiej nazwie już istnieje
 
+    Raises:
+        PasswordHasherBusy: Gdy kolejka hashowania haseł jest pełna.
+
     Note:
-        - Hasło użytkownika jest zapisywane w bazie w postaci **hashu** (bcrypt).
+        - Hasło użytkownika jest zapisywane w bazie w postaci **hashu**
+          (metoda z `PASSWORD_HASH_METHOD`, patrz `PasswordHasher`).
         - Nowy użytkownik automatycznie otrzymuje domyślną rolę `"user"` (o ile istnieje w tabeli `Role`).
     """
 
     if User.query.filter_by(username=data["username"]).first():
         return {"msg": "User already exists"}, 409
 
-    hashed_pw = generate_password_hash(data["password"])
+    hashed_pw = password_hasher.hash(data["password"])
     user = User(username=data["username"], password=hashed_pw)
 
     # 🔐 przypisz domyślną rolę "user"
@@ -55,25 +59,28 @@ def login_user(data):
 
     Returns:
         tuple: (response, status_code)
-            - ({"access_token": "<jwt>"}, 200) – jeśli dane poprawne
+            - ({"access_token": "<jwt>", "refresh_token": "<jwt>"}, 200) – jeśli dane poprawne
             - ({"msg": "Invalid credentials"}, 401) – jeśli login/hasło nieprawidłowe
 
+    Raises:
+        PasswordHasherBusy: Gdy kolejka hashowania haseł jest pełna.
+
     Note:
         - Do tokenu JWT dodawane są role użytkownika w polu `roles`.
         - W `identity` tokenu zapisywany jest `user.id` (jako string).
         - Token JWT należy przesyłać w nagłówku:
             `Authorization: Bearer <token>`.
+        - `refresh_token` służy do odnowienia pary tokenów (`/api/auth/refresh`)
+          bez ponownego podawania hasła.
+        - Jeśli hash hasła powstał inną metodą/kosztem niż `PASSWORD_HASH_METHOD`,
+          po udanym logowaniu jest przeliczany i zapisywany na nowo.
     """
     user = User.query.filter_by(username=data["username"]).first()
-    if user and check_password_hash(user.password, data["password"]):
-        # Pobierz nazwy ról
-        role_names = [role.name for role in user.roles]
-
-        # Tworzymy token z dodatkowymi claims (rolami)
-        token = create_access_token(
-            identity=str(user.id), additional_claims={"roles": role_names}
-        )
+    if user and password_hasher.verify(user.password, data["password"]):
+        if password_hasher.needs_rehash(user.password):
+            user.password = password_hasher.hash(data["password"])
+            db.session.commit()
 
-        return {"access_token": token}, 200
+        return issue_tokens(user), 200
 
     return {"msg": "Invalid credentials"}, 401
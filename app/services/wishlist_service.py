@@ -0,0 +1,106 @@
+from sqlalchemy import delete, select
+
+from app import db
+from app.models.game_model import Game
+from app.models.wish_list import WishList
+from app.services.db_dialect import upsert_insert
+
+
+def add_wishlist_item(user_id, game_id):
+    """
+    Dodaje grę do wishlisty jednym `INSERT ... ON CONFLICT DO NOTHING`.
+
+    Args:
+        user_id (int): ID użytkownika.
+        game_id (int): ID gry.
+
+    Returns:
+        Row|None: Wstawiony wiersz (`id`, `user_id`, `game_id`) lub `None`,
+        gdy gra już była na wishliście.
+
+    Raises:
+        IntegrityError: Gdy gra (lub użytkownik) nie istnieje.
+    """
+    stmt = (
+        upsert_insert(WishList)
+        .values(user_id=user_id, game_id=game_id)
+        .on_conflict_do_nothing(index_elements=[WishList.user_id, WishList.game_id])
+        .returning(WishList.id, WishList.user_id, WishList.game_id)
+    )
+    return db.session.execute(stmt).one_or_none()
+
+
+def missing_game_ids(game_ids):
+    """
+    Zwraca ID z listy, dla których nie ma gry (jedno zapytanie `IN (...)`).
+
+    Returns:
+        list[int]: Brakujące ID w kolejności wejściowej.
+    """
+    if not game_ids:
+        return []
+    found = set(db.session.scalars(select(Game.id).where(Game.id.in_(game_ids))))
+    return [game_id for game_id in game_ids if game_id not in found]
+
+
+def add_wishlist_items(user_id, game_ids):
+    """
+    Dodaje wiele gier naraz jednym wielowierszowym `INSERT ... ON CONFLICT DO NOTHING`.
+
+    Returns:
+        list[int]: ID faktycznie dodanych gier (bez tych, które już były).
+    """
+    if not game_ids:
+        return []
+    stmt = (
+        upsert_insert(WishList)
+        .values([{"user_id": user_id, "game_id": game_id} for game_id in game_ids])
+        .on_conflict_do_nothing(index_elements=[WishList.user_id, WishList.game_id])
+        .returning(WishList.game_id)
+    )
+    added = set(db.session.scalars(stmt))
+    return [game_id for game_id in game_ids if game_id in added]
+
+
+def remove_wishlist_items(user_id, game_ids):
+    """
+    Usuwa wiele gier naraz jednym `DELETE ... WHERE game_id IN (...)`.
+
+    Returns:
+        list[int]: ID faktycznie usuniętych gier.
+    """
+    if not game_ids:
+        return []
+    stmt = (
+        delete(WishList)
+        .where(WishList.user_id == user_id, WishList.game_id.in_(game_ids))
+        .returning(WishList.game_id)
+        .execution_options(synchronize_session=False)
+    )
+    removed = set(db.session.scalars(stmt))
+    return [game_id for game_id in game_ids if game_id in removed]
+
+
+def replace_wishlist(user_id, game_ids):
+    """
+    Ustawia wishlistę na dokładnie podane gry (różnica: jeden `INSERT` i jeden `DELETE`).
+
+    Returns:
+        tuple[list[int], list[int]]: (ID dodanych gier, ID usuniętych gier).
+    """
+    current = list(
+        db.session.scalars(
+            select(WishList.game_id)
+            .where(WishList.user_id == user_id)
+            .order_by(WishList.id)
+        )
+    )
+    wanted = set(game_ids)
+    removed = remove_wishlist_items(
+        user_id, [game_id for game_id in current if game_id not in wanted]
+    )
+    present = set(current)
+    added = add_wishlist_items(
+        user_id, [game_id for game_id in game_ids if game_id not in present]
+    )
+    return added, removed
@@ -0,0 +1,79 @@
+"""
+Mikrobenchmark narzutu autoryzacji (`@requires_role`) na pojedyncze żądanie.
+
+Porównuje trzy warianty tego samego, pustego endpointu:
+    - bez autoryzacji (punkt odniesienia),
+    - `@requires_role` z wyłączonym cache tokenów (pełna weryfikacja JWT
+      przy każdym żądaniu – zachowanie sprzed `ClaimsCache`),
+    - `@requires_role` z cache tokenów.
+
+Uruchomienie (z katalogu backendu):
+    python benchmarks/auth_overhead.py [liczba_żądań]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("IMAGE_SWEEP_INTERVAL", "0")
+
+from flask import jsonify  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.custom_annotations import requires_role  # noqa: E402
+from app.services.auth_cache import claims_cache  # noqa: E402
+
+
+def _ok():
+    return jsonify({"ok": True})
+
+
+def _measure(client, url, headers, n):
+    for _ in range(min(n, 200)):  # rozgrzewka
+        client.get(url, headers=headers)
+    start = time.perf_counter()
+    for _ in range(n):
+        response = client.get(url, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return elapsed / n * 1e6
+
+
+def main(n=5000):
+    app = create_app()
+    app.add_url_rule("/bench/open", "bench_open", _ok)
+    app.add_url_rule("/bench/admin", "bench_admin", requires_role("admin")(_ok))
+    with app.app_context():
+        db.create_all()  # lista unieważnionych tokenów czyta `revoked_token`
+        token = create_access_token(
+            identity="1", additional_claims={"roles": ["admin"]}
+        )
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    baseline = _measure(client, "/bench/open", headers, n)
+
+    app.config["AUTH_CLAIMS_CACHE_SIZE"] = 0
+    claims_cache.init_app(app)
+    uncached = _measure(client, "/bench/admin", headers, n)
+
+    app.config["AUTH_CLAIMS_CACHE_SIZE"] = 4096
+    claims_cache.init_app(app)
+    cached = _measure(client, "/bench/admin", headers, n)
+
+    print(f"żądań na wariant: {n}")
+    for label, value in (
+        ("bez autoryzacji", baseline),
+        ("requires_role (bez cache)", uncached),
+        ("requires_role (z cache)", cached),
+    ):
+        print(
+            f"{label:<27} {value:8.1f} µs/żądanie (narzut {value - baseline:6.1f} µs)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,103 @@
+"""
+Benchmark przepustowości logowania dla różnych kosztów hashowania haseł.
+
+Dla każdej metody z listy tworzy aplikację z `PASSWORD_HASH_METHOD`,
+rejestruje użytkownika i wykonuje równolegle serię logowań przez
+`/api/auth/login`. Wynik (logowania/s oraz p50/p95 czasu odpowiedzi)
+pomaga dobrać koszt: możliwie wysoki, przy akceptowalnej latencji.
+
+Uruchomienie (z katalogu backendu):
+    python benchmarks/login_throughput.py [wątki] [logowania_na_wątek] [metoda ...]
+
+Example:
+    python benchmarks/login_throughput.py 8 20 scrypt:16384:8:1 pbkdf2:sha256:600000
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("IMAGE_SWEEP_INTERVAL", "0")
+
+from app import create_app, db  # noqa: E402
+
+DEFAULT_METHODS = (
+    "pbkdf2:sha256:300000",
+    "pbkdf2:sha256:600000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+)
+
+
+def _bench_method(method, threads, per_thread):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["PASSWORD_HASH_METHOD"] = method
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        credentials = {"username": "bench", "password": "bench-password"}
+        client.post("/api/auth/register", json=credentials)
+        client.post("/api/auth/login", json=credentials)  # rozgrzewka puli
+
+        latencies, statuses = [], []
+        lock = threading.Lock()
+
+        def worker():
+            local_client = app.test_client()
+            for _ in range(per_thread):
+                start = time.perf_counter()
+                response = local_client.post("/api/auth/login", json=credentials)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    statuses.append(response.status_code)
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        total = time.perf_counter() - start
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    ok = statuses.count(200)
+    latencies.sort()
+    return {
+        "ok": ok,
+        "busy": statuses.count(503),
+        "rate": ok / total,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main(threads=8, per_thread=10, methods=DEFAULT_METHODS):
+    print(
+        f"wątki: {threads}, logowań na wątek: {per_thread}, "
+        f"procesy puli: {os.getenv('PASSWORD_HASH_WORKERS', 2)}"
+    )
+    print(f"{'metoda':<24} {'log./s':>8} {'p50 ms':>8} {'p95 ms':>8} {'503':>5}")
+    for method in methods:
+        r = _bench_method(method, threads, per_thread)
+        print(
+            f"{method:<24} {r['rate']:8.1f} {r['p50']:8.1f} {r['p95']:8.1f} "
+            f"{r['busy']:5d}"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 8,
+        int(args[1]) if len(args) > 1 else 10,
+        args[2:] or DEFAULT_METHODS,
+    )
@@ -0,0 +1,102 @@
+"""
+Benchmark budowy indeksu podobnych gier (`SimilarGames`) na danych syntetycznych.
+
+Generuje interakcje użytkownik × gra o rozkładzie popularności zbliżonym
+do prawdziwego katalogu (Zipf: nieliczne hity, długi ogon), a następnie mierzy
+czas i szczytowe zużycie pamięci (`tracemalloc`, obejmuje tablice numpy):
+    - budowy macierzy interakcji,
+    - pełnego wyliczenia top-K sąsiadów,
+    - odświeżenia przyrostowego (`refresh_top_k`) po zmianie niewielkiej
+      części interakcji.
+
+Baza danych nie jest używana – mierzone są tylko obliczenia.
+
+Uruchomienie (z katalogu backendu, wymaga numpy i scipy):
+    python benchmarks/recommendations_build.py [użytkownicy] [gry] [interakcje_na_użytkownika] [k]
+
+Example:
+    python benchmarks/recommendations_build.py 100000 50000 20 20
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+from app.services.recommendation_service import (  # noqa: E402
+    changed_games,
+    interaction_matrix,
+    refresh_top_k,
+    top_k_cosine,
+    top_k_cutoffs,
+)
+
+
+def _synthetic(users, games, per_user, rng):
+    count = users * per_user
+    user_ids = np.repeat(np.arange(1, users + 1), per_user)
+    # popularność gier ~ Zipf(1.1), obcięta do rozmiaru katalogu
+    game_ids = (rng.zipf(1.1, count) - 1) % games + 1
+    weights = rng.choice(np.array([0.5, 1.0], dtype=np.float32), count, p=[0.3, 0.7])
+    return user_ids, game_ids, weights
+
+
+def _measure(label, fn, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<36} {elapsed:9.2f} s {peak / 2**20:10.1f} MiB")
+    return result
+
+
+def main(users=100_000, games=50_000, per_user=20, k=20, changed_fraction=0.001):
+    rng = np.random.default_rng(0)
+    user_ids, game_ids, weights = _synthetic(users, games, per_user, rng)
+    print(f"użytkownicy: {users}, gry: {games}, interakcje: {len(user_ids)}, k: {k}")
+    print(f"{'etap':<36} {'czas':>11} {'szczyt pamięci':>14}")
+
+    matrix, user_axis, game_axis = _measure(
+        "macierz interakcji", interaction_matrix, user_ids, game_ids, weights
+    )
+    neighbors, scores = _measure("pełne top-K (kosinus)", top_k_cosine, matrix, k)
+    cutoffs = top_k_cutoffs(neighbors, scores)
+    print(
+        f"gier w indeksie: {len(game_axis)}, nnz macierzy: {matrix.nnz}, "
+        f"rozmiar indeksu: {(neighbors.nbytes + scores.nbytes) / 2**20:.1f} MiB"
+    )
+
+    # zmiana niewielkiej części interakcji (np. dzienny przyrost)
+    changed = rng.random(len(user_ids)) < changed_fraction
+    new_game_ids = game_ids.copy()
+    new_game_ids[changed] = rng.integers(1, games + 1, changed.sum())
+    new_matrix, new_users, new_games = interaction_matrix(
+        user_ids, new_game_ids, weights
+    )
+
+    # osie są te same (te same ID użytkowników i gier), więc bez `_reindex`
+    assert np.array_equal(game_axis, new_games)
+
+    def incremental():
+        changed = changed_games(matrix, new_matrix)
+        refresh_top_k(new_matrix, neighbors.copy(), scores.copy(), cutoffs, changed)
+        return len(changed)
+
+    recomputed = _measure(f"przyrostowo ({changed.sum()} zmian)", incremental)
+    print(f"zmienione gry: {recomputed} z {len(new_games)}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 100_000,
+        int(args[1]) if len(args) > 1 else 50_000,
+        int(args[2]) if len(args) > 2 else 20,
+        int(args[3]) if len(args) > 3 else 20,
+    )
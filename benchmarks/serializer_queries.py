@@ -0,0 +1,88 @@
+"""
+Sprawdza, że liczba zapytań SQL przy serializacji gier nie zależy od rozmiaru strony.
+
+Na bazie w pamięci (SQLite) tworzy katalog gier z gatunkami i tagami, a potem
+dla stron o różnym rozmiarze (domyślnie 1 i 50 gier) pod `assert_max_queries`:
+    - serializuje gry przez `game_card_options` + `game_to_dict`
+      (lista + gatunki + tagi = 3 zapytania),
+    - wywołuje `GET /api/games` z gatunkami i tagami.
+
+Kończy się kodem 1, gdy liczba zapytań rośnie z rozmiarem strony (N+1).
+
+Uruchomienie (z katalogu backendu):
+    python benchmarks/serializer_queries.py [rozmiar_strony ...]
+
+Example:
+    python benchmarks/serializer_queries.py 1 10 50
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("IMAGE_SWEEP_INTERVAL", "0")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+
+from app import create_app, db  # noqa: E402
+from app.models import Game, Genre, Tag  # noqa: E402
+from app.services.game_serializer import game_card_options, game_to_dict  # noqa: E402
+from app.services.query_counter import assert_max_queries, count_queries  # noqa: E402
+
+#: Zapytania serializacji strony: lista gier + `selectin` gatunków + `selectin` tagów.
+SERIALIZER_QUERIES = 3
+
+
+def _seed(games):
+    genres = [Genre(name=f"Gatunek {i}") for i in range(5)]
+    tags = [Tag(name=f"Tag {i}") for i in range(8)]
+    for i in range(games):
+        game = Game(title=f"Gra {i:04d}", price=float(i % 9) * 10, discount=0.0)
+        game.genres.extend(genres[j] for j in range(5) if (i + j) % 3 == 0)
+        game.tags.extend(tags[j] for j in range(8) if (i * j) % 4 == 1)
+        db.session.add(game)
+    db.session.commit()
+
+
+def main(sizes=(1, 50)):
+    app = create_app()
+    client = app.test_client()
+    fields = {"id", "title", "price", "genres", "tags"}
+    failed = False
+    with app.app_context():
+        db.create_all()
+        _seed(max(sizes))
+
+        # liczba zapytań endpointu dla najmniejszej strony jest punktem odniesienia
+        with count_queries() as baseline:
+            client.get(f"/api/games?limit={min(sizes)}&include=genres,tags")
+
+        print(f"{'strona':>6} {'serializer':>11} {'GET /api/games':>15}")
+        for size in sizes:
+            db.session.expunge_all()  # bez obiektów w sesji – jak w nowym żądaniu
+            try:
+                with assert_max_queries(SERIALIZER_QUERIES) as serializer:
+                    games = (
+                        Game.query.options(*game_card_options(fields))
+                        .order_by(Game.id)
+                        .limit(size)
+                        .all()
+                    )
+                    items = [game_to_dict(game, fields) for game in games]
+                assert len(items) == size
+                with assert_max_queries(baseline.count) as endpoint:
+                    response = client.get(
+                        f"/api/games?limit={size}&include=genres,tags"
+                    )
+                assert len(response.get_json()["items"]) == size
+            except AssertionError as e:
+                print(f"{size:>6} BŁĄD: {e}")
+                failed = True
+                continue
+            print(f"{size:>6} {serializer.count:>11} {endpoint.count:>15}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or (1, 50)
+    sys.exit(main(sizes))
@@ -97,6 +97,12 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            # aplikacja włącza klucze obce w SQLite; operacje wsadowe Alembica
+            # przebudowują tabele (DROP + CREATE), co przy włączonych FK
+            # kasowałoby lub blokowało wiersze tabel zależnych
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
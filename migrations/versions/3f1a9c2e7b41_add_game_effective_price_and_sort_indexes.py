@@ -0,0 +1,35 @@
+"""add game effective_price and sort indexes
+
+Revision ID: 3f1a9c2e7b41
+Revises: 0c2781ea51dd
+Create Date: 2026-10-18 10:02:14.381205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c2e7b41'
+down_revision = '0c2781ea51dd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'effective_price',
+            sa.Float(),
+            sa.Computed('price * (1 - COALESCE(discount, 0) / 100.0)', persisted=True),
+            nullable=True,
+        ))
+        batch_op.create_index('ix_game_price_id', ['price', 'id'], unique=False)
+        batch_op.create_index('ix_game_effective_price_id', ['effective_price', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.drop_index('ix_game_effective_price_id')
+        batch_op.drop_index('ix_game_price_id')
+        batch_op.drop_column('effective_price')
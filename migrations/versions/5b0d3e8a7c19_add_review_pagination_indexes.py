@@ -0,0 +1,28 @@
+"""add review pagination indexes
+
+Revision ID: 5b0d3e8a7c19
+Revises: e4a91c7d2f60
+Create Date: 2026-10-18 17:04:38.129774
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b0d3e8a7c19'
+down_revision = 'e4a91c7d2f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.create_index('ix_review_game_id_id', ['game_id', 'id'], unique=False)
+        batch_op.create_index('ix_review_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_user_id_id')
+        batch_op.drop_index('ix_review_game_id_id')
@@ -0,0 +1,75 @@
+"""add game full text search
+
+Revision ID: 7c4e2b9d5a10
+Revises: 3f1a9c2e7b41
+Create Date: 2026-10-18 11:24:37.902145
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4e2b9d5a10'
+down_revision = '3f1a9c2e7b41'
+branch_labels = None
+depends_on = None
+
+
+# kopia app.services.text_utils.fold_text – migracje nie importują kodu aplikacji
+_EXTRA_FOLDS = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "ß": "ss"})
+
+
+def _fold(value):
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value.translate(_EXTRA_FOLDS))
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", value).strip().lower()
+
+
+def upgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_title', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('search_body', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    game = sa.table(
+        'game',
+        sa.column('id', sa.Integer),
+        sa.column('title', sa.String),
+        sa.column('description', sa.Text),
+        sa.column('search_title', sa.Text),
+        sa.column('search_body', sa.Text),
+    )
+    rows = conn.execute(sa.select(game.c.id, game.c.title, game.c.description)).fetchall()
+    for row in rows:
+        conn.execute(
+            game.update()
+            .where(game.c.id == row.id)
+            .values(search_title=_fold(row.title), search_body=_fold(row.description))
+        )
+
+    if conn.dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE game ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(search_title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(search_body, '')), 'B')"
+            ") STORED"
+        )
+        op.create_index(
+            'ix_game_search_vector', 'game', ['search_vector'], postgresql_using='gin'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_game_search_vector', table_name='game')
+        op.drop_column('game', 'search_vector')
+
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.drop_column('search_body')
+        batch_op.drop_column('search_title')
@@ -0,0 +1,57 @@
+"""unique review and wishlist per user
+
+Revision ID: 8e2f4a6c1d93
+Revises: 5b0d3e8a7c19
+Create Date: 2026-10-18 17:41:52.604113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f4a6c1d93'
+down_revision = '5b0d3e8a7c19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # usunięcie duplikatów sprzed ograniczenia: zostaje najnowsza recenzja
+    # i najstarszy wpis wishlisty danego użytkownika dla danej gry
+    op.execute(
+        'DELETE FROM review WHERE id NOT IN '
+        '(SELECT max(id) FROM review GROUP BY user_id, game_id)'
+    )
+    op.execute(
+        'DELETE FROM wish_list WHERE id NOT IN '
+        '(SELECT min(id) FROM wish_list GROUP BY user_id, game_id)'
+    )
+
+    # agregaty ocen liczone były także z usuniętych duplikatów
+    buckets = ', '.join(
+        f'rating_{i} = (SELECT count(*) FROM review r '
+        f'WHERE r.game_id = game.id AND r.rating = {i})'
+        for i in range(1, 6)
+    )
+    op.execute(
+        'UPDATE game SET '
+        'rating_count = (SELECT count(*) FROM review r WHERE r.game_id = game.id), '
+        'rating_sum = (SELECT coalesce(sum(r.rating), 0) FROM review r '
+        'WHERE r.game_id = game.id), '
+        + buckets
+    )
+
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_review_user_id_game_id', ['user_id', 'game_id'])
+
+    with op.batch_alter_table('wish_list', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_wish_list_user_id_game_id', ['user_id', 'game_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('wish_list', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_wish_list_user_id_game_id', type_='unique')
+
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_review_user_id_game_id', type_='unique')
@@ -0,0 +1,26 @@
+"""add catalog features version
+
+Revision ID: 9a3f7c1e5b24
+Revises: 8e2f4a6c1d93
+Create Date: 2026-10-18 19:12:07.318254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3f7c1e5b24'
+down_revision = '8e2f4a6c1d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('catalog_state', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('features_version', sa.BigInteger(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('catalog_state', schema=None) as batch_op:
+        batch_op.drop_column('features_version')
@@ -0,0 +1,46 @@
+"""add game rating aggregates
+
+Revision ID: a81d6e3f0c52
+Revises: 7c4e2b9d5a10
+Create Date: 2026-10-18 12:47:05.116384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a81d6e3f0c52'
+down_revision = '7c4e2b9d5a10'
+branch_labels = None
+depends_on = None
+
+RATING_COLUMNS = ['rating_count', 'rating_sum'] + [f'rating_{i}' for i in range(1, 6)]
+
+
+def upgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        for name in RATING_COLUMNS:
+            batch_op.add_column(
+                sa.Column(name, sa.Integer(), server_default='0', nullable=False)
+            )
+
+    # wypełnienie agregatów na podstawie istniejących recenzji
+    buckets = ', '.join(
+        f'rating_{i} = (SELECT count(*) FROM review r '
+        f'WHERE r.game_id = game.id AND r.rating = {i})'
+        for i in range(1, 6)
+    )
+    op.execute(
+        'UPDATE game SET '
+        'rating_count = (SELECT count(*) FROM review r WHERE r.game_id = game.id), '
+        'rating_sum = (SELECT coalesce(sum(r.rating), 0) FROM review r '
+        'WHERE r.game_id = game.id), '
+        + buckets
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        for name in reversed(RATING_COLUMNS):
+            batch_op.drop_column(name)
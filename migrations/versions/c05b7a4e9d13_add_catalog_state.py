@@ -0,0 +1,33 @@
+"""add catalog state
+
+Revision ID: c05b7a4e9d13
+Revises: a81d6e3f0c52
+Create Date: 2026-10-18 13:58:41.562730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c05b7a4e9d13'
+down_revision = 'a81d6e3f0c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO catalog_state (id, version, updated_at) "
+        "VALUES (1, 1, CURRENT_TIMESTAMP)"
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_state')
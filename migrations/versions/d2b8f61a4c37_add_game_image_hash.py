@@ -0,0 +1,28 @@
+"""add game image hash
+
+Revision ID: d2b8f61a4c37
+Revises: c05b7a4e9d13
+Create Date: 2026-10-18 15:02:17.384105
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b8f61a4c37'
+down_revision = 'c05b7a4e9d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_hash', sa.String(length=64), nullable=True))
+
+    # istniejące obrazki: `flask backfill-image-hashes`
+
+
+def downgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.drop_column('image_hash')